@@ -1,7 +1,52 @@
+import numpy as np
+
 from core_module.utils.util import debug_print
 from core_module.utils.file_utils import load_json_file
 
 
+def score_candidates(raw_price, psa_10_price, gem_rate, grading_cost=29):
+    """
+    Columnar scoring engine: computes the expected value, total cost, net gain and
+    lucrative factor of every card in one pass over NumPy arrays.
+
+    Parameters:
+        raw_price (array-like): Raw price of each card.
+        psa_10_price (array-like): PSA 10 price of each card.
+        gem_rate (array-like): Gem rate (probability of a PSA 10) of each card.
+        grading_cost (float or array-like): Cost of grading, either one value for all cards or one per card.
+
+    Returns:
+        dict: Arrays keyed by 'expected_value', 'total_cost', 'net_gain' and 'lucrative_factor'.
+              Cards with a missing (None/NaN) input get NaN in every column.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected_value, total_cost, net_gain, lucrative_factor = _score(
+            np.asarray(raw_price, dtype=np.float64), np.asarray(psa_10_price, dtype=np.float64),
+            np.asarray(gem_rate, dtype=np.float64), np.asarray(grading_cost, dtype=np.float64))
+
+    return {
+        "expected_value": expected_value,
+        "total_cost": total_cost,
+        "net_gain": net_gain,
+        "lucrative_factor": lucrative_factor
+    }
+
+
+def score_card_rows(rows, grading_cost=29):
+    """
+    Scores a list of card dictionaries (or sqlite3.Row objects) with `score_candidates`.
+    Missing values become NaN, so those cards can be dropped with `np.isnan`.
+
+    Returns:
+        dict: The score arrays, in the order of `rows`.
+    """
+    def column(key):
+        return np.fromiter((np.nan if row[key] is None else row[key] for row in rows), dtype=np.float64,
+                           count=len(rows))
+
+    return score_candidates(column("raw_price"), column("psa_10_price"), column("gem_rate"), grading_cost)
+
+
 def calculate_expected_value(card_data, grading_cost=29):
     """
     Calculate the expected value of the card.
@@ -31,6 +76,14 @@ def calculate_expected_value(card_data, grading_cost=29):
     return expected_value
 
 
+def _score(raw_price, psa_10_price, gem_rate, grading_cost):
+    """Helper with the scoring arithmetic, shared by single values and NumPy arrays."""
+    expected_value = calculate_wager_ev(grading_cost + raw_price, gem_rate, psa_10_price, raw_price)
+    total_cost = raw_price + grading_cost
+    net_gain = expected_value - total_cost
+    return expected_value, total_cost, net_gain, net_gain / total_cost
+
+
 def calculate_wager_ev(wager_amount, probability, payout, loss_payout):
     # Calculate the probability of loss
     probability_of_loss = 1 - probability
@@ -44,33 +97,23 @@ def calculate_wager_ev(wager_amount, probability, payout, loss_payout):
 def calculate_net_gain(card_data, grading_cost=29):
     """
     Calculate the net gain/loss if the card is bought and graded.
+    A one-card wrapper over the arithmetic of `score_candidates`; score many cards with that directly.
 
     Parameters:
         card_data (dict): Dictionary containing card information.
         grading_cost (float): Cost of grading a card.
 
     Returns:
-        tuple: Expected value, total grading cost, and net gain/loss.
+        tuple: Expected value, total grading cost, net gain/loss and lucrative factor.
     """
-    # Step 1: Calculate expected value
-    expected_value = calculate_expected_value(card_data, grading_cost)
-
-    # Step 2: Calculate total grading cost (raw_price + grading_cost)
-    total_grading_cost = card_data["raw_price"] + grading_cost
-
-    # Step 3: Calculate net gain/loss
-    net_gain = expected_value - total_grading_cost
-
-    # Step 4:
-    lucrative_factor = float(net_gain) / total_grading_cost
-
-    return expected_value, total_grading_cost, net_gain, lucrative_factor
+    # Plain Python values skip NumPy's per-call overhead; a missing (None) value raises TypeError as before.
+    return _score(card_data["raw_price"], card_data["psa_10_price"], card_data["gem_rate"], grading_cost)
 
 
 if __name__ == '__main__':
     candidates = load_json_file("cache/candidates.json")
     for card in candidates:
-        ev, total_cost, net_gain = calculate_net_gain(card, grading_cost=29)
+        ev, total_cost, net_gain, _ = calculate_net_gain(card, grading_cost=29)
         debug_print(f"Card: {card['name']}")
         debug_print(f"Card raw: {card['raw_price']:.2f}")
         debug_print(f"Card PSA 10: {card['psa_10_price']:.2f}")
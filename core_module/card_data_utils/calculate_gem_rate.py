@@ -1,5 +1,5 @@
 from core_module.utils.util import debug_print
-from core_module.utils.file_utils import load_json_file
+from core_module.utils.file_utils import get_cache_file_path, load_json_file
 
 def calculate_gem_rate(card_data):
     # Handle None or invalid input
@@ -27,5 +27,5 @@ def calculate_gem_rate(card_data):
     return count_10, sum_except_10, count_10 / denominator
 
 if __name__ == '__main__':
-    input_data = load_json_file("cache/api_responses/get_card_id_psa_pop_card_id=71601.json")
+    input_data = load_json_file(get_cache_file_path("get_card_id_psa_pop_card_id=71601.json"))
     debug_print("calculate_gem_rate", calculate_gem_rate(input_data))
\ No newline at end of file
@@ -1,16 +1,22 @@
 from datetime import datetime, timezone, timedelta
 
 from core_module.utils.util import debug_print
-from core_module.utils.file_utils import load_json_file
+from core_module.utils.file_utils import get_cache_file_path, load_json_file
+from core_module.utils.lazy_payload import LazyPayload
 
+# The only transaction fields the volume count reads.
+VOLUME_FIELDS = ("date_sold", "psa_grade", "ebay_item_id")
 
 
 def calculate_volumes_last_month(data):
     if not data:  # Check if data is valid
         return 0, 0  # Default to 0 volumes
 
-    # Parse the `ebay_avg` list from the input JSON
-    ebay_data = data.get("transactions", [])
+    # Parse the `ebay_avg` list from the input JSON (record by record for a LazyPayload)
+    if isinstance(data, LazyPayload):
+        ebay_data = data.iter_records("transactions", fields=VOLUME_FIELDS)
+    else:
+        ebay_data = data.get("transactions", [])
 
     # Current date with timezone-aware UTC datetime
     today_date = datetime.now(timezone.utc)
@@ -43,7 +49,7 @@ def calculate_volumes_last_month(data):
 
 # Call the function
 if __name__ == '__main__':
-    input_data = load_json_file("cache/api_responses/get_volume_of_transactions_card_id=73104.json")
+    input_data = load_json_file(get_cache_file_path("get_volume_of_transactions_card_id=73104.json"))
     # Call the function
     psa10_volume, non_psa10_volume = calculate_volumes_last_month(input_data)
 
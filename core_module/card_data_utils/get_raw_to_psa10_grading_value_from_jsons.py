@@ -1,5 +1,5 @@
 from core_module.card_data_utils.get_target_sets import get_target_set_ids
-from core_module.service.domain import get_card_prices
+from core_module.service.domain import open_card_prices
 
 
 def get_card_values(card):
@@ -16,28 +16,26 @@ def get_card_values(card):
 
 def get_set_candidates(set_id=0):
     candidates = []
-    data = get_card_prices(set_id)
-    if data is None or data.get("data") is None:
-        return candidates
-    data = data.get("data")
-    for card in data:
-        raw, psa_10 = get_card_values(card)
-        if raw is not None and psa_10 is not None:
-            if psa_10 > raw + 70 and psa_10 > 120:
-                candidate = {
-                    'name': card["name"],
-                    'raw_price': raw,
-                    'psa_10_price': psa_10,
-                    'id': card["id"],
-                    'set_code': card["set_code"],
-                    'stats_url': card["stat_url"],
-                    'release_date': card["release_date"],
-                    'set_name': card["set_name"],
-                    'set_id': card["set_id"],
-                    'card_data': card
-                }
-                candidates.append(candidate)
-                # debug_print(card["name"], card["id"])
+    # Cards are parsed one at a time; only the candidates are kept.
+    with open_card_prices(set_id) as payload:
+        for card in payload.iter_records("data"):
+            raw, psa_10 = get_card_values(card)
+            if raw is not None and psa_10 is not None:
+                if psa_10 > raw + 70 and psa_10 > 120:
+                    candidate = {
+                        'name': card["name"],
+                        'raw_price': raw,
+                        'psa_10_price': psa_10,
+                        'id': card["id"],
+                        'set_code': card["set_code"],
+                        'stats_url': card["stat_url"],
+                        'release_date': card["release_date"],
+                        'set_name': card["set_name"],
+                        'set_id': card["set_id"],
+                        'card_data': card
+                    }
+                    candidates.append(candidate)
+                    # debug_print(card["name"], card["id"])
     return candidates
 
 def get_raw_to_psa10_grading_value_from_jsons_cache():
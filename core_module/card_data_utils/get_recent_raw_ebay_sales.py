@@ -2,8 +2,9 @@ from datetime import datetime
 from pprint import pprint
 
 from core_module.card_data_utils.exchangeRate import USD_TO_CAD_EXCHANGE_RATE
-from core_module.service.api import get_volume_of_transactions
+from core_module.service.domain import get_volume_of_transactions
 from core_module.utils.file_utils import load_json_file
+from core_module.utils.lazy_payload import LazyPayload
 from core_module.utils.util import debug_print
 
 
@@ -13,14 +14,18 @@ def filter_recent_raw_ebay_sales(data):
     and returns up to 10 most recent transactions based on the 'date_sold'.
 
     Args:
-        data (dict): A dictionary containing transaction data, or None.
+        data (dict or LazyPayload): A dictionary containing transaction data, or None.
+            A LazyPayload is walked record by record, keeping only the matching sales.
 
     Returns:
         list: Filtered list of transactions up to 10 most recent ones.
     """
     if not data:
         return []
-    transactions = data.get("transactions", [])
+    if isinstance(data, LazyPayload):
+        transactions = data.iter_records("transactions")
+    else:
+        transactions = data.get("transactions", [])
 
     # Filter transactions where marketplace is "ebay" and psa_grade is 0.0
     filtered_transactions = [
@@ -50,7 +55,8 @@ def filter_recent_raw_ebay_sales(data):
 # Call the function
 if __name__ == '__main__':
     # input_data = load_json_file("cache/api_responses/get_volume_of_transactions_card_id=17.json")
-    input_data = get_volume_of_transactions(76783)
+    # Served from the cache; a copy past its soft TTL is refreshed in the background.
+    input_data = get_volume_of_transactions(76783, stale_while_revalidate=True)
     # Call the function
     result = filter_recent_raw_ebay_sales(input_data)
     pprint(result)
\ No newline at end of file
@@ -250,8 +250,8 @@ def check_release_date(cards):
 
 
 if __name__ == '__main__':
-    # Load the card data
-    data = get_all_sets(use_cache_only=True).get("data", [])
+    # Load the card data. A cached set list past its soft TTL is used as is and refreshed in the background.
+    data = (get_all_sets(stale_while_revalidate=True) or {}).get("data") or []
     formatted_cards, set_names = check_release_date(data)
 
     # Print the formatted output
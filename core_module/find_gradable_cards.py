@@ -1,14 +1,15 @@
 
 from core_module.card_data_utils import get_target_sets
 from core_module.card_data_utils.add_ui_labels_to_candidates import add_ui_labels_to_candidates_json
-from core_module.card_data_utils.calculate_expected_value import calculate_net_gain
+from core_module.card_data_utils.calculate_expected_value import score_card_rows
 from core_module.card_data_utils.calculate_gem_rate import calculate_gem_rate
 from core_module.card_data_utils.calculate_volume import calculate_volumes_last_month
 from core_module.card_data_utils.get_raw_to_psa10_grading_value_from_jsons import \
     get_raw_to_psa10_grading_value_from_jsons_cache
 from core_module.card_data_utils.get_recent_raw_ebay_sales import filter_recent_raw_ebay_sales
 from core_module.card_data_utils.get_target_sets import get_target_set_ids
-from core_module.service.domain import get_card_prices, get_volume_of_transactions, get_card_id_psa_pop
+from core_module.service.domain import get_card_prices, get_volume_of_transactions, get_card_id_psa_pop, \
+    get_transactions_page_cache_file_name, open_cached_payload
 from core_module.utils.file_utils import save_object_to_file, load_json_file
 from core_module.utils.util import debug_print
 
@@ -41,12 +42,12 @@ save_object_to_file(candidates, "candidates_temp.json")
 # Convert to CAD
 candidates = add_ui_labels_to_candidates_json(candidates)
 
-for card in candidates:
-    ev, total_cost, net_gain, lucrative_factor = calculate_net_gain(card, grading_cost=29)
-    card["ev"] = ev
-    card["total_cost"] = total_cost
-    card["net_gain"] = net_gain
-    card["lucrative_factor"] = lucrative_factor
+scores = score_card_rows(candidates, grading_cost=29)
+for i, card in enumerate(candidates):
+    card["ev"] = float(scores["expected_value"][i])
+    card["total_cost"] = float(scores["total_cost"][i])
+    card["net_gain"] = float(scores["net_gain"][i])
+    card["lucrative_factor"] = float(scores["lucrative_factor"][i])
 
 before_removal_of_net_gain = len(candidates)
 
@@ -62,9 +63,12 @@ after_removal_of_net_gain = len(candidates)
 Remove low volume cards
 """
 for index, candidate in enumerate(candidates, start=1):
-    volumeData = get_volume_of_transactions(candidate["id"], use_cache_only=True)
+    # Only a few fields of each sale are needed, so the cached payload is read lazily.
+    volumeData = open_cached_payload(get_transactions_page_cache_file_name(candidate["id"]))
     psa10_volume, non_psa10_volume = calculate_volumes_last_month(volumeData)
     recent_raw_ebay_sales = filter_recent_raw_ebay_sales(volumeData)
+    if volumeData is not None:
+        volumeData.close()
     candidate["psa10_volume"] = psa10_volume
     candidate["non_psa10_volume"] = non_psa10_volume
     candidate["recent_raw_ebay_sales"] = recent_raw_ebay_sales
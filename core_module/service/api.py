@@ -1,96 +1,220 @@
 import os
-from time import sleep
+import threading
+from time import monotonic, sleep
+
 import requests
+from core_module.service.http_client import HttpClient
+from core_module.service.proxy_pool import build_proxy_pool
+from core_module.service.rate_limiter import AdaptiveRateLimiter
+from core_module.service.retry_policy import RetryPolicy, RetryBudget, RetryStats, deadline_allows
 from core_module.utils.util import debug_print
 
 # Global constants
 token = os.getenv("POKEDATA_IO_TOKEN")
 BEARER_TOKEN = f"Bearer {token}"
-DEV_URL = "https://www.pokedata.io"
+# Base URL of the API. Override to point at a local stand-in such as fake_pokedata_server.
+DEV_URL = os.getenv("POKEDATA_API_URL", "https://www.pokedata.io")
 
 # --- Proxy Configuration ---
 PROXY_ENABLED = True
 PROXY_USERNAME = os.getenv("PROXY_USERNAME", "td-customer-MomsVpn")
 PROXY_PASSWORD = os.getenv("PROXY_PASSWORD", "Sharktale360")
 PROXY_SERVER = os.getenv("PROXY_SERVER", "398vripy.pr.thordata.net:9999")
+# Comma-separated list of proxy exit nodes. Falls back to the single PROXY_SERVER.
+PROXY_SERVERS = [server.strip() for server in os.getenv("PROXY_SERVERS", PROXY_SERVER).split(",") if server.strip()]
+PROXY_FAILURE_THRESHOLD = int(os.getenv("PROXY_FAILURE_THRESHOLD", "3"))
+PROXY_COOL_DOWN_SECONDS = float(os.getenv("PROXY_COOL_DOWN_SECONDS", "300"))
 
-# If this flag is True, all subsequent requests will use the proxy.
-USE_PROXY_GLOBALLY = False
+# A single pooled client, rate limiter and retry policy are shared by every request made through this module.
+_http_client = None
+_proxy_pool = None
+_rate_limiter = AdaptiveRateLimiter()
+_retry_policy = RetryPolicy()
+_retry_budget = RetryBudget()
+_retry_stats = RetryStats()
 
+# Per-thread size of the last successful response body, read back by the cache layer's metrics.
+_last_response = threading.local()
 
-def _get_proxies():
-    """Helper function to construct the proxies dictionary."""
-    if PROXY_ENABLED and PROXY_USERNAME and PROXY_PASSWORD and PROXY_SERVER:
-        proxy_url = f"https://{PROXY_USERNAME}:{PROXY_PASSWORD}@{PROXY_SERVER}"
-        print(f"Using proxy: {PROXY_SERVER}")
-        return {"https": proxy_url, "http": proxy_url}
 
-    print("Proxy use requested, but credentials are not fully configured.")
-    return None
+def get_http_client():
+    """Returns the shared, long-lived HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient()
+    return _http_client
+
+
+def get_proxy_pool():
+    """Returns the shared pool of routes (direct plus proxies), creating it on first use."""
+    global _proxy_pool
+    if _proxy_pool is None:
+        _proxy_pool = build_proxy_pool(PROXY_SERVERS, PROXY_USERNAME, PROXY_PASSWORD, enabled=PROXY_ENABLED,
+                                       failure_threshold=PROXY_FAILURE_THRESHOLD,
+                                       cool_down_seconds=PROXY_COOL_DOWN_SECONDS)
+    return _proxy_pool
+
+
+def get_proxy_pool_stats():
+    """Returns the health score and circuit breaker state of every route."""
+    return get_proxy_pool().get_stats()
 
 
-def make_get_request(endpoint, params=None):
+def get_connection_stats():
+    """Returns per-route request and connection reuse counts from the shared client."""
+    return get_http_client().get_stats()
+
+
+def get_rate_limiter_stats():
+    """Returns the current request rate and throttle event counts per route."""
+    return _rate_limiter.get_stats()
+
+
+def begin_retry_cycle(budget_seconds=None):
+    """
+    Starts a fresh retry budget and resets the per-endpoint retry counters.
+    Called at the start of each update cycle.
+
+    :param budget_seconds: Total backoff seconds allowed this cycle (defaults to the configured budget).
     """
-    Handles all shared GET request logic with automatic proxy failover.
+    global _retry_budget, _retry_stats
+    _retry_budget = RetryBudget() if budget_seconds is None else RetryBudget(budget_seconds)
+    _retry_stats = RetryStats()
 
-    It will attempt a request, and if it fails with a rate-limit error (403, 429),
-    it will retry once using a proxy. If the proxy retry succeeds, all subsequent
-    requests in the session will automatically use the proxy.
+
+def get_retry_stats():
+    """Returns per-endpoint call, retry and give-up counts since the cycle started."""
+    return _retry_stats.snapshot()
+
+
+def get_last_payload_bytes():
+    """Returns the body size in bytes of this thread's last successful request (0 if none)."""
+    return getattr(_last_response, "payload_bytes", 0)
+
+
+def make_get_request(endpoint, params=None, stream_to=None):
+    """
+    Handles all shared GET request logic with retries and automatic route failover.
+
+    Each attempt goes out on a route chosen by the proxy pool: the direct connection
+    while it is healthy, otherwise the best-scoring proxy whose circuit breaker is not
+    open. Failed requests are retried according to the module's RetryPolicy, with
+    exponential backoff and jitter. Retryable status codes (e.g. 403, 429, 500) move
+    the retry to a different route; connection errors are retried on whichever route
+    the pool picks next. A call gives up once its own deadline or the cycle's retry
+    budget would be exceeded.
+
+    If `stream_to` is given, a successful response body is written straight to that
+    file path in chunks instead of being decoded, and the path is returned.
     """
-    global USE_PROXY_GLOBALLY
     url = f"{DEV_URL}{endpoint}"
     headers = {
         'Authorization': BEARER_TOKEN
     }
 
-    # The request will be attempted up to two times.
-    # 1st attempt: Normal request (or with proxy if globally enabled).
-    # 2nd attempt: Retry with proxy if the first one was blocked.
-    for attempt in range(2):
-        is_retry_attempt = attempt > 0
-        should_use_proxy = USE_PROXY_GLOBALLY or is_retry_attempt
+    pool = get_proxy_pool()
+    _last_response.payload_bytes = 0
+    _retry_stats.record(endpoint, "calls")
+    call_deadline = monotonic() + _retry_policy.call_deadline
+    avoid_route = None
+    status_retries = 0
+    connection_retries = 0
 
-        proxies = None
-        if should_use_proxy:
-            proxies = _get_proxies()
+    while True:
+        route = pool.choose_route(avoid=avoid_route)
+        avoid_route = None
+        started_at = monotonic()
 
         try:
-            sleep(2)  # To avoid overwhelming the API
-            response = requests.get(url, headers=headers, params=params, proxies=proxies)
-            debug_print(f"Request sent to: {response.request.url} (Proxy: {bool(proxies)})")
+            _rate_limiter.acquire(route.name)  # Paces requests to the route's current adaptive rate
+            started_at = monotonic()
+            response = get_http_client().get(url, headers=headers, params=params, route=route.name,
+                                             proxies=route.proxies, stream=bool(stream_to))
+            latency = monotonic() - started_at
+            debug_print(f"Request sent to: {response.request.url} (Route: {route.name})")
 
             # --- Handle Response ---
 
             # 1. Success
             if response.status_code == 200:
                 print(f"Request successful: {response.status_code}")
-                # If a retry with proxy was successful, enable it globally.
-                if is_retry_attempt:
-                    print("Proxy retry successful. Activating proxy for all future requests.")
-                    USE_PROXY_GLOBALLY = True
+                _rate_limiter.on_success(route.name)
+                pool.record_success(route, latency)
+                if stream_to:
+                    _write_response_to_file(response, stream_to)
+                    _last_response.payload_bytes = os.path.getsize(stream_to)
+                    return stream_to
+                _last_response.payload_bytes = len(response.content)
                 return response.json()
 
-            # 2. Rate-limit / block error -> triggers a retry
-            if response.status_code in [403, 429, 500]:
-                print(f"Request failed with status {response.status_code}. Retrying with proxy...")
-                continue  # Go to the next attempt in the loop
-
-            # 3. Other HTTP error (not retryable) -> fail fast
+            # 2. Retryable error (rate-limit / block / server error) -> retry on another route
+            if _retry_policy.is_retryable_status(response.status_code):
+                if response.status_code in [403, 429]:
+                    _rate_limiter.on_throttle(route.name, response.headers.get("Retry-After"))
+                pool.record_failure(route, latency)
+                response.close()
+                if not _retry_policy.can_retry_status(status_retries):
+                    print(f"Request failed with status {response.status_code} after {status_retries} retries.")
+                    break
+                print(f"Request failed with status {response.status_code} on route '{route.name}'. Retrying...")
+                retry_event = "status_retries"
+                retry_number = status_retries
+                status_retries += 1
+                avoid_route = route.name
+
+            # 3. Other HTTP error (not retryable) -> fail fast. The route itself answered fine.
             else:
+                pool.record_success(route, latency)
                 print(f"Request failed with non-retryable status code {response.status_code}: {response.reason}")
                 print(f"Response text: {response.text}")
                 return None
 
         except requests.exceptions.RequestException as e:
-            # Catch network/connection errors and fail fast
-            print(f"A network error occurred: {e}")
-            return None
-
-    # If the loop finishes, it means all attempts failed.
+            # Network/connection errors count against the route's health.
+            print(f"A network error occurred on route '{route.name}': {e}")
+            pool.record_failure(route, monotonic() - started_at)
+            if not _retry_policy.can_retry_connection_error(connection_retries):
+                break
+            retry_event = "connection_retries"
+            retry_number = connection_retries
+            connection_retries += 1
+
+        delay = _retry_policy.backoff(retry_number)
+        if not deadline_allows(call_deadline, delay):
+            print("Request deadline reached. Giving up.")
+            break
+        if not _retry_budget.try_spend(delay):
+            print("Retry budget for this cycle is exhausted. Giving up.")
+            break
+
+        _retry_stats.record(endpoint, retry_event)
+        sleep(delay)
+
+    # If the loop exits, it means all allowed attempts failed.
+    _retry_stats.record(endpoint, "gave_up")
     print("Request failed on all attempts.")
     return None
 
 
+def _write_response_to_file(response, file_path, chunk_size=65536):
+    """
+    Helper to stream a response body to disk without holding it in memory.
+    The body goes to a temporary file first so a dropped connection never leaves
+    a truncated file at `file_path`.
+    """
+    temp_path = f"{file_path}.part"
+    try:
+        with open(temp_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+        os.replace(temp_path, file_path)
+    finally:
+        response.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return file_path
+
+
 # API-specific functions
 def get_account_info():
     return make_get_request("/v0/account")
@@ -112,8 +236,8 @@ def get_card_id_psa_pop(set_id=None):
     return make_get_request("/api/cards/pops", params={"id": set_id})
 
 
-def get_volume_of_transactions(card_id):
-    return make_get_request("/api/transactions", params={"card_id": card_id, "page": 0})
+def get_volume_of_transactions(card_id, page=0, stream_to=None):
+    return make_get_request("/api/transactions", params={"card_id": card_id, "page": page}, stream_to=stream_to)
 
 
 # Debugging/testing function outputs
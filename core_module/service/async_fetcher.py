@@ -0,0 +1,72 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from core_module.utils.util import debug_print
+
+
+class AsyncFetchEngine:
+    """
+    Fetches data for many card or set IDs with a bounded number of requests in flight.
+
+    The fetch functions in `domain` are blocking (they go through the cache layer and
+    the pooled HTTP client), so each call runs on a worker thread while asyncio keeps
+    at most `max_concurrency` of them running and hands results back as they finish.
+    """
+
+    def __init__(self, fetch_function, max_concurrency=4):
+        """
+        :param fetch_function: A callable taking a single ID and returning its data,
+                               e.g. `functools.partial(domain.get_card_id_psa_pop, use_network_only=True)`.
+        :param max_concurrency: The maximum number of fetches running at the same time.
+        """
+        self.fetch_function = fetch_function
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    async def iter_results(self, ids, executor):
+        """
+        Asynchronously yields `(id, data)` tuples in completion order, not input order.
+        A fetch that raises yields `(id, None)` so one bad ID never stops the batch.
+
+        :param ids: The card or set IDs to fetch.
+        :param executor: The thread pool the fetches run on; its worker count bounds how many run at once.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def fetch_one(item_id):
+            try:
+                data = await loop.run_in_executor(executor, self.fetch_function, item_id)
+            except Exception as e:
+                debug_print(f"Fetch failed for id {item_id}: {e}")
+                data = None
+            return item_id, data
+
+        tasks = [asyncio.create_task(fetch_one(item_id)) for item_id in ids]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def run(self, ids, on_result):
+        """
+        Synchronous entry point. Fetches every ID and calls `on_result(id, data)` on
+        the calling thread as each result arrives, so callers can write to the
+        database without sharing their connection across threads.
+
+        If `on_result` raises, the fetches that have not started are dropped and the
+        ones still running are not waited for.
+
+        :param ids: The card or set IDs to fetch.
+        :param on_result: Callback invoked once per ID with the fetched data.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+
+        async def consume():
+            async for item_id, data in self.iter_results(ids, executor):
+                on_result(item_id, data)
+
+        try:
+            asyncio.run(consume())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
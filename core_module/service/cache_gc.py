@@ -0,0 +1,178 @@
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+# This adds the project root to the Python path to allow for absolute imports.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core_module.utils.file_utils import get_api_response_cache_dir, get_cache_file_path
+
+# --- Cache GC Configuration ---
+CACHE_GC_MAX_AGE_DAYS = float(os.getenv("CACHE_GC_MAX_AGE_DAYS", "60"))
+CACHE_GC_MAX_BYTES = int(float(os.getenv("CACHE_GC_MAX_MB", "0")) * 1024 * 1024)  # 0 = no size limit
+CACHE_GC_INTERVAL_SECONDS = float(os.getenv("CACHE_GC_INTERVAL_HOURS", "24")) * 3600
+
+# Days a cached response is kept, by the endpoint part of its cache key. Others use CACHE_GC_MAX_AGE_DAYS.
+CACHE_GC_ENDPOINT_RETENTION_DAYS = {
+    "get_volume_of_transactions_card_id": 30,
+    "transaction_pages_card_id": 30,
+}
+
+LAST_RUN_META_KEY = "gc_last_run"
+
+
+class CacheGarbageCollector:
+    """
+    Evicts old responses from the file cache, separately from the write path.
+
+    Candidates come from the cache manifest, never from a directory listing:
+    - Age: an entry older than its endpoint's retention (or the default max age) is removed.
+    - Size: if the cache is still over `max_total_bytes`, the oldest entries go first
+      until it fits.
+    Each run returns a report of what was reclaimed.
+
+    Only files are collected. With `CACHE_BACKEND=sqlite` that means the streamed
+    transaction pages; responses kept in the SQLiteResponseStore are not evicted.
+    """
+
+    def __init__(self, manifest, cache_dir=None, max_age_days=CACHE_GC_MAX_AGE_DAYS,
+                 max_total_bytes=CACHE_GC_MAX_BYTES, endpoint_retention_days=None,
+                 interval_seconds=CACHE_GC_INTERVAL_SECONDS, on_remove=None):
+        """
+        :param manifest: The CacheManifest indexing `cache_dir`.
+        :param max_age_days: Default retention in days.
+        :param max_total_bytes: Size budget for the whole cache (0 disables the size policy).
+        :param endpoint_retention_days: A dictionary of endpoint name to retention in days.
+        :param interval_seconds: How often `collect_if_due` actually collects.
+        :param on_remove: Optional callback receiving each removed cache key (e.g. to drop it from memory).
+        """
+        self.manifest = manifest
+        self.cache_dir = cache_dir or get_api_response_cache_dir()
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        self.endpoint_retention_days = (CACHE_GC_ENDPOINT_RETENTION_DAYS if endpoint_retention_days is None
+                                        else endpoint_retention_days)
+        self.interval_seconds = interval_seconds
+        self.on_remove = on_remove
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def is_due(self, now=None):
+        """Returns True if the interval has passed since the last run or the cache is over its size budget."""
+        now = time.time() if now is None else now
+        last_run = float(self.manifest.get_meta(LAST_RUN_META_KEY) or 0)
+        if now - last_run >= self.interval_seconds:
+            return True
+        return bool(self.max_total_bytes and self.manifest.total_size() > self.max_total_bytes)
+
+    def collect_if_due(self):
+        """Runs a collection if one is due; returns its report, or None if it was skipped."""
+        if not self.is_due():
+            return None
+        return self.collect()
+
+    def collect(self, now=None, dry_run=False):
+        """
+        Applies the age and size policies.
+
+        :param now: The reference time (defaults to now).
+        :param dry_run: If True, only reports what would be removed.
+        :return: A report dictionary with the files and bytes reclaimed, split by endpoint and reason.
+        """
+        now = now or datetime.now()
+        report = {"files_removed": 0, "bytes_reclaimed": 0, "by_endpoint": {}, "by_reason": {}, "dry_run": dry_run}
+
+        with self._lock:
+            self.manifest.ensure_built(self.cache_dir)
+            entries = self.manifest.entries_oldest_first()
+            remaining_bytes = sum(size for _, _, _, size in entries)
+            kept = []
+
+            for cache_key, endpoint, updated_date, size in entries:
+                retention = self.endpoint_retention_days.get(endpoint, self.max_age_days)
+                cutoff = (now - timedelta(days=retention)).strftime('%Y-%m-%d %H:%M:%S')
+                if updated_date is None or updated_date < cutoff:
+                    self._remove(cache_key, endpoint, size, "age", report, dry_run)
+                    remaining_bytes -= size
+                else:
+                    kept.append((cache_key, endpoint, size))
+
+            if self.max_total_bytes:
+                for cache_key, endpoint, size in kept:
+                    if remaining_bytes <= self.max_total_bytes:
+                        break
+                    self._remove(cache_key, endpoint, size, "size", report, dry_run)
+                    remaining_bytes -= size
+
+            if not dry_run:
+                self.manifest.set_meta(LAST_RUN_META_KEY, time.time())
+
+        report["bytes_remaining"] = remaining_bytes
+        self._print_report(report)
+        return report
+
+    def _remove(self, cache_key, endpoint, size, reason, report, dry_run):
+        """Helper to delete one cache file and its manifest row, and count it in the report."""
+        if not dry_run:
+            try:
+                os.remove(get_cache_file_path(cache_key, self.cache_dir))
+            except FileNotFoundError:
+                pass  # Already gone; only the manifest row was left
+            except OSError as e:
+                print(f"Error removing {cache_key}: {e}")
+                return
+            self.manifest.remove(cache_key)
+            if self.on_remove:
+                self.on_remove(cache_key)
+
+        report["files_removed"] += 1
+        report["bytes_reclaimed"] += size
+        endpoint_report = report["by_endpoint"].setdefault(endpoint, {"files": 0, "bytes": 0})
+        endpoint_report["files"] += 1
+        endpoint_report["bytes"] += size
+        report["by_reason"][reason] = report["by_reason"].get(reason, 0) + 1
+
+    @staticmethod
+    def _print_report(report):
+        action = "Would reclaim" if report["dry_run"] else "Reclaimed"
+        print(f"Cache GC: {action} {report['bytes_reclaimed'] / (1024 * 1024):.1f} MB from "
+              f"{report['files_removed']} files; {report['bytes_remaining'] / (1024 * 1024):.1f} MB remain.")
+        for endpoint, counts in sorted(report["by_endpoint"].items()):
+            print(f"- {endpoint}: {counts['files']} files, {counts['bytes'] / (1024 * 1024):.1f} MB")
+
+    def start(self, check_every_seconds=600):
+        """
+        Starts a daemon thread that checks every `check_every_seconds` whether a
+        collection is due (by schedule or by size) and runs it.
+        """
+        if self._thread is not None:
+            return
+
+        def loop():
+            while not self._stop.wait(check_every_seconds):
+                try:
+                    self.collect_if_due()
+                except Exception as e:
+                    print(f"Cache GC run failed: {e}")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name="cache-gc", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+if __name__ == '__main__':
+    # Run a collection now; pass --dry-run to only see what would be reclaimed.
+    from core_module.service.domain import get_cache_gc
+
+    get_cache_gc().collect(dry_run="--dry-run" in sys.argv)
@@ -0,0 +1,264 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+# This adds the project root to the Python path to allow for absolute imports.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core_module.service.response_store import is_empty_payload, parse_cache_key, payload_checksum
+from core_module.utils.file_utils import get_api_response_cache_dir, get_repo_root, iter_cache_files, \
+    read_serialized_file
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS cache_manifest (
+        cache_key TEXT PRIMARY KEY,
+        endpoint TEXT NOT NULL,
+        entity_id TEXT,
+        updated_date TEXT,
+        size INTEGER NOT NULL DEFAULT 0,
+        is_empty INTEGER NOT NULL DEFAULT 0,
+        is_valid INTEGER NOT NULL DEFAULT 1,
+        checksum TEXT
+    )
+"""
+CREATE_META_TABLE = """
+    CREATE TABLE IF NOT EXISTS cache_manifest_meta (
+        meta_key TEXT PRIMARY KEY,
+        meta_value TEXT
+    )
+"""
+CREATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_cache_manifest_endpoint_updated ON cache_manifest (endpoint, updated_date)",
+    "CREATE INDEX IF NOT EXISTS idx_cache_manifest_updated ON cache_manifest (updated_date)",
+)
+# Set by `rebuild` once the whole directory has been indexed. Until then, rows written by
+# `save_cache` cover only the files saved since, so the manifest still needs a rebuild.
+BUILT_META_KEY = "built"
+
+UPSERT_ENTRY = """
+    INSERT INTO cache_manifest (cache_key, endpoint, entity_id, updated_date, size, is_empty, is_valid, checksum)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(cache_key) DO UPDATE SET
+        endpoint = excluded.endpoint,
+        entity_id = excluded.entity_id,
+        updated_date = excluded.updated_date,
+        size = excluded.size,
+        is_empty = excluded.is_empty,
+        is_valid = excluded.is_valid,
+        checksum = excluded.checksum
+"""
+
+
+def get_default_manifest_path():
+    return os.path.join(get_repo_root(), "cache", "cache_manifest.sqlite3")
+
+
+class CacheManifest:
+    """
+    An index of the files in the response cache directory.
+
+    One row per cache file holds its key, endpoint, entity ID, updated_date, size,
+    empty flag and checksum. Rows are written whenever the cache saves or deletes a
+    file, so staleness scans become indexed queries instead of opening and parsing
+    every file. `rebuild` re-creates the index from the directory when it is missing.
+
+    With `CACHE_BACKEND=sqlite` only streamed transaction pages are files, so only they
+    are indexed here; the SQLiteResponseStore answers the same queries from its own columns.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        :param db_path: Path of the SQLite file (defaults to cache/cache_manifest.sqlite3).
+        """
+        self.db_path = db_path or get_default_manifest_path()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = self._connection()
+        conn.execute(CREATE_TABLE)
+        conn.execute(CREATE_META_TABLE)
+        for statement in CREATE_INDEXES:
+            conn.execute(statement)
+        conn.commit()
+
+    def _connection(self):
+        """Helper to get this thread's connection; SQLite connections are not shared across threads."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, cache_key, data, size, checksum=None, commit=True):
+        """
+        Records (or replaces) the entry for a saved cache file.
+
+        :param cache_key: The cache file name.
+        :param data: The saved response, used for updated_date and the empty flag.
+        :param size: The file size in bytes.
+        :param checksum: The content checksum (computed from `data` if not given).
+        """
+        updated_date = data.get("updated_date") if isinstance(data, dict) else None
+        self.record_file(cache_key, updated_date, size, is_empty_payload(data), checksum or payload_checksum(data),
+                         commit=commit)
+
+    def record_file(self, cache_key, updated_date, size, is_empty, checksum, commit=True):
+        """
+        Records an entry from already-known metadata, for files written without
+        decoding them (such as streamed payloads).
+        """
+        endpoint, entity_id = parse_cache_key(cache_key)
+        conn = self._connection()
+        conn.execute(UPSERT_ENTRY, (cache_key, endpoint, entity_id, updated_date, size, int(is_empty), 1, checksum))
+        if commit:
+            conn.commit()
+
+    def record_invalid(self, cache_key, size, commit=True):
+        """Records a cache file that could not be parsed."""
+        endpoint, entity_id = parse_cache_key(cache_key)
+        conn = self._connection()
+        conn.execute(UPSERT_ENTRY, (cache_key, endpoint, entity_id, None, size, 0, 0, None))
+        if commit:
+            conn.commit()
+
+    def remove(self, cache_key):
+        conn = self._connection()
+        conn.execute("DELETE FROM cache_manifest WHERE cache_key = ?", (cache_key,))
+        conn.commit()
+
+    def get(self, cache_key):
+        """
+        Returns the manifest entry for a key as a dictionary, or None.
+        """
+        conn = self._connection()
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute("SELECT * FROM cache_manifest WHERE cache_key = ?", (cache_key,)).fetchone()
+        finally:
+            conn.row_factory = None
+        return dict(row) if row else None
+
+    def get_checksum(self, cache_key):
+        """Returns the content checksum recorded for a key, or None."""
+        row = self._connection().execute(
+            "SELECT checksum FROM cache_manifest WHERE cache_key = ?", (cache_key,)).fetchone()
+        return row[0] if row else None
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM cache_manifest").fetchone()[0]
+
+    def total_size(self):
+        """Returns the total size in bytes of all indexed cache files."""
+        return self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM cache_manifest").fetchone()[0]
+
+    def entries_oldest_first(self):
+        """
+        Returns every entry as a (cache_key, endpoint, updated_date, size) tuple, oldest first.
+        Entries without an updated_date sort first.
+        """
+        return self._connection().execute(
+            "SELECT cache_key, endpoint, updated_date, size FROM cache_manifest "
+            "ORDER BY updated_date IS NOT NULL, updated_date, cache_key").fetchall()
+
+    def get_meta(self, meta_key):
+        row = self._connection().execute(
+            "SELECT meta_value FROM cache_manifest_meta WHERE meta_key = ?", (meta_key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, meta_key, meta_value):
+        conn = self._connection()
+        conn.execute("INSERT INTO cache_manifest_meta (meta_key, meta_value) VALUES (?, ?) "
+                     "ON CONFLICT(meta_key) DO UPDATE SET meta_value = excluded.meta_value",
+                     (meta_key, str(meta_value)))
+        conn.commit()
+
+    def find_stale(self, endpoint=None, older_than=None, include_empty=True, include_invalid=True):
+        """
+        Finds cache entries that need a refresh.
+
+        :param endpoint: Only look at this endpoint (e.g. 'get_card_prices_setId'); None for all.
+        :param older_than: A datetime; entries updated before it (or without a date) are stale.
+        :param include_empty: Also report entries whose payload is empty.
+        :param include_invalid: Also report files that could not be parsed.
+        :return: A list of (cache_key, entity_id, reason) tuples, ordered by key.
+        """
+        cutoff = older_than.strftime('%Y-%m-%d %H:%M:%S') if older_than else None
+        query = """
+            SELECT cache_key, entity_id,
+                   CASE
+                       WHEN is_valid = 0 THEN 'Invalid JSON'
+                       WHEN is_empty = 1 THEN 'Empty data'
+                       WHEN updated_date IS NULL THEN 'Missing ''updated_date'' key'
+                       ELSE 'Stale date: ' || substr(updated_date, 1, 10)
+                   END AS reason
+            FROM cache_manifest
+            WHERE (? IS NULL OR endpoint = ?)
+              AND ((? = 1 AND is_valid = 0)
+                   OR (? = 1 AND is_valid = 1 AND is_empty = 1)
+                   OR (is_valid = 1 AND is_empty = 0 AND ? IS NOT NULL
+                       AND (updated_date IS NULL OR updated_date < ?)))
+            ORDER BY cache_key
+        """
+        rows = self._connection().execute(query, (
+            endpoint, endpoint, int(include_invalid), int(include_empty), cutoff, cutoff))
+        return [tuple(row) for row in rows]
+
+    def rebuild(self, directory=None, batch_size=500):
+        """
+        Re-creates the manifest from the cache directory (either layout), parsing every file once.
+
+        :param directory: The cache directory (defaults to cache/api_responses).
+        :return: The number of files indexed.
+        """
+        directory = directory or get_api_response_cache_dir()
+        conn = self._connection()
+        conn.execute("DELETE FROM cache_manifest")
+        conn.execute("DELETE FROM cache_manifest_meta WHERE meta_key = ?", (BUILT_META_KEY,))
+        if not os.path.isdir(directory):
+            conn.commit()
+            self.set_meta(BUILT_META_KEY, 1)
+            return 0
+
+        indexed = 0
+        for filename, file_path in iter_cache_files(directory):
+            size = os.path.getsize(file_path)
+            try:
+                data = read_serialized_file(file_path)
+                self.record(filename, data, size, commit=False)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                self.record_invalid(filename, size, commit=False)
+            indexed += 1
+            if indexed % batch_size == 0:
+                conn.commit()
+        conn.commit()
+        self.set_meta(BUILT_META_KEY, 1)
+        print(f"Cache manifest rebuilt: {indexed} files indexed.")
+        return indexed
+
+    def ensure_built(self, directory=None):
+        """
+        Rebuilds the manifest unless a rebuild has completed before. Checking the row count
+        is not enough: on an existing cache the first save adds a row while the files
+        already on disk are still missing.
+        """
+        if self.get_meta(BUILT_META_KEY) is None:
+            print("Cache manifest was never built; rebuilding it from the cache directory...")
+            self.rebuild(directory)
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+if __name__ == '__main__':
+    # Rebuild command: python core_module/service/cache_manifest.py
+    manifest = CacheManifest()
+    manifest.rebuild()
+    print(f"{manifest.count()} entries, {len(manifest.find_stale())} empty or invalid.")
@@ -0,0 +1,147 @@
+import threading
+
+# Upper bounds (in milliseconds) of the latency histogram buckets; slower observations go in a final bucket.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """
+    A fixed-bucket latency histogram. Percentiles are reported as the upper bound of
+    the bucket they fall in.
+    """
+
+    def __init__(self, bounds_ms=LATENCY_BUCKETS_MS):
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds):
+        elapsed_ms = seconds * 1000
+        index = next((i for i, bound in enumerate(self.bounds_ms) if elapsed_ms <= bound), len(self.bounds_ms))
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction):
+        """Returns the bucket bound in ms (capped at the max seen) below which `fraction` of observations fall."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(self.bounds_ms):
+                    return min(float(self.bounds_ms[index]), round(self.max_ms, 1))
+                break
+        return round(self.max_ms, 1)
+
+    def snapshot(self):
+        labels = [f"<={bound}ms" for bound in self.bounds_ms] + [f">{self.bounds_ms[-1]}ms"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
+
+class _EndpointMetrics:
+    """The counters and histograms of one endpoint."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.bypasses = 0
+        self.network_calls = 0
+        self.network_failures = 0
+        self.payload_bytes = 0
+        self.network_latency = LatencyHistogram()
+        self.write_time = LatencyHistogram()
+
+    def snapshot(self):
+        lookups = self.hits + self.misses + self.negative_hits + self.bypasses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "bypasses": self.bypasses,
+            "served_from_cache": round((self.hits + self.negative_hits) / lookups, 3) if lookups else 0.0,
+            "network_calls": self.network_calls,
+            "network_failures": self.network_failures,
+            "payload_bytes": self.payload_bytes,
+            "network_latency": self.network_latency.snapshot(),
+            "write_time": self.write_time.snapshot()
+        }
+
+
+class CacheMetrics:
+    """
+    Thread-safe per-endpoint instrumentation of the response cache.
+
+    For each endpoint it counts cache hits, misses, negative-cache hits and forced
+    network fetches (bypasses), and records network latency, payload bytes and cache
+    write time. Counters cover the time since the last `reset`.
+    """
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _metrics(self, endpoint):
+        """Helper to get an endpoint's metrics (called with the lock held)."""
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics()
+        return metrics
+
+    def record_hit(self, endpoint):
+        with self._lock:
+            self._metrics(endpoint).hits += 1
+
+    def record_miss(self, endpoint):
+        with self._lock:
+            self._metrics(endpoint).misses += 1
+
+    def record_negative_hit(self, endpoint):
+        with self._lock:
+            self._metrics(endpoint).negative_hits += 1
+
+    def record_bypass(self, endpoint):
+        """Records a lookup that skipped the cache because a network fetch was forced."""
+        with self._lock:
+            self._metrics(endpoint).bypasses += 1
+
+    def record_network(self, endpoint, seconds, payload_bytes=0, failed=False):
+        """
+        Records one network fetch.
+
+        :param seconds: Wall time of the call, including retries and rate limiting.
+        :param payload_bytes: Size of the response body.
+        :param failed: True if the call returned nothing usable.
+        """
+        with self._lock:
+            metrics = self._metrics(endpoint)
+            metrics.network_calls += 1
+            metrics.network_failures += int(failed)
+            metrics.payload_bytes += payload_bytes or 0
+            metrics.network_latency.observe(seconds)
+
+    def record_write(self, endpoint, seconds):
+        with self._lock:
+            self._metrics(endpoint).write_time.observe(seconds)
+
+    def snapshot(self):
+        """Returns every endpoint's counters and histogram summaries."""
+        with self._lock:
+            return {endpoint: metrics.snapshot() for endpoint, metrics in sorted(self._endpoints.items())}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
@@ -0,0 +1,62 @@
+import threading
+
+
+class ChangeTracker:
+    """
+    Remembers the content checksum of the latest fetch of each call, so consumers
+    can compare it with the checksum of what they last ingested and skip
+    re-ingesting a payload that has not changed.
+
+    Calls are keyed like the negative cache: by endpoint name and a key built
+    from the call's arguments. Per-endpoint counters give the share of fetches
+    that were found unchanged since the last `reset`.
+    """
+
+    def __init__(self):
+        self._checksums = {}  # endpoint -> {key: checksum}
+        self._counts = {}  # endpoint -> [fetched, unchanged]
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, key, checksum):
+        """Records the content checksum of one fetch."""
+        with self._lock:
+            self._checksums.setdefault(endpoint, {})[key] = checksum
+            self._counts.setdefault(endpoint, [0, 0])[0] += 1
+
+    def get_checksum(self, endpoint, key):
+        """Returns the checksum of the latest fetch of this call, or None if it was not fetched."""
+        with self._lock:
+            return self._checksums.get(endpoint, {}).get(key)
+
+    def is_unchanged(self, endpoint, key, ingested_checksum):
+        """
+        Returns True if the latest fetch of this call has the checksum `ingested_checksum`.
+        False whenever either checksum is unknown, so the payload is ingested in full.
+        """
+        with self._lock:
+            checksum = self._checksums.get(endpoint, {}).get(key)
+            unchanged = checksum is not None and checksum == ingested_checksum
+            if unchanged:
+                self._counts.setdefault(endpoint, [0, 0])[1] += 1
+            return unchanged
+
+    def get_stats(self):
+        """
+        Returns, per endpoint, how many payloads were fetched, how many were unchanged,
+        and the resulting skip ratio.
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    "fetched": fetched,
+                    "unchanged": unchanged,
+                    "skip_ratio": round(unchanged / fetched, 3) if fetched else 0.0
+                }
+                for endpoint, (fetched, unchanged) in self._counts.items()
+            }
+
+    def reset(self):
+        """Clears the checksums and counters, e.g. at the start of an update cycle."""
+        with self._lock:
+            self._checksums.clear()
+            self._counts.clear()
@@ -1,65 +1,28 @@
-import sys
-import os
-import json
 from datetime import datetime, timedelta
 
-from core_module.utils.file_utils import get_api_response_cache_dir
+from core_module.service.domain import get_cache_manifest
+from core_module.utils.file_utils import get_api_response_cache_dir, get_cache_file_path
 
 
 def get_outdated_or_invalid_files_with_diagnostics():
     """
-    Check JSON files and identify outdated files, null data, or encoding issues.
+    Identify outdated files, null data, or encoding issues, using the cache
+    manifest index instead of opening every file. The manifest is rebuilt first
+    if it is missing.
 
     Returns:
     - A list of invalid files.
     """
-    # Simulate the cache_dir function
     cache_dir = get_api_response_cache_dir()
-    invalid_files = []
     time_threshold = datetime.now() - timedelta(hours=48)
 
-    # Get all JSON files in the directory
-    all_files = [file_name for file_name in os.listdir(cache_dir) if file_name.endswith('.json')]
-    total_files = len(all_files)
+    manifest = get_cache_manifest()
+    manifest.ensure_built(cache_dir)
 
-    # Iterate files, tracking progress
-    for i, file_name in enumerate(all_files, start=1):
-        file_path = os.path.join(cache_dir, file_name)
-        try:
-            # Check JSON validity
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+    invalid_files = [get_cache_file_path(cache_key, cache_dir)
+                     for cache_key, _, _ in manifest.find_stale(older_than=time_threshold)]
 
-            # Check if `updated_date` exists and is older than 48 hours
-            if 'updated_date' in data:
-                try:
-                    updated_date = datetime.strptime(data['updated_date'], "%Y-%m-%d %H:%M:%S")
-                    if updated_date < time_threshold:  # If it's outdated
-                        invalid_files.append(file_path)
-                        continue
-                except ValueError:
-                    invalid_files.append(file_path)
-                    continue
-            else:
-                invalid_files.append(file_path)
-                continue
-
-            # Check if `data` exists and is null
-            if 'data' not in data or data['data'] is None:
-                other_keys = [key for key in data.keys() if key != 'updated_date']
-                if len(other_keys) == 0:
-                    invalid_files.append(file_path)
-                    continue
-        except Exception:
-            invalid_files.append(file_path)
-
-        # Update progress on the same console line
-        # Use \r to return the cursor to the start of the line and overwrite
-        sys.stdout.write(f"\rProcessing files... {i}/{total_files} files checked.")
-        sys.stdout.flush()
-
-    # Finalize with a new line after progress ends
-    print("\nProcessing complete!")
+    print(f"Processing complete! {len(invalid_files)} of {manifest.count()} files are outdated or invalid.")
 
     # Return the list of invalid files
     return invalid_files
@@ -1,14 +1,216 @@
+import hashlib
+import json
 import os
+import shutil
 import traceback
 from datetime import datetime
-from time import sleep
+from time import monotonic, sleep
 
 from core_module.service import api
-from core_module.utils.file_utils import save_object_to_file, load_json_file, get_repo_root, get_api_response_cache_dir
+from core_module.service.cache_gc import CacheGarbageCollector
+from core_module.service.cache_metrics import CacheMetrics
+from core_module.service.cache_manifest import CacheManifest
+from core_module.service.change_tracker import ChangeTracker
+from core_module.service.memory_cache import MemoryCache, MEMORY_CACHE_ENABLED
+from core_module.service.negative_cache import NegativeCache
+from core_module.service.response_store import SQLiteResponseStore, parse_cache_key, payload_checksum
+from core_module.service.revalidator import BackgroundRevalidator, EXPIRED, STALE
+from core_module.service.single_flight import SingleFlight
+from core_module.utils.file_utils import CACHE_FILE_FORMAT, save_object_to_file, load_json_file, get_repo_root, \
+    get_cache_file_path
+from core_module.utils.json_stream import iter_json_object_members
+from core_module.utils.lazy_payload import LazyPayload
 from core_module.utils.util import generate_file_name_from_function_info, debug_print
 
+# Where cached responses live: "file" (one JSON file per call) or "sqlite" (the compressed SQLiteResponseStore).
+# Streamed transaction pages are always written as files, since they are ingested from disk; in sqlite mode
+# readers fall back to the file cache for them, and only those files are indexed by the manifest and the GC.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")
 
-def handle_cache_and_api(api_function, *args, delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False):
+# Concurrent callers asking for the same cache key share a single network call and cache write.
+_single_flight = SingleFlight()
+
+# Content checksum of each call's latest fetch, compared by consumers with what they last ingested.
+_change_tracker = ChangeTracker()
+
+# Per-endpoint hit/miss counters and latency histograms of the cache and the network calls behind it.
+_cache_metrics = CacheMetrics()
+
+# IDs an endpoint answered with nothing, kept outside the response cache so scanners never treat them as stale.
+_negative_cache = NegativeCache(os.path.join(get_repo_root(), "cache", "negative_cache.sqlite3"))
+
+
+_response_store = None
+_cache_manifest = None
+_cache_gc = None
+
+# Bounded in-process tier in front of the response cache, so repeated reads skip the disk and json.load.
+_memory_cache = MemoryCache() if MEMORY_CACHE_ENABLED else None
+
+# Worker pool refreshing stale responses for callers using stale-while-revalidate.
+_revalidator = BackgroundRevalidator()
+
+
+def get_response_store():
+    """Returns the shared SQLite response store, creating it on first use."""
+    global _response_store
+    if _response_store is None:
+        _response_store = SQLiteResponseStore()
+    return _response_store
+
+
+def get_cache_manifest():
+    """Returns the shared index of the response cache directory, creating it on first use."""
+    global _cache_manifest
+    if _cache_manifest is None:
+        _cache_manifest = CacheManifest()
+    return _cache_manifest
+
+
+def get_cache_gc():
+    """Returns the shared garbage collector for the response cache, creating it on first use."""
+    global _cache_gc
+    if _cache_gc is None:
+        _cache_gc = CacheGarbageCollector(get_cache_manifest(), on_remove=invalidate_memory_cache)
+    return _cache_gc
+
+
+def find_stale_responses(endpoint=None, older_than=None, include_empty=True):
+    """
+    Finds cached responses that need a refresh under the configured backend. The file cache
+    manifest is always consulted (it is rebuilt first if it was never built); in sqlite mode
+    the response store's entries are added to it.
+
+    Args:
+        endpoint (str, optional): Only look at this endpoint, e.g. 'get_card_prices_setId'.
+        older_than (datetime, optional): Responses updated before it are stale.
+        include_empty (bool): Also report responses whose payload is empty.
+
+    Returns:
+        list: (cache_key, entity_id, reason) tuples, ordered by key.
+    """
+    manifest = get_cache_manifest()
+    manifest.ensure_built()
+    stale = manifest.find_stale(endpoint, older_than=older_than, include_empty=include_empty)
+    if CACHE_BACKEND == "sqlite":
+        stale = sorted(stale + get_response_store().find_stale(endpoint, older_than, include_empty))
+    return stale
+
+
+def get_memory_cache_stats():
+    """Returns the memory tier's hit/miss/eviction counters, or None if the tier is disabled."""
+    return _memory_cache.get_stats() if _memory_cache else None
+
+
+def get_cache_metrics():
+    """Returns the per-endpoint cache counters and latency histograms since the last reset."""
+    return _cache_metrics.snapshot()
+
+
+def reset_cache_metrics():
+    """Clears the cache counters, e.g. at the start of an update cycle."""
+    _cache_metrics.reset()
+
+
+def invalidate_memory_cache(cache_file_name=None):
+    """
+    Drops one key from the memory tier, or the whole tier if no key is given.
+    Needed when a cache file is changed outside this module.
+    """
+    if _memory_cache is None:
+        return
+    if cache_file_name is None:
+        _memory_cache.clear()
+    else:
+        _memory_cache.invalidate(cache_file_name)
+
+
+def get_revalidation_stats():
+    """Returns the background refresh counters of the stale-while-revalidate mode."""
+    return _revalidator.get_stats()
+
+
+def get_deduplicated_call_count():
+    """Returns how many network calls were avoided by single-flight coalescing."""
+    return _single_flight.get_deduplicated_count()
+
+
+def is_known_empty(api_function, *args):
+    """Returns True if the API recently answered this call with nothing and it is not due for a re-check."""
+    return _negative_cache.is_known_empty(api_function.__name__, _negative_cache_key(args))
+
+
+def filter_known_empty(api_function, ids):
+    """
+    Drops the IDs the API is known to have nothing for, so callers can plan their
+    network calls without them.
+
+    Args:
+        api_function (callable): The API function the IDs would be passed to.
+        ids (list): The IDs to filter.
+
+    Returns:
+        list: The IDs still worth fetching, in their original order.
+    """
+    return _negative_cache.filter_ids(api_function.__name__, ids)
+
+
+def get_negative_cache_stats():
+    """Returns the number of known-empty IDs per endpoint and how many calls they saved."""
+    return _negative_cache.get_stats()
+
+
+def get_payload_checksum(api_function, *args):
+    """
+    Returns the content checksum of this call's latest fetch in this cycle, or None if it
+    was not fetched. Consumers store it once they have ingested the payload.
+    """
+    return _change_tracker.get_checksum(api_function.__name__, _negative_cache_key(args))
+
+
+def is_payload_unchanged(api_function, *args, ingested_checksum=None):
+    """
+    Returns True if the latest fetch of this call has the same content as the payload a
+    consumer last ingested, so ingesting it again is redundant.
+
+    Args:
+        api_function (callable): The API function that was fetched.
+        *args: The arguments it was called with.
+        ingested_checksum (str, optional): The checksum the consumer stored after its last
+            successful ingest. Without it the payload always counts as changed.
+    """
+    return _change_tracker.is_unchanged(api_function.__name__, _negative_cache_key(args), ingested_checksum)
+
+
+def get_change_stats():
+    """Returns the number of fetched and unchanged payloads per endpoint, with the skip ratio."""
+    return _change_tracker.get_stats()
+
+
+def reset_change_stats():
+    """Clears the fetched checksums and change counters, e.g. at the start of an update cycle."""
+    _change_tracker.reset()
+
+
+def _negative_cache_key(args):
+    """Helper to build the negative cache key from the API call's arguments."""
+    return "_".join(str(arg) for arg in args)
+
+
+def _is_empty_response(data):
+    """
+    Helper to tell an empty answer apart from a failed request (None).
+    An empty list/dict, or a dict whose values are all None or empty, counts as empty.
+    """
+    if data is None:
+        return False
+    if isinstance(data, dict):
+        return all(value is None or (isinstance(value, (list, dict)) and not value) for value in data.values())
+    return not data
+
+
+def handle_cache_and_api(api_function, *args, delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False,
+                         stale_while_revalidate=False):
     """
     Generalized function to handle caching, API calls, and `updated_date`.
 
@@ -19,6 +221,8 @@ def handle_cache_and_api(api_function, *args, delete_cache=False, use_cache_only
         use_cache_only (bool): If True, only returns data if it exists in the cache; otherwise returns None.
         cache_file_name (str, optional): Manually specify the cache file name. If None, it's auto-generated.
         use_network_only (bool): If True, bypasses the cache read and fetches directly from the network.
+        stale_while_revalidate (bool): If True, a cached response past its soft TTL is returned right away
+            and refreshed in the background; one past its hard TTL is fetched before returning.
 
     Returns:
         dict or None: Cached or API-fetched data, or None if cache-only is used and no cache exists.
@@ -34,11 +238,31 @@ def handle_cache_and_api(api_function, *args, delete_cache=False, use_cache_only
             if use_cache_only:
                 return None
 
+        # A forced network fetch must never be answered from the memory tier.
+        if use_network_only:
+            invalidate_memory_cache(file_name)
+
         # Handle Cache Read (unless network is forced)
-        if not use_network_only and not delete_cache:
+        endpoint = api_function.__name__
+        if use_network_only or delete_cache:
+            _cache_metrics.record_bypass(endpoint)
+        else:
             if cache := get_cache(file_name):
                 cache = prepare_cache_with_updated_date(cache, file_name)
-                return cache
+                if not stale_while_revalidate or use_cache_only:
+                    _cache_metrics.record_hit(endpoint)
+                    return cache
+                freshness = _revalidator.classify(parse_cache_key(file_name)[0], cache)
+                if freshness == STALE:
+                    _revalidator.schedule(file_name, lambda: _single_flight.do(
+                        file_name, lambda: _fetch_and_save(api_function, args, file_name)))
+                if freshness != EXPIRED:
+                    _cache_metrics.record_hit(endpoint)
+                    return cache
+                debug_print(f"Cache for '{file_name}' is past its hard TTL; fetching before returning.")
+
+            # A miss, or an expired entry that must be refetched.
+            _cache_metrics.record_miss(endpoint)
 
         # Handle Cache-Only Failure
         # If we reach this point in cache-only mode, the cache was missed or deleted.
@@ -46,23 +270,15 @@ def handle_cache_and_api(api_function, *args, delete_cache=False, use_cache_only
             debug_print(f"Cache-only mode: No cache found for '{file_name}'. Returning None.")
             return {"data": None}
 
-        # Perform Network Call (if cache was missed or network was forced)
-        print(f"Calling API for '{file_name}'...")
-        data = api_function(*args)
-
-        # Handle scenario where API data is empty or None
-        if not data:
-            data = {"data": None}  # Ensure there is always a `data` key
-
-        # If API returns a list, wrap it in a dictionary
-        elif isinstance(data, list):
-            data = {"data": data}
-
-        # Add updated_date before saving cache
-        data['updated_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        save_cache(file_name, data)
+        # Skip the network entirely for calls the API recently answered with nothing.
+        if _negative_cache.skip_if_known_empty(endpoint, _negative_cache_key(args)):
+            debug_print(f"Known empty: skipping network call for '{file_name}'.")
+            _cache_metrics.record_negative_hit(endpoint)
+            return {"data": None}
 
-        return data
+        # Perform Network Call (if cache was missed or network was forced).
+        # Concurrent callers for the same file share one call and one cache write.
+        return _single_flight.do(file_name, lambda: _fetch_and_save(api_function, args, file_name))
 
     except Exception as e:
         tb = traceback.format_exc()
@@ -71,6 +287,180 @@ def handle_cache_and_api(api_function, *args, delete_cache=False, use_cache_only
         return None
 
 
+def _fetch_and_save(api_function, args, file_name):
+    """
+    Calls the API, normalizes the response into a dict with `data`/`updated_date`
+    keys and writes it to the cache.
+
+    Empty answers are recorded in the negative cache instead of being written as
+    `{"data": None}` files, and any earlier cached answer for the call is deleted.
+    Failed requests are not cached at all and leave the response cache untouched.
+    Both come back as `{"data": None}`.
+
+    Args:
+        api_function (callable): The API function to call.
+        args (tuple): Arguments to pass to the API call.
+        file_name (str): The cache file name to save under.
+
+    Returns:
+        dict: The normalized API data.
+    """
+    print(f"Calling API for '{file_name}'...")
+    endpoint, key = api_function.__name__, _negative_cache_key(args)
+    started_at = monotonic()
+    data = api_function(*args)
+    _cache_metrics.record_network(endpoint, monotonic() - started_at, api.get_last_payload_bytes(),
+                                  failed=data is None)
+
+    # Handle scenario where API data is empty or None (always return a `data` key)
+    if data is None:
+        return {"data": None}
+    if _is_empty_response(data):
+        # Drop the last non-empty answer too, so it is not served while the ID is known empty.
+        _negative_cache.record_empty(endpoint, key)
+        delete_cache_file(file_name)
+        return {"data": None}
+    _negative_cache.record_found(endpoint, key)
+
+    # If API returns a list, wrap it in a dictionary
+    if isinstance(data, list):
+        data = {"data": data}
+
+    # Add updated_date before saving cache
+    data['updated_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    started_at = monotonic()
+    checksum = payload_checksum(data)
+    save_cache(file_name, data, checksum=checksum)
+    _cache_metrics.record_write(endpoint, monotonic() - started_at)
+    _change_tracker.record(endpoint, key, checksum)
+
+    return data
+
+
+def _stream_and_save(api_function, args, file_name, negative_cache_key=None):
+    """
+    Streams an API response straight into its cache file, adding `updated_date`
+    on the way through, so a multi-MB payload is never decoded or re-encoded in memory.
+
+    As in `_fetch_and_save`, failed requests are not cached: the existing cache file
+    and its manifest entry are left as they were.
+
+    The page is written as a file under either backend. In sqlite mode an older copy
+    of the key in the response store is deleted, so readers see the streamed file.
+
+    Args:
+        api_function (callable): An API function accepting a `stream_to` file path.
+        args (tuple): Arguments to pass to the API call.
+        file_name (str): The cache file name to save under.
+        negative_cache_key (str, optional): The key to record an empty or non-empty answer under in
+            the negative cache; None records nothing (e.g. for pages after the first).
+
+    Returns:
+        str or None: The absolute path of the cache file, or None if the request failed.
+    """
+    cache_file_path = get_cache_file_path(file_name)
+    os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+    download_path = f"{cache_file_path}.download"
+    temp_path = f"{cache_file_path}.tmp"
+    updated_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    print(f"Streaming API response for '{file_name}'...")
+    invalidate_memory_cache(file_name)
+    endpoint = api_function.__name__
+    _cache_metrics.record_bypass(endpoint)  # Streamed downloads always go to the network.
+    try:
+        started_at = monotonic()
+        downloaded = api_function(*args, stream_to=download_path)
+        _cache_metrics.record_network(endpoint, monotonic() - started_at, api.get_last_payload_bytes(),
+                                      failed=not downloaded)
+        if not downloaded:
+            debug_print(f"Streaming '{file_name}' failed; the existing cache file is kept.")
+            return None
+
+        started_at = monotonic()
+        with open(temp_path, "wb") as out, open(download_path, "rb") as raw:
+            _copy_json_with_updated_date(raw, out, updated_date)
+        os.replace(temp_path, cache_file_path)
+        if CACHE_BACKEND == "sqlite":
+            # Drop an older copy saved by `save_cache`, so readers fall through to the streamed file.
+            get_response_store().delete(file_name)
+        if negative_cache_key is not None:
+            if _is_empty_payload_file(download_path):
+                _negative_cache.record_empty(endpoint, negative_cache_key)
+            else:
+                _negative_cache.record_found(endpoint, negative_cache_key)
+
+        checksum = _file_checksum(download_path)
+        get_cache_manifest().record_file(file_name, updated_date, os.path.getsize(cache_file_path),
+                                         is_empty=False, checksum=checksum)
+        _cache_metrics.record_write(endpoint, monotonic() - started_at)
+        _change_tracker.record(endpoint, _negative_cache_key(args), checksum)
+    finally:
+        for leftover in (download_path, temp_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    return cache_file_path
+
+
+def _is_empty_payload_file(file_path, record_keys=("transactions", "ebay_avg", "tcgplayer")):
+    """
+    Helper to tell whether a downloaded payload holds no data, reading it only up to its
+    first record. Scalar members such as `page` are not data.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            for _, value in iter_json_object_members(f, stream_keys=record_keys):
+                if isinstance(value, (list, dict)) and value:
+                    return False
+    except ValueError:
+        return False  # Not valid JSON: let the consumer deal with it rather than hiding the ID.
+    return True
+
+
+def _file_checksum(file_path, chunk_size=65536):
+    """Helper to hash a downloaded payload in chunks, without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _copy_json_with_updated_date(raw, out, updated_date):
+    """
+    Copies a raw JSON payload from `raw` to `out` (both binary file objects), inserting
+    an `updated_date` member. Objects get it as their first member; a top-level list is
+    wrapped as `{"updated_date": ..., "data": [...]}`, matching `_fetch_and_save`.
+    """
+    date_member = f'"updated_date": {json.dumps(updated_date)}'.encode("utf-8")
+
+    head = raw.read(4096).lstrip()
+    while head and len(head) < 2:
+        more = raw.read(4096)
+        if not more:
+            break
+        head = (head + more).lstrip()
+
+    if head[:1] == b"{":
+        rest = head[1:].lstrip()
+        while not rest:
+            more = raw.read(4096)
+            if not more:
+                break
+            rest = more.lstrip()
+        separator = b"" if rest[:1] == b"}" else b", "
+        out.write(b"{" + date_member + separator)
+        out.write(rest)
+        shutil.copyfileobj(raw, out)
+    elif head[:1] == b"[":
+        out.write(b"{" + date_member + b', "data": ')
+        out.write(head)
+        shutil.copyfileobj(raw, out)
+        out.write(b"}")
+    else:
+        out.write(b'{"data": null, ' + date_member + b"}")
+
 
 def prepare_cache_with_updated_date(cache, cache_file_name):
     """
@@ -85,7 +475,7 @@ def prepare_cache_with_updated_date(cache, cache_file_name):
     Returns:
         dict: The updated cache (with 'updated_date' key included).
     """
-    cache_file_path = f"{get_api_response_cache_dir()}{cache_file_name}"
+    cache_file_path = get_cache_file_path(cache_file_name)
     if isinstance(cache, list):
         # Wrap the list in a dictionary if it's not already
         cache = {"data": cache}
@@ -103,7 +493,9 @@ def prepare_cache_with_updated_date(cache, cache_file_name):
 
 def get_cache(cache_file_name):
     """
-    Fetches the JSON cache from disk if it exists.
+    Fetches the JSON cache from the configured backend if it exists. In sqlite mode,
+    keys missing from the store are looked up in the file cache, where streamed
+    transaction pages are kept.
 
     Args:
         cache_file_name (str): The name of the cache file.
@@ -111,19 +503,79 @@ def get_cache(cache_file_name):
     Returns:
         dict or None: The cached data or None if the file doesn't exist.
     """
-    cache_file = f"{get_api_response_cache_dir()}{cache_file_name}"
-    return load_json_file(cache_file)
+    if _memory_cache is not None:
+        cached = _memory_cache.get(cache_file_name)
+        if cached is not None:
+            return cached
+
+    data = None
+    if CACHE_BACKEND == "sqlite":
+        data, size = get_response_store().get_with_size(cache_file_name)
+    if data is None:
+        # The file cache; in sqlite mode it only holds streamed transaction pages.
+        cache_file = get_cache_file_path(cache_file_name)
+        data = load_json_file(cache_file)
+        size = os.path.getsize(cache_file) if data is not None else 0
+
+    if data is not None and _memory_cache is not None:
+        _memory_cache.put(cache_file_name, data, endpoint=parse_cache_key(cache_file_name)[0], size=size)
+        # Callers get their own top-level dict, as on a memory hit, so the cached copy stays untouched.
+        return dict(data) if isinstance(data, dict) else data
+    return data
+
+
+def open_cached_payload(cache_file_name):
+    """
+    Returns a LazyPayload over a cached response, for callers that only need a few
+    fields of a large payload, or None if nothing is cached. Responses already in the
+    memory tier, or kept in the SQLite backend, are wrapped as they are.
+
+    Args:
+        cache_file_name (str): The name of the cache file.
+    """
+    if _memory_cache is not None:
+        cached = _memory_cache.get(cache_file_name)
+        if cached is not None:
+            return LazyPayload.from_data(cached)
+
+    if CACHE_BACKEND == "sqlite":
+        data = get_response_store().get(cache_file_name)
+        if data is not None:
+            return LazyPayload.from_data(data)
+
+    cache_file_path = get_cache_file_path(cache_file_name)
+    if not os.path.exists(cache_file_path):
+        return None
+    return LazyPayload(cache_file_path)
 
 
-def save_cache(file_path, data):
+def save_cache(file_path, data, checksum=None):
     """
-    Saves data to a JSON cache file.
+    Saves data to a JSON cache file (or under that key in the SQLite store).
 
     Args:
         file_path (str): The path of the file to save.
         data (dict): The data to save.
+        checksum (str, optional): The data's `payload_checksum`, if the caller already computed it.
+
+    Returns:
+        bool: True if the content differs from what was cached before (ignoring `updated_date`).
     """
-    save_object_to_file(data, filename=file_path, directory=get_api_response_cache_dir(), overwrite=True)
+    # The tier is dropped rather than updated: the next read re-populates it with the saved size.
+    invalidate_memory_cache(file_path)
+    if CACHE_BACKEND == "sqlite":
+        return get_response_store().put(file_path, data, checksum=checksum)
+
+    # The file is still rewritten when unchanged, since it carries the new updated_date.
+    manifest = get_cache_manifest()
+    checksum = checksum or payload_checksum(data)
+    changed = manifest.get_checksum(file_path) != checksum
+    saved_path = get_cache_file_path(file_path)
+    save_object_to_file(data, filename=file_path, directory=os.path.dirname(saved_path), overwrite=True,
+                        file_format=CACHE_FILE_FORMAT)
+    if os.path.exists(saved_path):
+        manifest.record(file_path, data, os.path.getsize(saved_path), checksum=checksum)
+    return changed
 
 
 def delete_cache_file(cache_file_name):
@@ -133,7 +585,12 @@ def delete_cache_file(cache_file_name):
     Args:
         cache_file_name (str): The name of the cache file to delete.
     """
-    cache_file_path = os.path.join(get_api_response_cache_dir(), cache_file_name)
+    invalidate_memory_cache(cache_file_name)
+    if CACHE_BACKEND == "sqlite" and get_response_store().delete(cache_file_name):
+        debug_print(f"Successfully deleted cached response: {cache_file_name}")
+    # Streamed transaction pages are files under either backend.
+    cache_file_path = get_cache_file_path(cache_file_name)
+    get_cache_manifest().remove(cache_file_name)
     try:
         if os.path.exists(cache_file_path):
             os.remove(cache_file_path)
@@ -142,29 +599,74 @@ def delete_cache_file(cache_file_name):
         debug_print(f"Error deleting cache file {cache_file_path}: {e}")
 
 
-def get_all_sets(delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False):
+def get_all_sets(delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False, stale_while_revalidate=False):
     cache_file_name = f"get_all_sets.json"
-    return handle_cache_and_api(api.get_all_pokemon_sets, delete_cache=delete_cache, use_cache_only=use_cache_only, cache_file_name=cache_file_name, use_network_only=use_network_only)
+    return handle_cache_and_api(api.get_all_pokemon_sets, delete_cache=delete_cache, use_cache_only=use_cache_only, cache_file_name=cache_file_name, use_network_only=use_network_only, stale_while_revalidate=stale_while_revalidate)
 
 
-def get_set_list(setId=0, delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False):
+def open_card_prices(setId=0, delete_cache=False):
+    """
+    Like `get_card_prices`, but returns a LazyPayload whose cards are parsed one at a
+    time from the cache file. Only a cache miss (or `delete_cache`) decodes a full response.
+    """
+    cache_file_name = f"get_card_prices_setId={setId}.json"
+    if not delete_cache:
+        payload = open_cached_payload(cache_file_name)
+        if payload is not None:
+            return payload
+    return LazyPayload.from_data(get_card_prices(setId, delete_cache=delete_cache) or {})
+
+
+def get_set_list(setId=0, delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False, stale_while_revalidate=False):
     cache_file_name = f"get_set_list_setId={setId}.json"
-    return handle_cache_and_api(api.get_all_cards_in_set, setId, delete_cache=delete_cache, use_cache_only=use_cache_only, cache_file_name=cache_file_name, use_network_only=use_network_only)
+    return handle_cache_and_api(api.get_all_cards_in_set, setId, delete_cache=delete_cache, use_cache_only=use_cache_only, cache_file_name=cache_file_name, use_network_only=use_network_only, stale_while_revalidate=stale_while_revalidate)
 
 
-def get_card_prices(setId=0, delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False):
+def get_card_prices(setId=0, delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False, stale_while_revalidate=False):
     cache_file_name = f"get_card_prices_setId={setId}.json"
-    return handle_cache_and_api(api.get_card_prices_of_set, setId, delete_cache=delete_cache, use_cache_only=use_cache_only, cache_file_name=cache_file_name, use_network_only=use_network_only)
+    return handle_cache_and_api(api.get_card_prices_of_set, setId, delete_cache=delete_cache, use_cache_only=use_cache_only, cache_file_name=cache_file_name, use_network_only=use_network_only, stale_while_revalidate=stale_while_revalidate)
 
 
-def get_card_id_psa_pop(card_id=0, delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False):
+def get_card_id_psa_pop(card_id=0, delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False, stale_while_revalidate=False):
     cache_file_name = f"get_card_id_psa_pop_card_id={card_id}.json"
-    return handle_cache_and_api(api.get_card_id_psa_pop, card_id, delete_cache=delete_cache, use_cache_only=use_cache_only, cache_file_name=cache_file_name, use_network_only=use_network_only)
+    return handle_cache_and_api(api.get_card_id_psa_pop, card_id, delete_cache=delete_cache, use_cache_only=use_cache_only, cache_file_name=cache_file_name, use_network_only=use_network_only, stale_while_revalidate=stale_while_revalidate)
 
 
-def get_volume_of_transactions(card_id=0, delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False):
+def get_volume_of_transactions(card_id=0, delete_cache=False, use_cache_only=False, cache_file_name=None, use_network_only=False, stale_while_revalidate=False):
     cache_file_name = f"get_volume_of_transactions_card_id={card_id}.json"
-    return handle_cache_and_api(api.get_volume_of_transactions, card_id, delete_cache=delete_cache, use_cache_only=use_cache_only, cache_file_name=cache_file_name, use_network_only=use_network_only)
+    return handle_cache_and_api(api.get_volume_of_transactions, card_id, delete_cache=delete_cache, use_cache_only=use_cache_only, cache_file_name=cache_file_name, use_network_only=use_network_only, stale_while_revalidate=stale_while_revalidate)
+
+
+def get_transactions_page_cache_file_name(card_id, page=0):
+    """
+    Returns the cache file name for one page of a card's transactions.
+    Page 0 keeps the original single-page name so existing readers still find it.
+    """
+    if page == 0:
+        return f"get_volume_of_transactions_card_id={card_id}.json"
+    return f"get_volume_of_transactions_card_id={card_id}_page={page}.json"
+
+
+def download_volume_of_transactions(card_id=0, page=0):
+    """
+    Fetches one page of a card's transactions from the network and streams it into
+    its cache file without loading the payload into memory.
+    Pair with `SalesDAO.add_sales_from_json_file` for a fully streaming ingest.
+
+    Returns:
+        str or None: The path of the refreshed cache file, or None if the request failed.
+    """
+    cache_file_name = get_transactions_page_cache_file_name(card_id, page)
+    # Only the first page tells whether the card has sales at all; it is recorded under the
+    # card ID, the key the update cycle's known-empty filter looks up.
+    negative_cache_key = _negative_cache_key((card_id,)) if page == 0 else None
+    try:
+        return _single_flight.do(f"stream:{cache_file_name}",
+                                 lambda: _stream_and_save(api.get_volume_of_transactions, (card_id, page),
+                                                          cache_file_name, negative_cache_key))
+    except Exception as e:
+        debug_print(f"An unexpected error occurred while streaming '{cache_file_name}': {e}")
+        return None
 
 
 if __name__ == '__main__':
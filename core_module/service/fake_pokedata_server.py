@@ -0,0 +1,296 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+# This adds the project root to the Python path to allow for absolute imports.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core_module.service.domain import get_transactions_page_cache_file_name
+from core_module.utils.file_utils import get_api_response_cache_dir, get_cache_file_path, get_repo_root, \
+    iter_cache_files, read_serialized_file
+
+# --- Fake Server Configuration ---
+FAKE_API_HOST = os.getenv("FAKE_API_HOST", "127.0.0.1")
+FAKE_API_PORT = int(os.getenv("FAKE_API_PORT", "8765"))
+FAKE_API_LATENCY = float(os.getenv("FAKE_API_LATENCY", "0"))  # Seconds added to every response
+FAKE_API_LATENCY_JITTER = float(os.getenv("FAKE_API_LATENCY_JITTER", "0"))  # Extra random 0..jitter seconds
+FAKE_API_THROTTLE_RATE = float(os.getenv("FAKE_API_THROTTLE_RATE", "0"))  # Fraction of requests answered with 429
+FAKE_API_ERROR_RATE = float(os.getenv("FAKE_API_ERROR_RATE", "0"))  # Fraction of requests answered with 500
+FAKE_API_MAX_RPS = float(os.getenv("FAKE_API_MAX_RPS", "0"))  # 429 above this request rate (0 = unlimited)
+FAKE_API_RECORD_DIR = os.getenv("FAKE_API_RECORD_DIR")  # If set, misses are fetched upstream and recorded here
+FAKE_API_UPSTREAM_URL = os.getenv("FAKE_API_UPSTREAM_URL", "https://www.pokedata.io")
+
+DEFAULT_RESPONSE_DIRS = [
+    get_api_response_cache_dir(),
+    os.path.join(get_repo_root(), "web", "backend", "tests", "resources"),
+]
+
+
+def cache_file_name_for_request(path, query):
+    """
+    Maps an API request to the cache file name the domain layer stores its response under.
+
+    :param path: The request path, e.g. '/api/transactions'.
+    :param query: The parsed query string (as returned by `parse_qs`).
+    :return: The cache file name, or None for an unknown endpoint.
+    """
+    def arg(name, default="0"):
+        return query.get(name, [default])[0]
+
+    if path == "/v0/sets":
+        return "get_all_sets.json"
+    if path == "/v0/set":
+        return f"get_set_list_setId={arg('set_id')}.json"
+    if path == "/api/cards":
+        return f"get_card_prices_setId={arg('set_id')}.json"
+    if path == "/api/cards/pops":
+        return f"get_card_id_psa_pop_card_id={arg('id')}.json"
+    if path == "/api/transactions":
+        return get_transactions_page_cache_file_name(arg("card_id"), int(arg("page")))
+    return None
+
+
+def strip_cache_metadata(data):
+    """
+    Turns a cached response back into what the API originally returned: the
+    `updated_date` the cache adds is removed, and wrapped list responses are unwrapped.
+    """
+    if isinstance(data, dict) and "updated_date" in data:
+        data = {key: value for key, value in data.items() if key != "updated_date"}
+        if list(data) == ["data"]:
+            return data["data"]
+    return data
+
+
+class FakePokedataServer:
+    """
+    A local stand-in for the pokedata.io API, for offline benchmarking.
+
+    Responses are replayed from recorded files, looked up by the same file names the
+    cache uses. When an exact recording is missing, a recording of the same endpoint
+    for another ID is served instead (with its card IDs rewritten), so a benchmark
+    can request any ID; a missing transactions page beyond page 0 is served as empty
+    so pagination terminates. With a record directory configured, misses are instead
+    fetched from the real API and saved for later replay.
+
+    Latency, random 429s and 500s, and a hard request-rate limit can be injected to
+    exercise the client's rate limiting and retry paths.
+    """
+
+    def __init__(self, response_dirs=None, host=FAKE_API_HOST, port=FAKE_API_PORT, latency=FAKE_API_LATENCY,
+                 latency_jitter=FAKE_API_LATENCY_JITTER, throttle_rate=FAKE_API_THROTTLE_RATE,
+                 error_rate=FAKE_API_ERROR_RATE, max_rps=FAKE_API_MAX_RPS, record_dir=FAKE_API_RECORD_DIR,
+                 upstream_url=FAKE_API_UPSTREAM_URL, fallback=True):
+        """
+        :param response_dirs: Directories searched, in order, for recorded responses.
+        :param port: Port to listen on (0 picks a free port).
+        :param latency: Seconds of delay added to every response.
+        :param latency_jitter: Up to this many extra random seconds per response.
+        :param throttle_rate: Fraction of requests answered with 429 Too Many Requests.
+        :param error_rate: Fraction of requests answered with 500 Internal Server Error.
+        :param max_rps: Requests per second above which 429 is returned (0 disables the limit).
+        :param record_dir: If set, misses are fetched from `upstream_url` and recorded here.
+        :param fallback: Serve another ID's recording when the exact one is missing.
+        """
+        self.response_dirs = list(response_dirs or DEFAULT_RESPONSE_DIRS)
+        if record_dir:
+            self.response_dirs.insert(0, record_dir)
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self.record_dir = record_dir
+        self.upstream_url = upstream_url
+        self.fallback = fallback
+
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._tokens = max_rps
+        self._last_refill = time.monotonic()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Starts serving on a background thread and returns the base URL to point `DEV_URL` at."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"Fake pokedata server listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        """Stops the server and closes its socket."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def get_stats(self):
+        """
+        Returns how many requests each endpoint received, split by response status.
+
+        :return: A dictionary such as {'/api/transactions': {'200': 12, '429': 3}}.
+        """
+        with self._lock:
+            return {endpoint: dict(counts) for endpoint, counts in self._stats.items()}
+
+    def _record_stat(self, endpoint, status):
+        with self._lock:
+            counts = self._stats.setdefault(endpoint, {})
+            counts[str(status)] = counts.get(str(status), 0) + 1
+
+    def _over_rate_limit(self):
+        """Token bucket check for the simulated server-side rate limit."""
+        if not self.max_rps:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_rps, self._tokens + (now - self._last_refill) * self.max_rps)
+            self._last_refill = now
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+            return False
+
+    def _handle(self, request):
+        parsed = urlparse(request.path)
+        endpoint = parsed.path
+        query = parse_qs(parsed.query)
+
+        delay = self.latency + (random.uniform(0, self.latency_jitter) if self.latency_jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        if self._over_rate_limit() or random.random() < self.throttle_rate:
+            self._send(request, endpoint, 429, {"error": "Too Many Requests"}, {"Retry-After": "1"})
+            return
+        if random.random() < self.error_rate:
+            self._send(request, endpoint, 500, {"error": "Internal Server Error"})
+            return
+
+        file_name = cache_file_name_for_request(endpoint, query)
+        if file_name is None:
+            self._send(request, endpoint, 404, {"error": f"Unknown endpoint {endpoint}"})
+            return
+
+        data = self._load_response(endpoint, query, file_name, request.headers.get("Authorization"))
+        if data is None:
+            self._send(request, endpoint, 404, {"error": f"No recording for {file_name}"})
+            return
+        self._send(request, endpoint, 200, data)
+
+    def _load_response(self, endpoint, query, file_name, authorization):
+        """Helper to find the response for a request: exact recording, upstream recording, then fallback."""
+        data = self._read_recording(file_name)
+        if data is not None:
+            return data
+
+        if self.record_dir:
+            return self._record_from_upstream(endpoint, query, file_name, authorization)
+
+        if endpoint == "/api/transactions" and int(query.get("page", ["0"])[0]) > 0:
+            return {"ebay_avg": [], "page": int(query["page"][0]), "tcgplayer": [], "transactions": []}
+
+        if self.fallback:
+            # 'get_card_prices_setId=557.json' -> 'get_card_prices_setId=', 'get_all_sets.json' stays whole.
+            pattern = file_name.split("=", 1)[0] + "=" if "=" in file_name else file_name
+            fallback_name = self._find_recording_matching(pattern)
+            if fallback_name:
+                data = self._read_recording(fallback_name)
+                if endpoint == "/api/transactions":
+                    _rewrite_card_id(data, int(query.get("card_id", ["0"])[0]))
+                return data
+        return None
+
+    def _read_recording(self, file_name):
+        for directory in self.response_dirs:
+            # Recordings may sit in either cache layout.
+            for path in (os.path.join(directory, file_name), get_cache_file_path(file_name, directory, "sharded")):
+                if os.path.isfile(path):
+                    return strip_cache_metadata(read_serialized_file(path))
+        return None
+
+    def _find_recording_matching(self, pattern):
+        """Helper to find any page-0 recording for an endpoint, including 'test_'-prefixed fixtures."""
+        for directory in self.response_dirs:
+            for name, _ in iter_cache_files(directory):
+                if pattern in name and name.endswith(".json") and "_page=" not in name:
+                    return name
+        return None
+
+    def _record_from_upstream(self, endpoint, query, file_name, authorization):
+        """Helper to fetch a missing response from the real API and save it for replay."""
+        params = {key: values[0] for key, values in query.items()}
+        response = requests.get(f"{self.upstream_url}{endpoint}", params=params,
+                                headers={"Authorization": authorization or ""}, timeout=60)
+        if response.status_code != 200:
+            print(f"Upstream returned {response.status_code} for {endpoint}; not recorded.")
+            return None
+        data = response.json()
+        os.makedirs(self.record_dir, exist_ok=True)
+        with open(os.path.join(self.record_dir, file_name), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        print(f"Recorded {endpoint} as {file_name}")
+        return data
+
+    def _send(self, request, endpoint, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(body)
+        self._record_stat(endpoint, status)
+
+
+def _rewrite_card_id(data, card_id):
+    """Helper to make a fallback transactions recording look like it belongs to `card_id`."""
+    if not isinstance(data, dict):
+        return
+    for key in ("transactions", "tcgplayer", "ebay_avg"):
+        for item in data.get(key) or []:
+            if isinstance(item, dict) and "card_id" in item:
+                item["card_id"] = card_id
+
+
+if __name__ == '__main__':
+    # Serve until interrupted. Point the client at it with POKEDATA_API_URL=http://127.0.0.1:8765
+    fake_server = FakePokedataServer()
+    fake_server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"Request counts: {fake_server.get_stats()}")
+        fake_server.stop()
@@ -0,0 +1,125 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core_module.utils.util import debug_print
+
+# --- Connection Configuration ---
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "30"))
+POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("API_POOL_MAXSIZE", "10"))
+
+DIRECT_ROUTE = "direct"
+
+
+class HttpClient:
+    """
+    A long-lived HTTP client that keeps one keep-alive `requests.Session` per route.
+
+    A route is either the direct connection or a specific proxy server. Each route
+    gets its own connection pool, so repeated calls to the same host reuse the open
+    TCP/TLS connection instead of paying for a new handshake on every request.
+    """
+
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+        """
+        Initializes the client. Sessions are created lazily, the first time a route is used.
+
+        :param connect_timeout: Seconds to wait for a connection to be established.
+        :param read_timeout: Seconds to wait for the server to send a response.
+        :param pool_connections: Number of per-host pools to keep for each route.
+        :param pool_maxsize: Maximum number of open connections kept per host.
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._sessions = {}
+        self._request_counts = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, params=None, route=DIRECT_ROUTE, proxies=None, stream=False, timeout=None):
+        """
+        Sends a GET request over the pooled session for the given route.
+
+        :param url: The absolute URL to request.
+        :param headers: Optional request headers.
+        :param params: Optional query string parameters.
+        :param route: The route name; requests sharing a route share a connection pool.
+        :param proxies: The proxies dictionary for the route, or None for a direct connection.
+        :param stream: If True, the body is not downloaded until it is read.
+        :param timeout: Overrides the default (connect, read) timeout tuple.
+        :return: The `requests.Response`.
+        """
+        session = self._get_session(route, proxies)
+        with self._lock:
+            self._request_counts[route] = self._request_counts.get(route, 0) + 1
+        return session.get(
+            url,
+            headers=headers,
+            params=params,
+            stream=stream,
+            timeout=timeout or (self.connect_timeout, self.read_timeout)
+        )
+
+    def _get_session(self, route, proxies):
+        """Helper to fetch the session for a route, creating and mounting it on first use."""
+        with self._lock:
+            session = self._sessions.get(route)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                if proxies:
+                    session.proxies.update(proxies)
+                self._sessions[route] = session
+                debug_print(f"Opened pooled session for route '{route}'.")
+            return session
+
+    def get_stats(self):
+        """
+        Reports, per route, how many requests were sent and how many of them
+        reused an already-open connection.
+
+        :return: A dictionary keyed by route name.
+        """
+        stats = {}
+        with self._lock:
+            for route, session in self._sessions.items():
+                requests_sent = self._request_counts.get(route, 0)
+                new_connections = sum(self._count_new_connections(adapter) for adapter in set(session.adapters.values()))
+                reused = max(requests_sent - new_connections, 0)
+                stats[route] = {
+                    "requests": requests_sent,
+                    "new_connections": new_connections,
+                    "reused_connections": reused,
+                    "reuse_rate": (reused / requests_sent) if requests_sent else 0.0
+                }
+        return stats
+
+    @staticmethod
+    def _count_new_connections(adapter):
+        """Helper to sum the connections opened by every urllib3 pool behind an adapter."""
+        managers = [adapter.poolmanager] + list(adapter.proxy_manager.values())
+        total = 0
+        for manager in managers:
+            if manager is None:
+                continue
+            for key in manager.pools.keys():
+                pool = manager.pools.get(key)
+                if pool is not None:
+                    total += pool.num_connections
+        return total
+
+    def close(self):
+        """Closes every pooled session and drops their connections."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._request_counts.clear()
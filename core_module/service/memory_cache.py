@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# --- Memory Tier Configuration ---
+MEMORY_CACHE_ENABLED = os.getenv("MEMORY_CACHE_ENABLED", "true").lower() == "true"
+MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "2000"))
+MEMORY_CACHE_MAX_BYTES = int(float(os.getenv("MEMORY_CACHE_MAX_MB", "256")) * 1024 * 1024)
+MEMORY_CACHE_DEFAULT_TTL = float(os.getenv("MEMORY_CACHE_DEFAULT_TTL", "300"))
+
+# Seconds an entry stays fresh, by the endpoint part of its cache key.
+MEMORY_CACHE_ENDPOINT_TTLS = {
+    "get_all_sets": 3600,
+    "get_set_list_setId": 3600,
+    "get_card_prices_setId": 600,
+    "get_card_id_psa_pop_card_id": 3600,
+    "get_volume_of_transactions_card_id": 600,
+}
+
+
+class MemoryCache:
+    """
+    A bounded, thread-safe LRU cache with per-endpoint TTLs.
+
+    Entries are evicted least-recently-used first once either the entry count or
+    the total (estimated) byte size goes over its limit, and are dropped on read
+    once their TTL has passed.
+    """
+
+    def __init__(self, max_entries=MEMORY_CACHE_MAX_ENTRIES, max_bytes=MEMORY_CACHE_MAX_BYTES,
+                 default_ttl=MEMORY_CACHE_DEFAULT_TTL, endpoint_ttls=None):
+        """
+        :param max_entries: Maximum number of cached responses.
+        :param max_bytes: Maximum total size of the cached responses, as reported to `put`.
+        :param default_ttl: TTL in seconds for endpoints without their own entry.
+        :param endpoint_ttls: A dictionary of endpoint name to TTL in seconds.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = MEMORY_CACHE_ENDPOINT_TTLS if endpoint_ttls is None else endpoint_ttls
+        self._entries = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def ttl_for(self, endpoint):
+        return self.endpoint_ttls.get(endpoint, self.default_ttl)
+
+    def get(self, key, now=None):
+        """
+        Returns the cached value for a key, or None on a miss or an expired entry.
+        Dictionaries are returned as shallow copies so callers can add keys safely.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, size = entry
+            if now >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return dict(value) if isinstance(value, dict) else value
+
+    def put(self, key, value, endpoint=None, size=0, now=None):
+        """
+        Caches a value, evicting least-recently-used entries to stay within the limits.
+
+        :param endpoint: The endpoint the key belongs to, which selects its TTL.
+        :param size: The value's approximate size in bytes (e.g. its JSON size on disk).
+        """
+        if size > self.max_bytes:
+            self.invalidate(key)
+            return
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, now + self.ttl_for(endpoint), size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drops a key, e.g. when its cache file is deleted or a fresh fetch is forced."""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        """Helper to remove an entry and its size (called with the lock held)."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def get_stats(self):
+        """
+        Returns the hit/miss/eviction counters and the current size of the tier.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes
+            }
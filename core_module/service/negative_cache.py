@@ -0,0 +1,148 @@
+import os
+import sqlite3
+import threading
+import time
+
+# --- Negative Cache Configuration ---
+NEGATIVE_CACHE_BASE_TTL = float(os.getenv("NEGATIVE_CACHE_BASE_TTL_HOURS", "24")) * 3600
+NEGATIVE_CACHE_MAX_TTL = float(os.getenv("NEGATIVE_CACHE_MAX_TTL_DAYS", "30")) * 86400
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS negative_cache (
+        endpoint TEXT NOT NULL,
+        entity_key TEXT NOT NULL,
+        empty_count INTEGER NOT NULL,
+        last_checked INTEGER NOT NULL,
+        PRIMARY KEY (endpoint, entity_key)
+    )
+"""
+RECORD_EMPTY = """
+    INSERT INTO negative_cache (endpoint, entity_key, empty_count, last_checked)
+    VALUES (?, ?, 1, ?)
+    ON CONFLICT(endpoint, entity_key) DO UPDATE SET
+        empty_count = empty_count + 1,
+        last_checked = excluded.last_checked
+"""
+
+
+class NegativeCache:
+    """
+    Remembers which IDs an endpoint answered with nothing, so they are not asked for
+    again until their re-check time.
+
+    Each entry is one `(empty_count, last_checked)` row in a small SQLite table, so
+    recording an answer writes a single row rather than the whole table. The wait
+    before the next check doubles every time the ID comes back empty again, from
+    `base_ttl` up to `max_ttl`. An ID that returns data is forgotten right away.
+    """
+
+    def __init__(self, db_path, base_ttl=NEGATIVE_CACHE_BASE_TTL, max_ttl=NEGATIVE_CACHE_MAX_TTL):
+        """
+        :param db_path: Path of the SQLite file the table is kept in.
+        :param base_ttl: Seconds before the first re-check of an empty ID.
+        :param max_ttl: Upper bound on the re-check spacing, in seconds.
+        """
+        self.db_path = db_path
+        self.base_ttl = base_ttl
+        self.max_ttl = max_ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._created = False
+        self.skipped = 0
+
+    def _connection(self):
+        """Helper to get this thread's connection, creating the file and table on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        if not self._created:
+            conn.execute(CREATE_TABLE)
+            conn.commit()
+            self._created = True
+        return conn
+
+    def ttl_for(self, empty_count):
+        """Returns the re-check spacing after `empty_count` consecutive empty answers."""
+        return min(self.base_ttl * (2 ** max(empty_count - 1, 0)), self.max_ttl)
+
+    def _is_due(self, entry, now):
+        """Helper: True if an `(empty_count, last_checked)` entry is past its re-check time."""
+        empty_count, last_checked = entry
+        return now >= last_checked + self.ttl_for(empty_count)
+
+    def is_known_empty(self, endpoint, key, now=None):
+        """
+        Returns True if the ID is recorded as empty and its re-check time has not come yet.
+
+        :param endpoint: The endpoint name, e.g. 'get_card_id_psa_pop'.
+        :param key: The ID the endpoint was called with.
+        """
+        now = time.time() if now is None else now
+        entry = self._connection().execute(
+            "SELECT empty_count, last_checked FROM negative_cache WHERE endpoint = ? AND entity_key = ?",
+            (endpoint, str(key))).fetchone()
+        return entry is not None and not self._is_due(entry, now)
+
+    def skip_if_known_empty(self, endpoint, key):
+        """Like `is_known_empty`, but also counts the call as skipped when it returns True."""
+        if not self.is_known_empty(endpoint, key):
+            return False
+        with self._lock:
+            self.skipped += 1
+        return True
+
+    def filter_ids(self, endpoint, ids, now=None):
+        """
+        Drops the IDs that are known to be empty, so they are never planned for a network call.
+        The endpoint's entries are read in one query.
+
+        :return: The remaining IDs, in their original order.
+        """
+        now = time.time() if now is None else now
+        entries = {entity_key: (empty_count, last_checked) for entity_key, empty_count, last_checked
+                   in self._connection().execute(
+                       "SELECT entity_key, empty_count, last_checked FROM negative_cache WHERE endpoint = ?",
+                       (endpoint,))}
+        remaining = [item_id for item_id in ids
+                     if str(item_id) not in entries or self._is_due(entries[str(item_id)], now)]
+        skipped = len(ids) - len(remaining)
+        if skipped:
+            with self._lock:
+                self.skipped += skipped
+            print(f"Skipping {skipped} known-empty ID(s) for '{endpoint}'.")
+        return remaining
+
+    def record_empty(self, endpoint, key, now=None):
+        """Records an empty answer for the ID, pushing its next check further out."""
+        now = time.time() if now is None else now
+        conn = self._connection()
+        conn.execute(RECORD_EMPTY, (endpoint, str(key), int(now)))
+        conn.commit()
+
+    def record_found(self, endpoint, key):
+        """Forgets the ID once it has returned data."""
+        conn = self._connection()
+        if conn.execute("DELETE FROM negative_cache WHERE endpoint = ? AND entity_key = ?",
+                        (endpoint, str(key))).rowcount:
+            conn.commit()
+
+    def get_stats(self):
+        """
+        Returns how many IDs are recorded per endpoint and how many calls were skipped.
+        """
+        rows = self._connection().execute("SELECT endpoint, COUNT(*) FROM negative_cache GROUP BY endpoint")
+        return {
+            "known_empty": dict(rows.fetchall()),
+            "skipped": self.skipped
+        }
+
+    def close(self):
+        """Closes this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
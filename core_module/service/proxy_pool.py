@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import deque
+
+from core_module.service.http_client import DIRECT_ROUTE
+
+
+class CircuitBreaker:
+    """
+    A per-route circuit breaker.
+
+    - CLOSED: requests flow normally. Consecutive failures are counted.
+    - OPEN: the route tripped and is skipped until its cool-down has passed.
+    - HALF_OPEN: the cool-down passed and a single probe request is allowed through.
+      A successful probe closes the breaker again; a failed one re-opens it.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, cool_down_seconds=300):
+        """
+        :param failure_threshold: Consecutive failures that trip the breaker.
+        :param cool_down_seconds: How long an open breaker waits before allowing a probe.
+        """
+        self.failure_threshold = failure_threshold
+        self.cool_down_seconds = cool_down_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probe_in_flight = False
+
+    def allow_request(self, now):
+        """Returns True if a request may be sent on this route right now (may start a probe)."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and now - self.opened_at >= self.cool_down_seconds:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self, now):
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+            self.state = self.OPEN
+            self.opened_at = now
+            self._probe_in_flight = False
+
+    def seconds_until_probe(self, now):
+        """Returns how long until an open breaker will allow a probe (0 if it already would)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(self.cool_down_seconds - (now - self.opened_at), 0.0)
+
+
+class ProxyRoute:
+    """
+    A single way of reaching the API (the direct connection or one proxy exit node),
+    together with its rolling health window and circuit breaker.
+    """
+
+    def __init__(self, name, proxies=None, window_size=50, failure_threshold=3, cool_down_seconds=300):
+        """
+        :param name: The route name, also used to key the HTTP pool and rate limiter.
+        :param proxies: The `requests` proxies dictionary, or None for the direct route.
+        :param window_size: How many recent outcomes the health score is based on.
+        """
+        self.name = name
+        self.proxies = proxies
+        self.breaker = CircuitBreaker(failure_threshold, cool_down_seconds)
+        self._outcomes = deque(maxlen=window_size)  # (succeeded, latency_seconds)
+
+    @property
+    def is_direct(self):
+        return self.proxies is None
+
+    def record(self, succeeded, latency):
+        self._outcomes.append((succeeded, latency))
+
+    def success_rate(self):
+        """Fraction of recent requests that succeeded. Untried routes are assumed healthy."""
+        if not self._outcomes:
+            return 1.0
+        return sum(1 for succeeded, _ in self._outcomes if succeeded) / len(self._outcomes)
+
+    def average_latency(self):
+        """Mean latency of recent requests that got a response, in seconds."""
+        latencies = [latency for _, latency in self._outcomes if latency is not None]
+        return (sum(latencies) / len(latencies)) if latencies else 0.0
+
+    def score(self):
+        """Health score used to rank proxies: a high success rate and a low latency win."""
+        return self.success_rate() / (1.0 + self.average_latency())
+
+
+class ProxyPool:
+    """
+    Chooses a route for each request from the direct connection plus a pool of proxies.
+
+    The direct route is always preferred while its breaker allows it, so the proxy is
+    only paid for while direct access is throttled. Otherwise the healthiest proxy with
+    a non-open breaker is used. Open breakers are probed again after their cool-down,
+    which is how both failed proxies and the direct route come back into rotation.
+    """
+
+    def __init__(self, routes, clock=time.monotonic):
+        """
+        :param routes: A list of ProxyRoute objects. A direct route should normally be included.
+        :param clock: Returns the current time in seconds; swapped for a fake clock in tests.
+        """
+        self.routes = list(routes)
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    def choose_route(self, avoid=None):
+        """
+        Picks the route for the next request.
+
+        :param avoid: A route name to skip if any alternative is available
+                      (used to move a retry off the route that just failed).
+        :return: The chosen ProxyRoute.
+        """
+        with self._lock:
+            now = self.clock()
+            candidates = [route for route in self.routes if route.name != avoid] or list(self.routes)
+
+            for route in candidates:
+                if route.is_direct and route.breaker.allow_request(now):
+                    return route
+
+            proxies = sorted((route for route in candidates if not route.is_direct),
+                             key=lambda route: route.score(), reverse=True)
+            for route in proxies:
+                if route.breaker.allow_request(now):
+                    return route
+
+            # Every route is open: fall back to whichever will be probed soonest.
+            return min(candidates, key=lambda route: route.breaker.seconds_until_probe(now))
+
+    def record_success(self, route, latency):
+        """Records a successful response on the route and closes its breaker."""
+        with self._lock:
+            route.record(True, latency)
+            if route.breaker.state != CircuitBreaker.CLOSED:
+                print(f"Route '{route.name}' is healthy again.")
+            route.breaker.record_success()
+
+    def record_failure(self, route, latency=None):
+        """Records a failed request (throttle, server error or network error) on the route."""
+        with self._lock:
+            route.record(False, latency)
+            was_open = route.breaker.state == CircuitBreaker.OPEN
+            route.breaker.record_failure(self.clock())
+            if not was_open and route.breaker.state == CircuitBreaker.OPEN:
+                print(f"Circuit breaker tripped for route '{route.name}'. "
+                      f"Cooling down for {route.breaker.cool_down_seconds}s.")
+
+    def get_stats(self):
+        """
+        Returns health and breaker state for every route.
+
+        :return: A dictionary keyed by route name.
+        """
+        with self._lock:
+            return {
+                route.name: {
+                    "state": route.breaker.state,
+                    "success_rate": round(route.success_rate(), 3),
+                    "average_latency": round(route.average_latency(), 3),
+                    "score": round(route.score(), 3),
+                    "trips": route.breaker.trips
+                }
+                for route in self.routes
+            }
+
+
+def build_proxy_pool(proxy_servers, username, password, enabled=True, failure_threshold=3, cool_down_seconds=300):
+    """
+    Builds a ProxyPool with the direct route plus one route per configured proxy server.
+
+    :param proxy_servers: A list of 'host:port' proxy servers.
+    :param username: Proxy username.
+    :param password: Proxy password.
+    :param enabled: If False, or if credentials are incomplete, only the direct route is built.
+    """
+    routes = [ProxyRoute(DIRECT_ROUTE, None, failure_threshold=failure_threshold,
+                         cool_down_seconds=cool_down_seconds)]
+
+    if not enabled:
+        return ProxyPool(routes)
+    if not (username and password and proxy_servers):
+        print("Proxy use requested, but credentials are not fully configured.")
+        return ProxyPool(routes)
+
+    for server in proxy_servers:
+        proxy_url = f"https://{username}:{password}@{server}"
+        routes.append(ProxyRoute(server, {"https": proxy_url, "http": proxy_url},
+                                 failure_threshold=failure_threshold, cool_down_seconds=cool_down_seconds))
+    return ProxyPool(routes)
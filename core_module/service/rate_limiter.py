@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# --- Rate Limit Configuration (requests per second) ---
+INITIAL_RATE = float(os.getenv("API_INITIAL_RATE", "0.5"))
+MIN_RATE = float(os.getenv("API_MIN_RATE", "0.05"))
+MAX_RATE = float(os.getenv("API_MAX_RATE", "5"))
+
+
+class _RouteBucket:
+    """Token bucket state for a single route."""
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = now
+        self.blocked_until = 0.0
+        self.throttle_events = 0
+        self.requests = 0
+
+    def refill(self, now):
+        elapsed = now - self.last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+
+class AdaptiveRateLimiter:
+    """
+    A token-bucket rate limiter whose rate adapts to the responses it sees (AIMD).
+
+    Each clean response raises the route's rate by a small additive step, and each
+    throttle response (403/429) multiplies it down sharply. A `Retry-After` header
+    blocks the route until the server says it may be called again. Direct and
+    proxied routes keep separate buckets, so throttling one does not slow the other.
+    """
+
+    def __init__(self, initial_rate=INITIAL_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE,
+                 additive_increase=0.02, multiplicative_decrease=0.5, burst=1,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        :param initial_rate: Starting rate for a new route, in requests per second.
+        :param min_rate: The rate never drops below this floor.
+        :param max_rate: The rate never grows above this ceiling.
+        :param additive_increase: Requests per second added after each clean response.
+        :param multiplicative_decrease: Factor applied to the rate on a throttle response.
+        :param burst: Bucket capacity, i.e. how many requests may be sent back to back.
+        :param clock: Returns the current time in seconds; swapped for a fake clock in tests.
+        :param sleep: Waits the given number of seconds; swapped together with `clock`.
+        """
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, route):
+        """Helper to fetch the bucket for a route, creating it on first use. Call with the lock held."""
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            bucket = _RouteBucket(self.initial_rate, self.burst, self.clock())
+            self._buckets[route] = bucket
+        return bucket
+
+    def acquire(self, route):
+        """
+        Blocks until the route may send its next request.
+        A token is reserved under the lock and the wait happens outside it, so
+        concurrent callers queue up fairly instead of spinning.
+
+        :param route: The route name the request will be sent on.
+        """
+        with self._lock:
+            bucket = self._bucket(route)
+            now = self.clock()
+            bucket.refill(now)
+            bucket.tokens -= 1
+            bucket.requests += 1
+            wait = max(bucket.blocked_until - now, -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0)
+
+        if wait > 0:
+            self.sleep(wait)
+
+    def on_success(self, route):
+        """Additively increases the route's rate after a clean response."""
+        with self._lock:
+            bucket = self._bucket(route)
+            bucket.rate = min(self.max_rate, bucket.rate + self.additive_increase)
+
+    def on_throttle(self, route, retry_after=None):
+        """
+        Multiplicatively decreases the route's rate after a 403/429 response.
+
+        :param route: The route that was throttled.
+        :param retry_after: The raw `Retry-After` header value, if the server sent one.
+        """
+        delay = parse_retry_after(retry_after)
+        with self._lock:
+            bucket = self._bucket(route)
+            bucket.rate = max(self.min_rate, bucket.rate * self.multiplicative_decrease)
+            bucket.tokens = min(bucket.tokens, 0)
+            bucket.throttle_events += 1
+            if delay:
+                bucket.blocked_until = max(bucket.blocked_until, self.clock() + delay)
+
+    def get_stats(self):
+        """
+        Returns the current rate and throttle counts per route.
+
+        :return: A dictionary keyed by route name.
+        """
+        with self._lock:
+            now = self.clock()
+            return {
+                route: {
+                    "rate_per_second": round(bucket.rate, 4),
+                    "requests": bucket.requests,
+                    "throttle_events": bucket.throttle_events,
+                    "blocked_for_seconds": round(max(bucket.blocked_until - now, 0.0), 2)
+                }
+                for route, bucket in self._buckets.items()
+            }
+
+
+def parse_retry_after(value):
+    """
+    Parses a `Retry-After` header, which is either a number of seconds or an HTTP date.
+
+    :param value: The raw header value (or None).
+    :return: The delay in seconds, or None if the header is missing or unparsable.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import zlib
+from datetime import datetime
+
+# This adds the project root to the Python path to allow for absolute imports.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core_module.utils.file_utils import get_api_response_cache_dir, get_repo_root, iter_cache_files, \
+    read_serialized_file
+
+COMPRESSION_LEVEL = 6
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS api_responses (
+        cache_key TEXT PRIMARY KEY,
+        endpoint TEXT NOT NULL,
+        entity_id TEXT,
+        fetched_at TEXT,
+        payload_hash TEXT,
+        is_empty INTEGER NOT NULL DEFAULT 0,
+        payload BLOB NOT NULL
+    )
+"""
+CREATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_api_responses_endpoint_entity ON api_responses (endpoint, entity_id)",
+    "CREATE INDEX IF NOT EXISTS idx_api_responses_fetched_at ON api_responses (fetched_at)",
+)
+UPSERT_RESPONSE = """
+    INSERT INTO api_responses (cache_key, endpoint, entity_id, fetched_at, payload_hash, is_empty, payload)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(cache_key) DO UPDATE SET
+        endpoint = excluded.endpoint,
+        entity_id = excluded.entity_id,
+        fetched_at = excluded.fetched_at,
+        payload_hash = excluded.payload_hash,
+        is_empty = excluded.is_empty,
+        payload = excluded.payload
+"""
+
+
+def get_default_store_path():
+    return os.path.join(get_repo_root(), "cache", "api_responses.sqlite3")
+
+
+def parse_cache_key(cache_key):
+    """
+    Splits a cache file name into its endpoint and entity ID columns.
+
+    'get_card_prices_setId=557.json' -> ('get_card_prices_setId', '557')
+    'get_all_sets.json'              -> ('get_all_sets', None)
+    """
+    name = cache_key.removesuffix(".json")
+    if "=" not in name:
+        return name, None
+    endpoint, entity_id = name.split("=", 1)
+    return endpoint, entity_id
+
+
+def payload_checksum(data):
+    """
+    Returns a checksum of a response's content in canonical form (sorted keys, compact
+    separators). The `updated_date` the cache adds is left out, so re-fetching
+    unchanged data gives the same checksum.
+    """
+    if isinstance(data, dict) and "updated_date" in data:
+        data = {key: value for key, value in data.items() if key != "updated_date"}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def is_empty_payload(data):
+    """Helper for the `is_empty` column: a payload with no `data` beyond its metadata."""
+    if isinstance(data, dict):
+        return all(value in (None, [], {}) for key, value in data.items() if key != "updated_date")
+    return not data
+
+
+class SQLiteResponseStore:
+    """
+    A key-value store for API responses, kept in one SQLite file instead of one
+    JSON file per call.
+
+    Keys are the same names the file cache uses, so callers do not change. Payloads
+    are stored as zlib-compressed compact JSON, next to indexed metadata columns
+    (endpoint, entity ID, fetch time, content checksum and an empty flag) that let
+    scans and staleness checks run as queries instead of directory listings.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        :param db_path: Path of the SQLite file (defaults to cache/api_responses.sqlite3).
+        """
+        self.db_path = db_path or get_default_store_path()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = self._connection()
+        conn.execute(CREATE_TABLE)
+        for statement in CREATE_INDEXES:
+            conn.execute(statement)
+        conn.commit()
+
+    def _connection(self):
+        """Helper to get this thread's connection; SQLite connections are not shared across threads."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, cache_key):
+        """
+        Returns the stored response for a key, or None if there is none.
+
+        :param cache_key: The cache file name, e.g. 'get_card_prices_setId=557.json'.
+        """
+        return self.get_with_size(cache_key)[0]
+
+    def get_with_size(self, cache_key):
+        """
+        Returns the stored response for a key together with its uncompressed JSON size
+        in bytes, or (None, 0) if there is none.
+        """
+        row = self._connection().execute(
+            "SELECT payload, fetched_at FROM api_responses WHERE cache_key = ?", (cache_key,)).fetchone()
+        if row is None:
+            return None, 0
+        raw = zlib.decompress(row[0])
+        data = json.loads(raw)
+        # An unchanged re-fetch only bumps fetched_at, so it is the authoritative updated_date.
+        if isinstance(data, dict) and "updated_date" in data and row[1]:
+            data["updated_date"] = row[1]
+        return data, len(raw)
+
+    def put(self, cache_key, data, commit=True, checksum=None):
+        """
+        Stores a response under a key, replacing any previous one. If the content is
+        unchanged (same checksum), only its fetch time is updated.
+
+        :param cache_key: The cache file name.
+        :param data: The JSON-serializable response.
+        :param commit: Set to False to batch several writes into one transaction.
+        :param checksum: The data's `payload_checksum`, if the caller already computed it.
+        :return: True if the content changed (or is new), False if only the fetch time was bumped.
+        """
+        checksum = checksum or payload_checksum(data)
+        fetched_at = data.get("updated_date") if isinstance(data, dict) else None
+        fetched_at = fetched_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        conn = self._connection()
+
+        changed = self.get_payload_hash(cache_key) != checksum
+        if changed:
+            raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+            endpoint, entity_id = parse_cache_key(cache_key)
+            conn.execute(UPSERT_RESPONSE, (
+                cache_key, endpoint, entity_id, fetched_at,
+                checksum, int(is_empty_payload(data)), zlib.compress(raw, COMPRESSION_LEVEL)
+            ))
+        else:
+            conn.execute("UPDATE api_responses SET fetched_at = ? WHERE cache_key = ?", (fetched_at, cache_key))
+        if commit:
+            conn.commit()
+        return changed
+
+    def get_payload_hash(self, cache_key):
+        """Returns the content checksum stored for a key, or None."""
+        row = self._connection().execute(
+            "SELECT payload_hash FROM api_responses WHERE cache_key = ?", (cache_key,)).fetchone()
+        return row[0] if row else None
+
+    def delete(self, cache_key):
+        """
+        Deletes the response stored under a key.
+
+        :return: True if a response was deleted.
+        """
+        conn = self._connection()
+        deleted = conn.execute("DELETE FROM api_responses WHERE cache_key = ?", (cache_key,)).rowcount
+        conn.commit()
+        return deleted > 0
+
+    def find_stale(self, endpoint=None, older_than=None, include_empty=True):
+        """
+        Finds stored responses that need a refresh, in the same form as `CacheManifest.find_stale`.
+
+        :param endpoint: Only look at this endpoint (e.g. 'get_card_prices_setId'); None for all.
+        :param older_than: A datetime; responses fetched before it are stale.
+        :param include_empty: Also report responses whose payload is empty.
+        :return: A list of (cache_key, entity_id, reason) tuples, ordered by key.
+        """
+        cutoff = older_than.strftime('%Y-%m-%d %H:%M:%S') if older_than else None
+        query = """
+            SELECT cache_key, entity_id,
+                   CASE
+                       WHEN is_empty = 1 THEN 'Empty data'
+                       ELSE 'Stale date: ' || substr(fetched_at, 1, 10)
+                   END AS reason
+            FROM api_responses
+            WHERE (? IS NULL OR endpoint = ?)
+              AND ((? = 1 AND is_empty = 1)
+                   OR (is_empty = 0 AND ? IS NOT NULL AND fetched_at < ?))
+            ORDER BY cache_key
+        """
+        rows = self._connection().execute(query, (endpoint, endpoint, int(include_empty), cutoff, cutoff))
+        return [tuple(row) for row in rows]
+
+    def keys(self, endpoint=None):
+        """
+        Returns the stored keys, optionally only those of one endpoint.
+
+        :param endpoint: The endpoint column value, e.g. 'get_card_prices_setId'.
+        """
+        conn = self._connection()
+        if endpoint is None:
+            rows = conn.execute("SELECT cache_key FROM api_responses ORDER BY cache_key")
+        else:
+            rows = conn.execute("SELECT cache_key FROM api_responses WHERE endpoint = ? ORDER BY cache_key",
+                                (endpoint,))
+        return [row[0] for row in rows]
+
+    def get_stats(self):
+        """
+        Returns the number of stored responses, how many are empty, and the compressed size.
+        """
+        count, empty, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(is_empty), 0), COALESCE(SUM(LENGTH(payload)), 0) FROM api_responses"
+        ).fetchone()
+        return {"responses": count, "empty": empty, "compressed_bytes": size}
+
+    def import_directory(self, directory=None, batch_size=500):
+        """
+        One-time import of an existing one-file-per-call cache directory.
+        Files that are not valid JSON are skipped and reported; the files themselves are left in place.
+
+        :param directory: The cache directory (defaults to cache/api_responses).
+        :param batch_size: Files written per transaction.
+        :return: The number of responses imported.
+        """
+        directory = directory or get_api_response_cache_dir()
+        if not os.path.isdir(directory):
+            print(f"Error: Cache directory not found at '{directory}'.")
+            return 0
+
+        imported = 0
+        skipped = []
+        conn = self._connection()
+        for filename, file_path in iter_cache_files(directory):
+            try:
+                data = read_serialized_file(file_path)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                skipped.append(filename)
+                continue
+
+            self.put(filename, data, commit=False)
+            imported += 1
+            if imported % batch_size == 0:
+                conn.commit()
+                print(f"Imported {imported} responses...")
+        conn.commit()
+
+        print(f"Imported {imported} responses into {self.db_path}.")
+        if skipped:
+            print(f"Skipped {len(skipped)} unreadable files: {skipped}")
+        return imported
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+if __name__ == '__main__':
+    # One-time import of cache/api_responses into the SQLite store.
+    store = SQLiteResponseStore()
+    store.import_directory()
+    print(store.get_stats())
@@ -0,0 +1,133 @@
+import os
+import random
+import threading
+import time
+
+# --- Retry Configuration ---
+MAX_STATUS_RETRIES = int(os.getenv("API_MAX_STATUS_RETRIES", "3"))
+MAX_CONNECTION_RETRIES = int(os.getenv("API_MAX_CONNECTION_RETRIES", "3"))
+BASE_DELAY = float(os.getenv("API_RETRY_BASE_DELAY", "1"))
+MAX_DELAY = float(os.getenv("API_RETRY_MAX_DELAY", "30"))
+CALL_DEADLINE = float(os.getenv("API_CALL_DEADLINE", "120"))
+CYCLE_RETRY_BUDGET = float(os.getenv("API_CYCLE_RETRY_BUDGET", "900"))
+
+RETRYABLE_STATUSES = (403, 429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request should be retried and how long to wait first.
+
+    Status-code failures and connection errors are counted separately, each with its
+    own retry limit. Delays grow exponentially with "full jitter" (a random wait
+    between zero and the exponential cap), which keeps concurrent workers from
+    retrying in lockstep.
+    """
+
+    def __init__(self, max_status_retries=MAX_STATUS_RETRIES, max_connection_retries=MAX_CONNECTION_RETRIES,
+                 retryable_statuses=RETRYABLE_STATUSES, base_delay=BASE_DELAY, max_delay=MAX_DELAY,
+                 call_deadline=CALL_DEADLINE):
+        """
+        :param max_status_retries: Retries allowed after a retryable HTTP status.
+        :param max_connection_retries: Retries allowed after a network/connection error.
+        :param retryable_statuses: HTTP status codes that are worth retrying.
+        :param base_delay: Backoff cap for the first retry, in seconds.
+        :param max_delay: Upper bound on any single backoff, in seconds.
+        :param call_deadline: Total seconds a single call may spend, including retries.
+        """
+        self.max_status_retries = max_status_retries
+        self.max_connection_retries = max_connection_retries
+        self.retryable_statuses = tuple(retryable_statuses)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.call_deadline = call_deadline
+
+    def is_retryable_status(self, status_code):
+        """Returns True if the HTTP status code is worth retrying at all."""
+        return status_code in self.retryable_statuses
+
+    def can_retry_status(self, status_retries):
+        """Returns True if another retry is allowed after `status_retries` status failures."""
+        return status_retries < self.max_status_retries
+
+    def can_retry_connection_error(self, connection_retries):
+        """Returns True if another retry is allowed after `connection_retries` network errors."""
+        return connection_retries < self.max_connection_retries
+
+    def backoff(self, retry_number):
+        """
+        Computes the wait before the given retry (0 for the first retry) using full jitter.
+
+        :param retry_number: How many retries have already been made for this call.
+        :return: The delay in seconds.
+        """
+        cap = min(self.max_delay, self.base_delay * (2 ** retry_number))
+        return random.uniform(0, cap)
+
+
+class RetryBudget:
+    """
+    A per-cycle allowance of seconds that may be spent waiting between retries.
+
+    Once an update cycle has used up its budget, further failures give up right away
+    instead of backing off, so a flaky API can slow a cycle down but never stall it.
+    """
+
+    def __init__(self, total_seconds=CYCLE_RETRY_BUDGET):
+        self.total_seconds = total_seconds
+        self.spent_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def try_spend(self, seconds):
+        """
+        Reserves `seconds` of backoff from the budget.
+
+        :return: True if the budget covered the wait, False if it would overrun it.
+        """
+        with self._lock:
+            if self.spent_seconds + seconds > self.total_seconds:
+                return False
+            self.spent_seconds += seconds
+            return True
+
+    def remaining(self):
+        """Returns the seconds of backoff still available this cycle."""
+        with self._lock:
+            return max(self.total_seconds - self.spent_seconds, 0.0)
+
+
+class RetryStats:
+    """
+    Thread-safe per-endpoint counters of calls, retries and give-ups.
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, event):
+        """
+        Increments a counter for an endpoint.
+
+        :param endpoint: The API path, e.g. '/api/transactions'.
+        :param event: One of 'calls', 'status_retries', 'connection_retries' or 'gave_up'.
+        """
+        with self._lock:
+            counts = self._counts.setdefault(
+                endpoint, {"calls": 0, "status_retries": 0, "connection_retries": 0, "gave_up": 0})
+            counts[event] += 1
+
+    def snapshot(self):
+        """Returns a copy of all counters, keyed by endpoint."""
+        with self._lock:
+            return {endpoint: dict(counts) for endpoint, counts in self._counts.items()}
+
+
+def deadline_allows(deadline, delay):
+    """
+    Returns True if waiting `delay` seconds still leaves the call inside its deadline.
+
+    :param deadline: A `time.monotonic()` timestamp.
+    :param delay: The proposed wait in seconds.
+    """
+    return time.monotonic() + delay < deadline
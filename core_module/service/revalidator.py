@@ -0,0 +1,131 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# --- Stale-While-Revalidate Configuration ---
+REVALIDATE_MAX_WORKERS = int(os.getenv("REVALIDATE_MAX_WORKERS", "4"))
+REVALIDATE_DEFAULT_SOFT_TTL = float(os.getenv("REVALIDATE_SOFT_TTL_HOURS", "12")) * 3600
+REVALIDATE_DEFAULT_HARD_TTL = float(os.getenv("REVALIDATE_HARD_TTL_DAYS", "7")) * 86400
+
+# (soft, hard) TTLs in seconds, by the endpoint part of the cache key.
+# Past the soft TTL a cached response is still served but refreshed in the background;
+# past the hard TTL it is too old to serve and the caller waits for a fresh fetch.
+REVALIDATE_ENDPOINT_TTLS = {
+    "get_all_sets": (24 * 3600, 14 * 86400),
+    "get_set_list_setId": (24 * 3600, 14 * 86400),
+    "get_card_prices_setId": (6 * 3600, 3 * 86400),
+    "get_card_id_psa_pop_card_id": (24 * 3600, 14 * 86400),
+    "get_volume_of_transactions_card_id": (6 * 3600, 3 * 86400),
+}
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+
+class BackgroundRevalidator:
+    """
+    Refreshes stale cache entries on a worker pool, so callers can be answered from
+    the cache right away.
+
+    `classify` sorts a cached response into fresh, stale (past its soft TTL) or
+    expired (past its hard TTL) by its `updated_date`. `schedule` queues a refresh;
+    a key that already has one queued or running is not queued again.
+    """
+
+    def __init__(self, max_workers=REVALIDATE_MAX_WORKERS, default_soft_ttl=REVALIDATE_DEFAULT_SOFT_TTL,
+                 default_hard_ttl=REVALIDATE_DEFAULT_HARD_TTL, endpoint_ttls=None):
+        """
+        :param max_workers: Number of background refresh threads.
+        :param default_soft_ttl: Soft TTL in seconds for endpoints without their own entry.
+        :param default_hard_ttl: Hard TTL in seconds for endpoints without their own entry.
+        :param endpoint_ttls: A dictionary of endpoint name to a (soft, hard) TTL tuple in seconds.
+        """
+        self.max_workers = max_workers
+        self.default_soft_ttl = default_soft_ttl
+        self.default_hard_ttl = default_hard_ttl
+        self.endpoint_ttls = REVALIDATE_ENDPOINT_TTLS if endpoint_ttls is None else endpoint_ttls
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.scheduled = 0
+        self.deduplicated = 0
+        self.completed = 0
+        self.failed = 0
+
+    def ttls_for(self, endpoint):
+        return self.endpoint_ttls.get(endpoint, (self.default_soft_ttl, self.default_hard_ttl))
+
+    def classify(self, endpoint, cache, now=None):
+        """
+        Returns FRESH, STALE or EXPIRED for a cached response.
+        A response without a readable `updated_date` is treated as expired.
+        """
+        updated_date = cache.get("updated_date") if isinstance(cache, dict) else None
+        try:
+            updated = datetime.strptime(updated_date, '%Y-%m-%d %H:%M:%S')
+        except (TypeError, ValueError):
+            return EXPIRED
+
+        age = ((now or datetime.now()) - updated).total_seconds()
+        soft_ttl, hard_ttl = self.ttls_for(endpoint)
+        if age >= hard_ttl:
+            return EXPIRED
+        if age >= soft_ttl:
+            return STALE
+        return FRESH
+
+    def schedule(self, key, function):
+        """
+        Queues `function()` to refresh `key` in the background.
+
+        :return: True if a refresh was queued, False if one was already pending for the key.
+        """
+        with self._lock:
+            if key in self._pending:
+                self.deduplicated += 1
+                return False
+            self._pending.add(key)
+            self.scheduled += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="cache-revalidate")
+            executor = self._executor
+
+        executor.submit(self._run, key, function)
+        return True
+
+    def _run(self, key, function):
+        """Helper running one refresh and keeping the counters."""
+        try:
+            function()
+            with self._lock:
+                self.completed += 1
+        except Exception as e:
+            print(f"Background refresh of '{key}' failed: {e}")
+            with self._lock:
+                self.failed += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def get_stats(self):
+        """
+        Returns how many refreshes were scheduled, deduplicated, completed, failed and are still pending.
+        """
+        with self._lock:
+            return {
+                "scheduled": self.scheduled,
+                "deduplicated": self.deduplicated,
+                "completed": self.completed,
+                "failed": self.failed,
+                "pending": len(self._pending)
+            }
+
+    def shutdown(self, wait=True):
+        """Stops the worker pool; with `wait`, queued refreshes finish first."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,64 @@
+import threading
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    In-process request coalescing keyed by an arbitrary string.
+
+    The first caller for a key (the leader) runs the function. Callers that arrive
+    with the same key while it is still running wait for the leader and share its
+    result (or its exception) instead of running the function again.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.deduplicated = 0
+
+    def do(self, key, function):
+        """
+        Runs `function()` once per key at a time and shares the result with concurrent callers.
+
+        :param key: The coalescing key, e.g. the cache file name.
+        :param function: A zero-argument callable doing the actual work.
+        :return: The function's result. Followers receive a shallow copy of dict results.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.deduplicated += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return dict(call.result) if isinstance(call.result, dict) else call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def get_deduplicated_count(self):
+        """Returns how many calls were served by another caller's in-flight request."""
+        with self._lock:
+            return self.deduplicated
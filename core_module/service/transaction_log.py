@@ -0,0 +1,206 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+from core_module.service.transaction_pages import parse_sale_date
+from core_module.utils.file_utils import get_repo_root
+from core_module.utils.json_stream import iter_json_object_members
+
+# Sales up to this many days older than a card's newest logged sale are still checked
+# against the watermark, to catch sales the API reports late. Older ones are already logged.
+TRANSACTION_LOG_OVERLAP_DAYS = float(os.getenv("TRANSACTION_LOG_OVERLAP_DAYS", "3"))
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def get_default_log_dir():
+    return os.path.join(get_repo_root(), "cache", "transaction_log")
+
+
+class TransactionLogWriter:
+    """
+    Appends one refresh's new sales to a card's log.
+
+    Every page of the refresh is checked against the watermark as it was when the
+    refresh started, plus the sales already appended by this refresh. A sale is new
+    if neither its `id` nor its `ebay_item_id` has been seen. Appended sales are
+    written to the log, and the updated watermark saved, by `close`. Leaving the
+    writer's context with an exception discards them, so sales are only ever marked
+    as seen by a refresh that completed.
+    """
+
+    def __init__(self, log, card_id, overlap_days=TRANSACTION_LOG_OVERLAP_DAYS):
+        self.log = log
+        self.card_id = card_id
+        self.overlap = timedelta(days=overlap_days)
+        watermark = log.load_watermark(card_id)
+        self.count = watermark.get("count", 0)
+        self.appended = 0
+        self._pending = []  # Appended records not yet written to the log.
+
+        newest = watermark.get("newest_date_sold")
+        self._newest = datetime.strptime(newest, DATE_FORMAT) if newest else None
+        self._cutoff = self._newest - self.overlap if self._newest else None
+        # (id, ebay_item_id, date_sold) of the sales inside the overlap window.
+        self._recent = [(txn_id, item_id, datetime.strptime(date_sold, DATE_FORMAT) if date_sold else None)
+                        for txn_id, item_id, date_sold in watermark.get("recent", [])]
+        self._seen_ids = {txn_id for txn_id, _, _ in self._recent if txn_id is not None}
+        self._seen_item_ids = {item_id for _, item_id, _ in self._recent if item_id}
+
+    def is_new(self, record):
+        """Returns True if the sale is not in the log yet."""
+        date_sold = parse_sale_date(record.get("date_sold"))
+        if self._cutoff and date_sold and date_sold < self._cutoff:
+            return False
+        if record.get("id") is not None and record["id"] in self._seen_ids:
+            return False
+        return not (record.get("ebay_item_id") and record["ebay_item_id"] in self._seen_item_ids)
+
+    def new_records(self, records):
+        """
+        Returns the sales among `records` that are not in the log yet, without appending them.
+        Call `append_records` with them once they are stored elsewhere (e.g. in the database).
+        """
+        new_records = []
+        ids, item_ids = set(), set()
+        for record in records:
+            if not isinstance(record, dict) or not self.is_new(record):
+                continue
+            if record.get("id") is not None and record["id"] in ids:
+                continue
+            if record.get("ebay_item_id") and record["ebay_item_id"] in item_ids:
+                continue
+            new_records.append(record)
+            if record.get("id") is not None:
+                ids.add(record["id"])
+            if record.get("ebay_item_id"):
+                item_ids.add(record["ebay_item_id"])
+        return new_records
+
+    def new_records_in_file(self, file_path):
+        """Streams the `transactions` of a cached page and returns the ones not in the log yet."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            members = iter_json_object_members(f, stream_keys=("transactions", "ebay_avg", "tcgplayer"))
+            return self.new_records(value for key, value in members if key == "transactions")
+
+    def append_records(self, records):
+        """
+        Appends the new sales among `records` to the log. They are written when the writer is closed.
+
+        :return: The list of records that were appended.
+        """
+        new_records = []
+        for record in records:
+            if not isinstance(record, dict) or not self.is_new(record):
+                continue
+            new_records.append(record)
+            date_sold = parse_sale_date(record.get("date_sold"))
+            self._recent.append((record.get("id"), record.get("ebay_item_id"), date_sold))
+            if record.get("id") is not None:
+                self._seen_ids.add(record["id"])
+            if record.get("ebay_item_id"):
+                self._seen_item_ids.add(record["ebay_item_id"])
+            if date_sold and (self._newest is None or date_sold > self._newest):
+                self._newest = date_sold
+
+        self._pending.extend(new_records)
+        self.count += len(new_records)
+        self.appended += len(new_records)
+        return new_records
+
+    def append_file(self, file_path):
+        """
+        Streams the `transactions` of a cached page and appends the new ones.
+
+        :return: The list of records that were appended.
+        """
+        with open(file_path, "r", encoding="utf-8") as f:
+            members = iter_json_object_members(f, stream_keys=("transactions", "ebay_avg", "tcgplayer"))
+            return self.append_records(value for key, value in members if key == "transactions")
+
+    def close(self):
+        """
+        Writes the appended sales to the log, then saves the watermark: the sale count,
+        the newest sale and the IDs inside the overlap window.
+        """
+        if self._pending:
+            os.makedirs(self.log.directory, exist_ok=True)
+            with open(self.log.log_path(self.card_id), "a", encoding="utf-8") as f:
+                for record in self._pending:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._pending = []
+
+        window_start = self._newest - self.overlap if self._newest else None
+        recent = [[txn_id, item_id, date_sold.strftime(DATE_FORMAT) if date_sold else None]
+                  for txn_id, item_id, date_sold in self._recent
+                  if window_start is None or date_sold is None or date_sold >= window_start]
+        self.log.save_watermark(self.card_id, {
+            "card_id": self.card_id,
+            "count": self.count,
+            "newest_date_sold": self._newest.strftime(DATE_FORMAT) if self._newest else None,
+            "recent": recent,
+            "updated_date": datetime.now().strftime(DATE_FORMAT)
+        })
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            print(f"Refresh of card_id {self.card_id} failed; its log and watermark were left unchanged.")
+        return False
+
+
+class TransactionLog:
+    """
+    Append-only transaction history, one line-delimited JSON file per card.
+
+    A refresh appends only the sales the log has not seen, so its cost follows the
+    number of new sales rather than the length of the history, and sales the API
+    later drops stay in the log. A small watermark file per card holds the sale
+    count, the newest sale date and the IDs near it, which is all that is needed
+    to tell new sales apart.
+    """
+
+    def __init__(self, directory=None):
+        """
+        :param directory: Where the logs live (defaults to cache/transaction_log).
+        """
+        self.directory = directory or get_default_log_dir()
+
+    def log_path(self, card_id):
+        return os.path.join(self.directory, f"card_id={card_id}.jsonl")
+
+    def watermark_path(self, card_id):
+        return os.path.join(self.directory, f"card_id={card_id}.watermark.json")
+
+    def load_watermark(self, card_id):
+        """Returns the card's watermark, or an empty dictionary if it has no log yet."""
+        try:
+            with open(self.watermark_path(card_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_watermark(self, card_id, watermark):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.watermark_path(card_id)}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(watermark, f)
+        os.replace(temp_path, self.watermark_path(card_id))
+
+    def writer(self, card_id):
+        """Returns a writer for one refresh of the card; use it as a context manager."""
+        return TransactionLogWriter(self, card_id)
+
+    def read(self, card_id):
+        """Yields every logged sale of the card, in the order they were appended."""
+        try:
+            with open(self.log_path(card_id), "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+from functools import partial
+
+from core_module.service import domain
+from core_module.service.async_fetcher import AsyncFetchEngine
+from core_module.utils.json_stream import iter_json_object_members
+from core_module.utils.util import debug_print
+
+# Top-level keys the API may use to report how many pages a card has.
+PAGE_COUNT_KEYS = ("total_pages", "pages", "num_pages", "page_count")
+
+
+class PageSummary:
+    """The few facts about a fetched page that drive pagination decisions."""
+
+    def __init__(self, transaction_count=0, newest_sale=None, transaction_ids=None, page_count=None):
+        self.transaction_count = transaction_count
+        self.newest_sale = newest_sale
+        self.transaction_ids = transaction_ids or set()
+        self.page_count = page_count
+
+
+def summarize_page(file_path):
+    """
+    Streams a cached transactions page and collects its transaction IDs, its newest
+    sale date and any page-count metadata, without loading the page into memory.
+
+    :param file_path: Path to a cached /api/transactions page.
+    :return: A PageSummary.
+    """
+    summary = PageSummary()
+    if not file_path:
+        return summary
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        for key, value in iter_json_object_members(f, stream_keys=("transactions", "ebay_avg", "tcgplayer")):
+            if key == "transactions" and isinstance(value, dict):
+                summary.transaction_count += 1
+                if value.get("id") is not None:
+                    summary.transaction_ids.add(value["id"])
+                date_sold = parse_sale_date(value.get("date_sold"))
+                if date_sold and (summary.newest_sale is None or date_sold > summary.newest_sale):
+                    summary.newest_sale = date_sold
+            elif key in PAGE_COUNT_KEYS and isinstance(value, int):
+                summary.page_count = value
+    return summary
+
+
+def parse_sale_date(date_string):
+    """Helper to parse the API's 'Thu, 05 Sep 2024 00:00:00 GMT' sale dates."""
+    if not date_string:
+        return None
+    try:
+        return datetime.strptime(date_string.removesuffix(" GMT"), "%a, %d %b %Y %H:%M:%S")
+    except ValueError:
+        return None
+
+
+class TransactionPageFetcher:
+    """
+    Fetches every relevant page of a card's /api/transactions history.
+
+    Page 0 is fetched first. Its metadata gives the page count when the API reports
+    one; otherwise pages are requested in waves of `max_concurrency` until a page
+    comes back empty. Fetching stops early once a page's newest sale is older than the
+    volume window (measured back from the card's newest sale), or once a page overlaps
+    the newest page stored by the previous fetch, since everything after it is
+    already cached. When page 0 itself overlaps, every new sale fits on it and no
+    other page is requested. Each page is handed to `on_page` as soon as it arrives, so the
+    caller can merge it into the database incrementally.
+    """
+
+    def __init__(self, max_concurrency=4, window_days=30, max_pages=50):
+        """
+        :param max_concurrency: Pages fetched at the same time (all share the API rate limiter).
+        :param window_days: The sales volume window; older pages are not needed.
+        :param max_pages: Hard cap on pages fetched per card.
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.window_days = window_days
+        self.max_pages = max_pages
+
+    def fetch(self, card_id, on_page):
+        """
+        Fetches the card's pages and calls `on_page(page, cache_file_path)` on the
+        calling thread for each page as it arrives.
+
+        :param card_id: The card to fetch transactions for.
+        :param on_page: Callback receiving the page number and its cache file path.
+        :return: The number of pages fetched.
+        """
+        index = self._load_index(card_id)
+        previous_newest_ids = set(index.get("newest_page_ids") or [])
+
+        # A failed download returns None and leaves the cached page alone; nothing is
+        # handed to `on_page` for it and the walk stops there.
+        first_path = domain.download_volume_of_transactions(card_id, 0)
+        if not first_path:
+            return 0
+        first = summarize_page(first_path)
+        on_page(0, first_path)
+
+        pages_fetched = 1
+        last_page = min(first.page_count, self.max_pages) if first.page_count else self.max_pages
+        cutoff = (first.newest_sale - timedelta(days=self.window_days)) if first.newest_sale else None
+        # Page 0 is always re-fetched. If it still holds sales from the previous fetch's
+        # page 0, the new sales all fit on it and the later pages are already cached.
+        done = first.transaction_count == 0 or self._should_stop(first, cutoff, previous_newest_ids)
+        failed = False
+
+        next_page = 1
+        engine = AsyncFetchEngine(partial(domain.download_volume_of_transactions, card_id), self.max_concurrency)
+        while not done and next_page < last_page:
+            wave = list(range(next_page, min(next_page + self.max_concurrency, last_page)))
+            summaries = {}
+
+            def on_result(page, path):
+                if path:
+                    summaries[page] = summarize_page(path)
+                    on_page(page, path)
+
+            engine.run(wave, on_result)
+            pages_fetched += len(wave)
+            next_page = wave[-1] + 1
+
+            # Decide in page order, so a failed, empty or stale page ends the walk.
+            for page in wave:
+                summary = summaries.get(page)
+                if summary is None or summary.transaction_count == 0 \
+                        or self._should_stop(summary, cutoff, previous_newest_ids):
+                    debug_print(f"Stopping pagination for card_id {card_id} at page {page}.")
+                    failed = summary is None
+                    done = True
+                    break
+
+        if failed:
+            # The walk ended early, so the next fetch must not trust page 0's overlap to skip the rest.
+            domain.delete_cache_file(self._index_file_name(card_id))
+        else:
+            self._save_index(card_id, pages_fetched, first.transaction_ids)
+        print(f"Fetched {pages_fetched} transaction page(s) for card_id {card_id}.")
+        return pages_fetched
+
+    @staticmethod
+    def _should_stop(summary, cutoff, previous_newest_ids):
+        """Returns True if no page after this one can hold new sales inside the window."""
+        if previous_newest_ids and summary.transaction_ids & previous_newest_ids:
+            return True
+        return bool(cutoff and summary.newest_sale and summary.newest_sale < cutoff)
+
+    @staticmethod
+    def _index_file_name(card_id):
+        return f"transaction_pages_card_id={card_id}.json"
+
+    def _load_index(self, card_id):
+        """Helper to read the card's page index (IDs on its newest page) from the cache."""
+        return domain.get_cache(self._index_file_name(card_id)) or {}
+
+    def _save_index(self, card_id, pages_fetched, newest_page_ids):
+        """Helper to store the page index the next fetch uses to pull only new pages."""
+        domain.save_cache(self._index_file_name(card_id), {
+            "card_id": card_id,
+            "pages_fetched": pages_fetched,
+            "newest_page_ids": sorted(newest_page_ids),
+            "updated_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+# This adds the project root to the Python path to allow for absolute imports.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core_module.card_data_utils.calculate_expected_value import calculate_net_gain, score_candidates, \
+    score_card_rows
+
+
+def generate_cards(count, seed=0):
+    """Returns `count` synthetic cards with realistic raw/PSA 10 price and gem rate ranges."""
+    rng = np.random.default_rng(seed)
+    raw_prices = rng.uniform(1, 300, count)
+    psa_10_prices = raw_prices * rng.uniform(1, 8, count)
+    gem_rates = rng.uniform(0.05, 0.9, count)
+    return [{"raw_price": float(raw), "psa_10_price": float(psa_10), "gem_rate": float(gem_rate)}
+            for raw, psa_10, gem_rate in zip(raw_prices, psa_10_prices, gem_rates)]
+
+
+def _score_card_python(card_data, grading_cost):
+    """Helper with the pure-Python per-card arithmetic, as the scoring was written before the columnar engine."""
+    expected_value = card_data["gem_rate"] * card_data["psa_10_price"] + (1 - card_data["gem_rate"]) * card_data["raw_price"]
+    total_cost = card_data["raw_price"] + grading_cost
+    net_gain = expected_value - total_cost
+    return expected_value, total_cost, net_gain, net_gain / total_cost
+
+
+def _best_of(fn, repeats):
+    """Helper returning the best wall time of `repeats` runs, in ms."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_benchmark(sizes=(50_000, 200_000), grading_cost=29, repeats=3):
+    """
+    Compares per-card scoring loops with the columnar engine and prints a table.
+
+    :return: A dictionary of card count to the timings (in ms) of each approach.
+    """
+    results = {}
+    for count in sizes:
+        cards = generate_cards(count)
+        raw = np.array([card["raw_price"] for card in cards])
+        psa_10 = np.array([card["psa_10_price"] for card in cards])
+        gem_rate = np.array([card["gem_rate"] for card in cards])
+
+        # Both paths must agree before their timings mean anything.
+        vectorized = score_candidates(raw, psa_10, gem_rate, grading_cost)["net_gain"]
+        per_card = np.array([_score_card_python(card, grading_cost)[2] for card in cards])
+        assert np.allclose(vectorized, per_card)
+
+        results[count] = {
+            "python_loop": _best_of(lambda: [_score_card_python(card, grading_cost) for card in cards], repeats),
+            "wrapper_loop": _best_of(lambda: [calculate_net_gain(card, grading_cost) for card in cards], repeats),
+            "rows": _best_of(lambda: score_card_rows(cards, grading_cost), repeats),
+            "arrays": _best_of(lambda: score_candidates(raw, psa_10, gem_rate, grading_cost), repeats),
+        }
+
+    print(f"{'cards':>9}{'python loop':>14}{'wrapper loop':>14}{'from rows':>12}{'arrays':>10}{'speedup':>9}")
+    for count, timings in results.items():
+        print(f"{count:>9}{timings['python_loop']:>11.1f} ms{timings['wrapper_loop']:>11.1f} ms"
+              f"{timings['rows']:>9.1f} ms{timings['arrays']:>7.2f} ms"
+              f"{timings['python_loop'] / timings['arrays']:>8.0f}x")
+    print("speedup = python loop / arrays; 'from rows' includes building the columns from card dictionaries.")
+    return results
+
+
+if __name__ == '__main__':
+    run_benchmark()
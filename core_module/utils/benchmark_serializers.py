@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+# This adds the project root to the Python path to allow for absolute imports.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core_module.utils.file_utils import SERIALIZERS, decode_bytes, read_serialized_file
+
+RESOURCES_DIR = os.path.join(project_root, "web", "backend", "tests", "resources")
+
+
+def benchmark_format(name, payloads, repeats=5):
+    """
+    Measures one serializer over a set of payloads.
+
+    :param name: A key of SERIALIZERS.
+    :param payloads: The decoded responses to encode and decode.
+    :param repeats: Runs per payload; the best run is kept.
+    :return: A dictionary with the total dump time, load time (in ms) and encoded size (in bytes),
+             or None if the format's library is not installed.
+    """
+    serializer = SERIALIZERS[name]
+    dump_seconds = load_seconds = 0.0
+    size = 0
+    for data in payloads:
+        try:
+            encoded = serializer.dumps(data)
+        except ValueError as e:
+            print(f"Skipping {name}: {e}")
+            return None
+
+        best_dump = best_load = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            serializer.dumps(data)
+            best_dump = min(best_dump, time.perf_counter() - start)
+            start = time.perf_counter()
+            decode_bytes(encoded)
+            best_load = min(best_load, time.perf_counter() - start)
+
+        dump_seconds += best_dump
+        load_seconds += best_load
+        size += len(encoded)
+    return {"dump_ms": dump_seconds * 1000, "load_ms": load_seconds * 1000, "bytes": size}
+
+
+def run_benchmark(directory=RESOURCES_DIR, repeats=5):
+    """
+    Compares every serializer on the JSON files in `directory` and prints a table.
+
+    :return: A dictionary of format name to its results.
+    """
+    payloads = [read_serialized_file(os.path.join(directory, filename))
+                for filename in sorted(os.listdir(directory)) if filename.endswith(".json")]
+    print(f"Benchmarking {len(SERIALIZERS)} formats on {len(payloads)} files from {directory}")
+
+    results = {}
+    for name in SERIALIZERS:
+        result = benchmark_format(name, payloads, repeats)
+        if result is not None:
+            results[name] = result
+
+    baseline = results["json"]["bytes"]
+    print(f"{'format':<14}{'dump ms':>10}{'load ms':>10}{'size KB':>10}{'vs json':>9}")
+    for name, result in results.items():
+        print(f"{name:<14}{result['dump_ms']:>10.1f}{result['load_ms']:>10.1f}"
+              f"{result['bytes'] / 1024:>10.1f}{result['bytes'] / baseline:>9.0%}")
+    return results
+
+
+if __name__ == '__main__':
+    run_benchmark()
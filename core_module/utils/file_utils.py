@@ -1,15 +1,200 @@
+import hashlib
 import json
 import os
-import time
+import zlib
 from datetime import datetime
 from pprint import pprint
 from string import ascii_lowercase
 
 from core_module.utils.util import debug_print
 
+# Optional serialization libraries; each format falls back or reports clearly when its library is missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Format of new response cache files: json (indented), compact_json, fast_json, msgpack, msgpack_zlib or msgpack_zstd.
+# Readers detect the format of each file on their own, so existing files keep working after a change.
+# Only the cache layer passes it; other files written by `save_object_to_file` stay plain JSON.
+CACHE_FILE_FORMAT = os.getenv("CACHE_FILE_FORMAT", "fast_json")
+
+# Layout of cache/api_responses: "flat" keeps every file in the one directory, "sharded" files them as
+# <endpoint>/<hash prefix of the ID>/<file> so no directory grows past a few hundred entries.
+# Switch with `python -m core_module.utils.migrate_cache_layout <layout>`, which moves the existing files.
+CACHE_LAYOUT = os.getenv("CACHE_LAYOUT", "flat")
+CACHE_SHARD_PREFIX_LENGTH = int(os.getenv("CACHE_SHARD_PREFIX_LENGTH", "2"))  # Hex digits: 2 gives 256 shards
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+JSON_LEADING_BYTES = b" \t\r\n{[\""
+
+
+class JsonSerializer:
+    """Standard library JSON; `indent=4` gives the original human-readable files."""
+
+    def __init__(self, indent=None):
+        self.indent = indent
+
+    def dumps(self, data) -> bytes:
+        separators = None if self.indent else (",", ":")
+        return json.dumps(data, indent=self.indent, separators=separators, ensure_ascii=False).encode("utf-8")
+
+
+class FastJsonSerializer:
+    """Compact JSON through orjson when it is installed, otherwise the standard library."""
+
+    def dumps(self, data) -> bytes:
+        if orjson is None:
+            return JsonSerializer().dumps(data)
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MsgpackSerializer:
+    """MessagePack, optionally compressed with zlib or zstd."""
+
+    def __init__(self, compression=None):
+        self.compression = compression
+
+    def dumps(self, data) -> bytes:
+        if msgpack is None:
+            raise ValueError("The msgpack formats need the 'msgpack' package (pip install msgpack).")
+        packed = msgpack.packb(data, use_bin_type=True)
+        if self.compression == "zlib":
+            return zlib.compress(packed, 6)
+        if self.compression == "zstd":
+            if zstandard is None:
+                raise ValueError("The msgpack_zstd format needs the 'zstandard' package (pip install zstandard).")
+            return zstandard.ZstdCompressor(level=3).compress(packed)
+        return packed
+
+
+SERIALIZERS = {
+    "json": JsonSerializer(indent=4),
+    "compact_json": JsonSerializer(),
+    "fast_json": FastJsonSerializer(),
+    "msgpack": MsgpackSerializer(),
+    "msgpack_zlib": MsgpackSerializer("zlib"),
+    "msgpack_zstd": MsgpackSerializer("zstd"),
+}
+
+
+def get_serializer(name: str = None):
+    """
+    Returns the serializer for a format name (defaults to CACHE_FILE_FORMAT).
+
+    Raises:
+        ValueError: If the format name is unknown.
+    """
+    name = name or CACHE_FILE_FORMAT
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown file format '{name}'. Choose one of: {', '.join(SERIALIZERS)}.")
+    return SERIALIZERS[name]
+
+
+def decode_bytes(raw: bytes):
+    """
+    Decodes file contents written in any supported format. The format is detected
+    from the leading bytes: a zstd frame, a zlib stream, JSON text, or otherwise MessagePack.
+
+    Raises:
+        json.JSONDecodeError: If the contents are not valid in the detected format.
+        ValueError: If the file needs an optional library that is not installed.
+    """
+    if raw.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError("File is zstd-compressed, but the 'zstandard' package is not installed.")
+        return decode_bytes(zstandard.ZstdDecompressor().decompress(raw))
+    if len(raw) > 1 and raw[0] == 0x78 and (raw[0] * 256 + raw[1]) % 31 == 0:
+        try:
+            return decode_bytes(zlib.decompress(raw))
+        except zlib.error as e:
+            raise json.JSONDecodeError(f"Invalid zlib data: {e}", "", 0)
+
+    raw = raw.removeprefix(b"\xef\xbb\xbf")
+    if not raw or raw[:1] in JSON_LEADING_BYTES or msgpack is None:
+        return orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+    try:
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+    except Exception as e:
+        raise json.JSONDecodeError(f"Invalid MessagePack data: {e}", "", 0)
+
+
 def get_api_response_cache_dir():
     return f"{get_repo_root()}/cache/api_responses/"
 
+
+def get_cache_shard(cache_file_name, prefix_length=CACHE_SHARD_PREFIX_LENGTH):
+    """
+    Returns the (endpoint directory, shard directory) a cache file belongs in under the sharded layout.
+    The shard is a hash prefix of the file's ID, so every page of one card shares a shard.
+
+    'get_card_prices_setId=557.json' -> ('get_card_prices_setId', '<first hex digits of md5("557")>')
+    """
+    endpoint, _, entity_id = cache_file_name.removesuffix(".json").partition("=")
+    shard_source = entity_id.split("_", 1)[0] if entity_id else endpoint
+    return endpoint, hashlib.md5(shard_source.encode("utf-8")).hexdigest()[:prefix_length]
+
+
+def get_cache_file_path(cache_file_name, directory=None, layout=None):
+    """
+    Returns the path of a response cache file under the given (default: configured) layout.
+
+    Args:
+        cache_file_name (str): The cache file name, e.g. 'get_card_prices_setId=557.json'.
+        directory (str, optional): The cache root (default: cache/api_responses).
+        layout (str, optional): "flat" or "sharded" (default: CACHE_LAYOUT).
+    """
+    directory = directory or get_api_response_cache_dir()
+    if (layout or CACHE_LAYOUT) == "sharded":
+        return os.path.join(directory, *get_cache_shard(cache_file_name), cache_file_name)
+    return os.path.join(directory, cache_file_name)
+
+
+def iter_cache_files(directory=None, prefix="", suffix=".json"):
+    """
+    Yields (cache_file_name, path) for every response cache file, walking both layouts:
+    files directly in the root, then <endpoint>/<shard>/ subdirectories. Endpoint
+    directories that cannot hold `prefix` are skipped without being listed.
+
+    Args:
+        directory (str, optional): The cache root (default: cache/api_responses).
+        prefix (str, optional): Only yield file names starting with this.
+        suffix (str, optional): Only yield file names ending with this.
+    """
+    directory = directory or get_api_response_cache_dir()
+    if not os.path.isdir(directory):
+        return
+
+    with os.scandir(directory) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+    endpoint_dirs = []
+    for entry in entries:
+        if entry.is_dir():
+            if entry.name.startswith(prefix) or prefix.startswith(entry.name + "="):
+                endpoint_dirs.append(entry.path)
+        elif entry.name.startswith(prefix) and entry.name.endswith(suffix):
+            yield entry.name, entry.path
+
+    for endpoint_dir in endpoint_dirs:
+        with os.scandir(endpoint_dir) as shards:
+            shard_paths = sorted(shard.path for shard in shards if shard.is_dir())
+        for shard_path in shard_paths:
+            with os.scandir(shard_path) as files:
+                names = sorted(entry.name for entry in files if entry.is_file())
+            for name in names:
+                if name.startswith(prefix) and name.endswith(suffix):
+                    yield name, os.path.join(shard_path, name)
+
 def get_repo_root() -> str:
     """
     Dynamically finds the root directory of the repository by traversing upwards
@@ -29,28 +214,42 @@ def get_repo_root() -> str:
     raise FileNotFoundError("Repository root not found. Ensure a `.git` directory exists.")
 
 
-def save_object_to_file(data, filename: str = None, directory: str = "cache", overwrite: bool = True):
+def save_object_to_file(data, filename: str = None, directory: str = "cache", overwrite: bool = True,
+                        file_format: str = "json"):
     """
     Saves the provided data (dictionary or list of dictionaries) to a JSON file.
-    Automatically removes old files before saving.
+    Old files are not cleaned up here; the response cache is evicted separately by
+    `core_module.service.cache_gc`.
 
     Args:
         data (dict | list): Input data to save.
         filename (str, optional): Desired filename (auto-generated if not provided).
         directory (str, optional): Target directory for saving (default: "cache").
         overwrite (bool, optional): Allow overwriting of existing files (default: True).
+        file_format (str, optional): Serializer name (default: indented JSON). The response cache
+            passes CACHE_FILE_FORMAT; files read by other tools should keep the default.
     """
-    remove_old_files(directory=directory)  # Clean up old files first
-
     if isinstance(data, dict):
-        _save_dict_to_json(data, filename, directory, overwrite)
+        _save_dict_to_json(data, filename, directory, overwrite, file_format)
     elif isinstance(data, list) and all(isinstance(item, dict) for item in data):
-        _save_list_of_dicts_to_json(data, filename, directory, overwrite)
+        _save_list_of_dicts_to_json(data, filename, directory, overwrite, file_format)
+
+
+def read_serialized_file(filepath: str):
+    """
+    Reads and decodes a file written in any supported format (see `decode_bytes`).
+
+    Raises:
+        json.JSONDecodeError: If the file contents are invalid.
+    """
+    with open(filepath, "rb") as f:
+        return decode_bytes(f.read())
 
 
 def load_json_file(filepath: str) -> list | dict:
     """
     Loads and parses JSON from a specified file path (relative to repo root).
+    Files written in any of the other supported formats are detected and decoded too.
 
     Args:
         filepath (str): Path to the JSON file (relative to the repo root).
@@ -71,64 +270,37 @@ def load_json_file(filepath: str) -> list | dict:
         return None
 
     try:
-        with open(absolute_filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_serialized_file(absolute_filepath)
     except json.JSONDecodeError as e:
         debug_print(f"Error decoding JSON file: {e}")
         return None
 
 
-def remove_old_files(directory: str = "cache", days: int = 60) -> None:
-    """
-    Removes files older than the specified number of days from a directory.
-
-    Args:
-        directory (str): Target directory to clean (default: "cache").
-        days (int): Number of days to use as the age threshold (default: 60).
-    """
-    directory = os.path.join(get_repo_root(), directory)
-    if not os.path.exists(directory):
-        debug_print(f"Directory '{directory}' does not exist. Nothing to clean.")
-        return
-
-    now = time.time()
-    age_threshold = now - (days * 24 * 60 * 60)
-
-    for filename in os.listdir(directory):
-        filepath = os.path.join(directory, filename)
-        if os.path.isfile(filepath) and os.path.getmtime(filepath) < age_threshold:
-            try:
-                os.remove(filepath)
-                debug_print(f"Removed old file: {filepath}")
-            except OSError as e:
-                debug_print(f"Error removing {filepath}: {e}")
-    debug_print("Old file cleanup completed.")
-
-
-def _save_dict_to_json(data: dict, filename: str = None, directory: str = "cache", overwrite: bool = False) -> str:
+def _save_dict_to_json(data: dict, filename: str = None, directory: str = "cache", overwrite: bool = False,
+                       file_format: str = "json") -> str:
     """
     Internal helper to save a dictionary as a JSON file.
 
     Args:
         data (dict): Dictionary to save.
-        filename, directory, overwrite: Filename, directory path, and overwrite preference.
+        filename, directory, overwrite, file_format: Filename, directory path, overwrite preference and format.
     Returns:
         str: Path to the saved file.
     """
     filepath = _resolve_filepath(filename, directory, overwrite)
     pprint(filepath)
-    _write_json_to_file(data, filepath)
+    _write_json_to_file(data, filepath, file_format)
     debug_print(f"Dictionary saved to: {filepath}")
     return filepath
 
 
 def _save_list_of_dicts_to_json(data: list, filename: str = None, directory: str = "cache",
-                                overwrite: bool = False) -> str:
+                                overwrite: bool = False, file_format: str = "json") -> str:
     """
     Internal helper to save a list of dictionaries as a JSON file.
     """
     filepath = _resolve_filepath(filename, directory, overwrite)
-    _write_json_to_file(data, filepath)
+    _write_json_to_file(data, filepath, file_format)
     debug_print(f"List of dictionaries saved to: {filepath}")
     return filepath
 
@@ -171,16 +343,18 @@ def _resolve_filepath(filename: str, directory: str, overwrite: bool) -> str:
     return filepath
 
 
-def _write_json_to_file(data, filepath: str) -> None:
+def _write_json_to_file(data, filepath: str, file_format: str = "json") -> None:
     """
-    Helper to write JSON data to a file.
+    Helper to write JSON data to a file, in the given serialization format.
 
     Args:
         data: JSON serializable data.
         filepath (str): Filepath where to save the JSON.
+        file_format (str, optional): Serializer name (default: indented JSON).
     """
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    encoded = get_serializer(file_format).dumps(data)
+    with open(filepath, "wb") as f:
+        f.write(encoded)
 
 
 # Example usage
@@ -0,0 +1,117 @@
+import json
+
+_WHITESPACE = " \t\n\r"
+
+
+class _StreamBuffer:
+    """
+    A sliding text buffer over a file object. Consumed text is dropped as parsing
+    moves forward, so memory stays bounded by the largest single value decoded.
+    """
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _read_more(self):
+        """Reads the next chunk, compacting the consumed prefix. Returns False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._read_more():
+                return ""
+
+    def expect(self, char):
+        """Consumes the next non-whitespace character, which must be `char`."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, found '{found or 'EOF'}'.")
+        self.pos += 1
+
+    def decode_value(self):
+        """
+        Decodes the next complete JSON value. If the value runs past the end of the
+        buffer, more of the file is read and the decode is retried. A number at the
+        very end of the buffer could be truncated, so it only counts as complete when
+        something follows it (or the file has ended).
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._read_more():
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                self.pos = end
+                return value
+
+
+def iter_json_object_members(fp, stream_keys=(), chunk_size=65536):
+    """
+    Incrementally parses a top-level JSON object from a text file object.
+
+    Members whose key is in `stream_keys` and whose value is an array are yielded one
+    element at a time as `(key, item)`; every other member is yielded once as
+    `(key, value)`. Only one array element is held in memory at a time.
+
+    :param fp: A file object opened in text mode.
+    :param stream_keys: Keys whose array values should be streamed item by item.
+    :param chunk_size: Number of characters read from the file at a time.
+    """
+    stream_keys = set(stream_keys)
+    buffer = _StreamBuffer(fp, chunk_size)
+
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        buffer.pos += 1
+        return
+
+    while True:
+        key = buffer.decode_value()
+        buffer.expect(":")
+
+        if key in stream_keys and buffer.peek() == "[":
+            buffer.pos += 1
+            if buffer.peek() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield key, buffer.decode_value()
+                    if buffer.peek() == ",":
+                        buffer.pos += 1
+                        continue
+                    buffer.expect("]")
+                    break
+        else:
+            yield key, buffer.decode_value()
+
+        if buffer.peek() == ",":
+            buffer.pos += 1
+            continue
+        buffer.expect("}")
+        return
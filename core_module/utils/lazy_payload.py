@@ -0,0 +1,202 @@
+import json
+import mmap
+import os
+import re
+
+from core_module.utils.file_utils import decode_bytes
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Inside a container only brackets outside of strings matter for finding where it ends;
+# each match skips everything up to and including the next such bracket.
+_NEXT_BRACKET = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*[\[\]{}]', re.DOTALL)
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(rb'[^,:\]}\s]+')
+_WHITESPACE = re.compile(rb'\s*')
+
+
+def _loads(raw):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+class LazyPayload:
+    """
+    A read-only view of a cached JSON payload that parses only what is asked for.
+
+    The file is memory-mapped, not read. Top-level members are located by scanning
+    only strings and brackets, and a member's value is parsed when it is requested.
+    Arrays are walked record by record, so `iter_records` holds one record at a time
+    instead of building the whole object graph. The offset of every record visited
+    is kept, so `record(key, index)` can go straight to it later.
+
+    Payloads in a non-JSON cache format, or already decoded, are wrapped as they are.
+    """
+
+    def __init__(self, file_path=None, data=None):
+        """
+        :param file_path: Path of the cached payload to map.
+        :param data: An already decoded payload to wrap instead (e.g. from the memory tier).
+        """
+        self._map = None
+        self._data = {"data": data} if isinstance(data, list) else data
+        self._member_spans = None  # key -> (start, end) of its value
+        self._record_spans = {}  # key -> [(start, end), ...] of the records visited so far
+        self._complete = set()  # keys whose records have all been visited
+
+        if file_path is None:
+            return
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                self._data = {}
+                return
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        start = self._skip_whitespace(0)
+        if self._map[start:start + 1] != b"{":
+            # Another cache format (or a top-level list): decode it once and serve from memory.
+            data = decode_bytes(self._map[:])
+            self.close()
+            self._data = {"data": data} if isinstance(data, list) else data
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(data=data)
+
+    def keys(self):
+        if self._data is not None:
+            return list(self._data)
+        return list(self._spans())
+
+    def get(self, key, default=None):
+        """Parses and returns one top-level member (best for small values such as `updated_date`)."""
+        if self._data is not None:
+            return self._data.get(key, default)
+        span = self._spans().get(key)
+        return default if span is None else _loads(self._map[span[0]:span[1]])
+
+    def iter_records(self, key, fields=None):
+        """
+        Yields the records of a top-level array one at a time, parsing each on demand.
+
+        :param key: The array member, e.g. 'data' or 'transactions'.
+        :param fields: Optional field names; each record is then reduced to only those fields,
+                       so nothing else is kept alive by the caller.
+        """
+        for record in self._iter_full_records(key):
+            if fields is None or not isinstance(record, dict):
+                yield record
+            else:
+                yield {field: record[field] for field in fields if field in record}
+
+    def record(self, key, index):
+        """Returns one record of a top-level array, using the offset index built by earlier walks."""
+        if self._data is not None:
+            return (self._data.get(key) or [])[index]
+        spans = self._record_spans.get(key, [])
+        if index >= len(spans) and key not in self._complete:
+            for _ in self._iter_spans(key):
+                if index < len(self._record_spans[key]):
+                    break
+            spans = self._record_spans[key]
+        start, end = spans[index]
+        return _loads(self._map[start:end])
+
+    def count(self, key):
+        """Returns the number of records in a top-level array, indexing it without parsing records."""
+        if self._data is not None:
+            value = self._data.get(key)
+            return len(value) if isinstance(value, list) else 0
+        if key not in self._complete:
+            for _ in self._iter_spans(key):
+                pass
+        return len(self._record_spans.get(key, []))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _iter_full_records(self, key):
+        """Helper yielding the parsed records of an array member."""
+        if self._data is not None:
+            value = self._data.get(key)
+            yield from (value if isinstance(value, list) else [])
+            return
+        for start, end in self._iter_spans(key):
+            yield _loads(self._map[start:end])
+
+    def _iter_spans(self, key):
+        """Helper yielding the (start, end) span of each record of an array member, filling the index."""
+        if key in self._complete:
+            yield from list(self._record_spans[key])
+            return
+
+        member = self._spans().get(key)
+        if member is None or self._map[member[0]:member[0] + 1] != b"[":
+            self._record_spans[key] = []
+            self._complete.add(key)
+            return
+
+        spans = []
+        self._record_spans[key] = spans
+        pos = self._skip_whitespace(member[0] + 1)
+        while self._map[pos:pos + 1] != b"]":
+            end = self._value_end(pos)
+            spans.append((pos, end))
+            yield pos, end
+            pos = self._skip_whitespace(end)
+            if self._map[pos:pos + 1] == b",":
+                pos = self._skip_whitespace(pos + 1)
+        self._complete.add(key)
+
+    def _spans(self):
+        """Helper locating every top-level member once, without parsing the values."""
+        if self._member_spans is not None:
+            return self._member_spans
+
+        spans = {}
+        pos = self._skip_whitespace(self._skip_whitespace(0) + 1)
+        while self._map[pos:pos + 1] == b'"':
+            key_end = _STRING.match(self._map, pos).end()
+            key = _loads(self._map[pos:key_end])
+            pos = self._skip_whitespace(key_end)
+            pos = self._skip_whitespace(pos + 1)  # past ':'
+            end = self._value_end(pos)
+            spans[key] = (pos, end)
+            pos = self._skip_whitespace(end)
+            if self._map[pos:pos + 1] == b",":
+                pos = self._skip_whitespace(pos + 1)
+        self._member_spans = spans
+        return spans
+
+    def _value_end(self, pos):
+        """Helper returning the offset just past the JSON value starting at `pos`."""
+        first = self._map[pos:pos + 1]
+        if first == b'"':
+            return _STRING.match(self._map, pos).end()
+        if first not in (b"{", b"["):
+            return _SCALAR.match(self._map, pos).end()
+
+        depth = 0
+        for match in _NEXT_BRACKET.finditer(self._map, pos):
+            end = match.end()
+            if self._map[end - 1] in b"{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return end
+        raise json.JSONDecodeError("Unterminated value", "", pos)
+
+    def _skip_whitespace(self, pos):
+        return _WHITESPACE.match(self._map, pos).end()
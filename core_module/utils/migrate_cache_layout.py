@@ -0,0 +1,63 @@
+import os
+import sys
+
+# This adds the project root to the Python path to allow for absolute imports.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from core_module.utils.file_utils import get_api_response_cache_dir, get_cache_file_path, iter_cache_files
+
+CACHE_LAYOUTS = ("flat", "sharded")
+
+
+def migrate_cache_layout(layout, directory=None):
+    """
+    Moves every response cache file, in place, to where `layout` puts it. Files already
+    in the right place are left alone, so an interrupted migration can simply be re-run.
+    If a file exists in both layouts, the newer copy is kept. Directories emptied by the
+    move are removed.
+
+    Set CACHE_LAYOUT to the same layout before the next run, or the cache will miss.
+
+    :param layout: "flat" or "sharded".
+    :param directory: The cache root (defaults to cache/api_responses).
+    :return: The number of files moved.
+    """
+    if layout not in CACHE_LAYOUTS:
+        raise ValueError(f"Unknown cache layout '{layout}'. Expected one of: {', '.join(CACHE_LAYOUTS)}")
+    directory = directory or get_api_response_cache_dir()
+
+    moved = 0
+    created_dirs = set()
+    for name, path in list(iter_cache_files(directory)):
+        target = get_cache_file_path(name, directory, layout)
+        if os.path.abspath(path) == os.path.abspath(target):
+            continue
+        target_dir = os.path.dirname(target)
+        if target_dir not in created_dirs:
+            os.makedirs(target_dir, exist_ok=True)
+            created_dirs.add(target_dir)
+        if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+            os.remove(path)
+        else:
+            os.replace(path, target)
+        moved += 1
+        if moved % 10000 == 0:
+            print(f"Moved {moved} files...")
+
+    _remove_empty_dirs(directory)
+    print(f"Cache layout is now '{layout}': {moved} files moved in {directory}.")
+    return moved
+
+
+def _remove_empty_dirs(directory):
+    """Helper to delete the endpoint and shard directories left empty, keeping the root."""
+    for root, _, _ in sorted(os.walk(directory), key=lambda walked: len(walked[0]), reverse=True):
+        if os.path.abspath(root) != os.path.abspath(directory) and not os.listdir(root):
+            os.rmdir(root)
+
+
+if __name__ == '__main__':
+    # Usage: python core_module/utils/migrate_cache_layout.py [sharded|flat]
+    migrate_cache_layout(sys.argv[1] if len(sys.argv) > 1 else "sharded")
@@ -7,6 +7,7 @@ import sys
 from flask import Flask, render_template, jsonify, request
 
 from core_module.card_data_utils.filter_cards_based_on_inputs import filter_cards
+from core_module.service.domain import get_cache_metrics
 from web.backend.card_cache_service import CardCacheService
 from web.backend.containers import AppContainer
 from web.backend.db.db_config import configure_sqlite_for_project
@@ -90,6 +91,11 @@ def create_app() -> Flask:
     def health():
         return jsonify({"status": "ok"})
 
+    @app.get("/api/cache-metrics")
+    def cache_metrics():
+        """Read-only view of the per-endpoint cache counters and latency histograms."""
+        return jsonify(get_cache_metrics())
+
     @app.get("/api/cards")
     def get_cards():
         """API to get all cards."""
@@ -18,3 +18,8 @@ DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, "web/backend/pokemon.db")
 
 # You can add other paths here later, for example:
 CACHE_DIR = os.path.join(PROJECT_ROOT, "cache/api_responses")
+
+# --- Update Cycle Configuration ---
+# When enabled, the update cycle fetches cards and sets concurrently instead of one at a time.
+UPDATE_ASYNC_FETCH = os.getenv("UPDATE_ASYNC_FETCH", "false").lower() in ("1", "true", "yes")
+UPDATE_FETCH_CONCURRENCY = int(os.getenv("UPDATE_FETCH_CONCURRENCY", "4"))
@@ -5,6 +5,7 @@ from dependency_injector.providers import Configuration, Factory, Resource, Sing
 from .card_cache_service import CardCacheService
 from .db.dao.candidates_dao import CandidatesDAO
 from .db.dao.gem_rate_refresh_log_dao import GemRateRefreshLogDAO
+from .db.dao.ingest_checksum_dao import IngestChecksumDAO
 from .db.dao.psa_dao import PsaDAO
 from .db.dao.sales_volume_refresh_log_dao import SalesVolumeRefreshLogDAO
 from .db.dao.set_dao import SetDAO
@@ -29,6 +30,10 @@ class AppContainer(containers.DeclarativeContainer):
         default={
             "db": {
                 "path": config.DEFAULT_DB_PATH
+            },
+            "update_cycle": {
+                "async_fetch": config.UPDATE_ASYNC_FETCH,
+                "fetch_concurrency": config.UPDATE_FETCH_CONCURRENCY
             }
         }
     )
@@ -82,6 +87,11 @@ class AppContainer(containers.DeclarativeContainer):
         conn=database.provided.conn
     )
 
+    ingest_checksum_dao = Factory(
+        IngestChecksumDAO,
+        conn=database.provided.conn
+    )
+
     update_service = Factory(
         UpdateService,
         candidates_dao=candidates_dao,
@@ -90,7 +100,10 @@ class AppContainer(containers.DeclarativeContainer):
         set_dao=set_dao,
         sales_volume_refresh_log_dao=sales_volume_refresh_log_dao,
         gem_rate_refresh_log_dao=gem_rate_refresh_log_dao,
+        ingest_checksum_dao=ingest_checksum_dao,
         card_cache_service=card_cache_service,
+        use_async_fetch=config.update_cycle.async_fetch,
+        fetch_concurrency=config.update_cycle.fetch_concurrency,
     )
 
 
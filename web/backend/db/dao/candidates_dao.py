@@ -6,7 +6,9 @@ from textwrap import dedent
 from core_module.card_data_utils.get_raw_to_psa10_grading_value_from_jsons import \
     get_raw_to_psa10_grading_value_from_jsons_cache
 
-from core_module.card_data_utils.calculate_expected_value import calculate_net_gain
+import numpy as np
+
+from core_module.card_data_utils.calculate_expected_value import score_card_rows
 from core_module.utils.file_utils import save_object_to_file
 
 
@@ -94,23 +96,21 @@ class CandidatesDAO:
         self.cursor.execute(query, (min_value_increase, min_psa10_price))
         card_data_rows = self.cursor.fetchall()
 
-        profitable_candidates = []
+        # Score every row in one vectorized pass; rows with a missing input come back as NaN.
+        scores = score_card_rows(card_data_rows, grading_cost)
+        net_gains = scores['net_gain']
         for row in card_data_rows:
-            card_data = dict(row)
-            if card_data.get('gem_rate') is None:
-                print(f"Skipping card {card_data.get('card_id')} due to missing data for calculation.")
-                continue
-
-            try:
-                ev, total_cost, net_gain, lucrative_factor = calculate_net_gain(card_data, grading_cost)
-                if net_gain >= min_net_gain:
-                    card_data['net_gain'] = net_gain
-                    card_data['lucrative_factor'] = lucrative_factor
-                    card_data['total_cost'] = total_cost
-                    card_data['expected_value'] = ev
-                    profitable_candidates.append(card_data)
-            except (TypeError, KeyError) as e:
-                print(f"Skipping card {card_data.get('card_id')} due to missing data for calculation: {e}")
+            if row['gem_rate'] is None:
+                print(f"Skipping card {row['card_id']} due to missing data for calculation.")
+
+        profitable_candidates = []
+        for i in np.flatnonzero(net_gains >= min_net_gain):
+            card_data = dict(card_data_rows[i])
+            card_data['net_gain'] = float(net_gains[i])
+            card_data['lucrative_factor'] = float(scores['lucrative_factor'][i])
+            card_data['total_cost'] = float(scores['total_cost'][i])
+            card_data['expected_value'] = float(scores['expected_value'][i])
+            profitable_candidates.append(card_data)
 
         return profitable_candidates
 
@@ -275,7 +275,7 @@ class CandidatesDAO:
                 psa10_stats.avg as psa_10_price,
                 ca.gem_rate,
                 ca.psa_10_pop
-                /* Add other fields from 'cards' or 'card_analytics' if calculate_net_gain needs them */
+                /* Add other fields from 'cards' or 'card_analytics' if the scoring needs them */
             FROM
                 cards c
             JOIN card_stats raw_stats ON c.card_id = raw_stats.card_id AND raw_stats.source = 0.0
@@ -288,23 +288,10 @@ class CandidatesDAO:
         self.cursor.execute(query, candidate_ids)
         card_data_rows = self.cursor.fetchall()
 
-        # Step 2: Use Python for the complex calculation logic.
-        profitable_card_ids = []
-        for row in card_data_rows:
-            card_data = dict(row)
-            if card_data.get('gem_rate') is None:
-                continue
-
-            try:
-                # Reuse the existing, tested business logic
-                _ev, _total_cost, net_gain, _lucrative_factor = calculate_net_gain(card_data, grading_cost)
-                if net_gain >= min_net_gain:
-                    profitable_card_ids.append(card_data['card_id'])
-            except (TypeError, KeyError) as e:
-                # This helps debug if `calculate_net_gain` expects other data
-                print(f"Skipping card {card_data['card_id']} due to missing data for calculation: {e}")
-
-        return profitable_card_ids
+        # Step 2: Score every card in one vectorized pass. Cards missing a price or gem rate
+        # score as NaN, which never passes the threshold.
+        net_gains = score_card_rows(card_data_rows, grading_cost)['net_gain']
+        return [card_data_rows[i]['card_id'] for i in np.flatnonzero(net_gains >= min_net_gain)]
 
     def get_cards_with_analytics(self):
         """
@@ -334,46 +321,72 @@ class CandidatesDAO:
         :param card_id: The ID of the card to update.
         :param grading_cost: The assumed cost of grading.
         """
-        # Step 1: Gather all necessary data in one query
+        self.update_grading_financials_bulk([card_id], grading_cost)
+
+    def update_grading_financials_bulk(self, card_ids=None, grading_cost=29, batch_size=900):
+        """
+        Recalculates 'grading_financials' for many cards at once: one join of the raw and
+        PSA 10 card_stats with card_analytics, one vectorized scoring pass and one upsert
+        in a single transaction. Cards missing a price or gem rate are skipped.
+
+        :param card_ids: The IDs of the affected cards; None means every card.
+        :param grading_cost: The assumed cost of grading (a scalar, as in `score_candidates`).
+        :param batch_size: IDs bound per query, kept under SQLite's host parameter limit.
+        :return: The number of grading_financials rows written.
+        """
         query = """
             SELECT
+                c.card_id,
                 cs_raw.avg as raw_price,
                 cs_psa10.avg as psa_10_price,
                 ca.gem_rate
             FROM cards c
-            LEFT JOIN card_stats cs_raw ON c.card_id = cs_raw.card_id AND cs_raw.source = 0.0
-            LEFT JOIN card_stats cs_psa10 ON c.card_id = cs_psa10.card_id AND cs_psa10.source = 10.0
-            LEFT JOIN card_analytics ca ON c.card_id = ca.card_id
-            WHERE c.card_id = ?
+            JOIN card_stats cs_raw ON c.card_id = cs_raw.card_id AND cs_raw.source = 0.0
+            JOIN card_stats cs_psa10 ON c.card_id = cs_psa10.card_id AND cs_psa10.source = 10.0
+            JOIN card_analytics ca ON c.card_id = ca.card_id
+            WHERE cs_raw.avg IS NOT NULL AND cs_psa10.avg IS NOT NULL AND ca.gem_rate IS NOT NULL
+            {card_filter}
             """
-        self.cursor.execute(query, (card_id,))
-        data = self.cursor.fetchone()
-
-        if not all(data.keys()):
-            # print(f"Skipping financials for card {card_id}, missing required data (price or gem rate).")
-            return
-
-        # Step 2: Perform calculations using your existing logic
+        # Step 1: Gather the inputs of every affected card
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        if card_ids is None:
+            rows = cursor.execute(query.format(card_filter="")).fetchall()
+        else:
+            card_ids = list(card_ids)
+            rows = []
+            for start in range(0, len(card_ids), batch_size):
+                batch = card_ids[start:start + batch_size]
+                placeholders = ','.join('?' for _ in batch)
+                rows.extend(cursor.execute(query.format(card_filter=f"AND c.card_id IN ({placeholders})"),
+                                           batch).fetchall())
+        if not rows:
+            return 0
+
+        # Step 2: Score them all in one pass; a zero total cost has no lucrative factor and is skipped
+        scores = score_card_rows(rows, grading_cost)
+        writable = np.flatnonzero(np.isfinite(scores['lucrative_factor']))
+        upsert_rows = [(rows[i]['card_id'], float(scores['net_gain'][i]), float(scores['lucrative_factor'][i]),
+                        float(scores['total_cost'][i]), float(scores['expected_value'][i])) for i in writable]
+
+        # Step 3: Upsert the results in one transaction
+        upsert_query = dedent("""
+                INSERT INTO grading_financials (card_id, net_gain, lucrative_factor, total_cost, expected_value, last_calculated)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(card_id) DO UPDATE SET
+                    net_gain = excluded.net_gain,
+                    lucrative_factor = excluded.lucrative_factor,
+                    total_cost = excluded.total_cost,
+                    expected_value = excluded.expected_value,
+                    last_calculated = excluded.last_calculated;
+            """)
         try:
-            card_data = dict(data)
-            ev, total_cost, net_gain, lucrative_factor = calculate_net_gain(card_data, grading_cost)
-
-            # Step 3: Upsert the results into the new table
-            upsert_query = dedent("""
-                    INSERT INTO grading_financials (card_id, net_gain, lucrative_factor, total_cost, expected_value, last_calculated)
-                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    ON CONFLICT(card_id) DO UPDATE SET
-                        net_gain = excluded.net_gain,
-                        lucrative_factor = excluded.lucrative_factor,
-                        total_cost = excluded.total_cost,
-                        expected_value = excluded.expected_value,
-                        last_calculated = excluded.last_calculated;
-                """)
-            self.cursor.execute(upsert_query, (card_id, net_gain, lucrative_factor, total_cost, ev))
+            cursor.executemany(upsert_query, upsert_rows)
             self.conn.commit()
-        except (TypeError, KeyError) as e:
-            pass
-            # print(f"Could not calculate financials for card {card_id}: {e}")
+        except Exception:
+            self.conn.rollback()
+            raise
+        return len(upsert_rows)
 
     def find_profitable_candidates_without_gem_rate(self, min_value_increase, min_psa10_price,
                                                     days_since_last_attempt=7):
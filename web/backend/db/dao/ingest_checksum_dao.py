@@ -0,0 +1,41 @@
+from textwrap import dedent
+
+
+class IngestChecksumDAO:
+    """
+    Data Access Object for the checksums of the payloads each consumer last ingested.
+    """
+
+    def __init__(self, conn):
+        """
+        Initializes the DAO with a database connection.
+        """
+        self.conn = conn
+        self.cursor = conn.cursor()
+
+    def get_checksum(self, consumer, payload_key):
+        """
+        Returns the checksum of the payload the consumer last ingested for this key,
+        or None if it never ingested one.
+        """
+        self.cursor.execute(
+            "SELECT checksum FROM ingest_checksums WHERE consumer = ? AND payload_key = ?",
+            (consumer, str(payload_key))
+        )
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def save_checksum(self, consumer, payload_key, checksum):
+        """
+        Records the checksum of a payload the consumer has just ingested. Only call it
+        once the ingest has succeeded.
+        """
+        query = dedent("""
+            INSERT INTO ingest_checksums (consumer, payload_key, checksum, ingested_date)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(consumer, payload_key) DO UPDATE SET
+                checksum = excluded.checksum,
+                ingested_date = excluded.ingested_date;
+        """)
+        self.cursor.execute(query, (consumer, str(payload_key), checksum))
+        self.conn.commit()
@@ -70,6 +70,20 @@ class PsaDAO:
         self.conn.commit()
 
 
+    def touch_psa_population(self, card_id, updated_date_str):
+        """
+        Bumps only the `updated_date` of a card's population rows, for a re-fetched
+        payload whose content is unchanged, so analytics and financials are not recomputed.
+        """
+        if not updated_date_str:
+            return
+        self.cursor.execute(
+            "UPDATE psa_population SET updated_date = ? WHERE card_id = ?",
+            (datetime.strptime(updated_date_str, '%Y-%m-%d %H:%M:%S'), card_id)
+        )
+        self.conn.commit()
+        print(f"PSA population for card_id {card_id} is unchanged; only its updated_date was bumped.")
+
     def get_psa_population_as_json(self, card_id):
         """
         Retrieves all PSA population data for a given card_id and reconstructs
@@ -148,3 +162,56 @@ class PsaDAO:
         self.cursor.row_factory = None
 
         self.conn.commit()
+
+    def update_card_analytics_bulk(self, card_ids=None, batch_size=900):
+        """
+        Recalculates 'card_analytics' for every card with population data (or only the
+        given card IDs) with one grouped INSERT ... SELECT ... ON CONFLICT DO UPDATE, in
+        a single transaction. Produces the same rows as calling `update_card_analytics` per card.
+
+        :param card_ids: Optional card IDs to restrict the recalculation to; None means all cards.
+        :param batch_size: IDs bound per statement, kept under SQLite's host parameter limit.
+        :return: The number of card_analytics rows written.
+        """
+        # `WHERE true` keeps SQLite from reading ON CONFLICT as part of the SELECT.
+        upsert_query = """
+            INSERT INTO card_analytics (card_id, psa_10_pop, non_psa_10_pop, gem_rate, last_calculated)
+            SELECT
+                card_id,
+                psa_10_pop,
+                non_psa_10_pop,
+                CASE WHEN psa_10_pop + non_psa_10_pop > 0
+                     THEN CAST(psa_10_pop AS REAL) / (psa_10_pop + non_psa_10_pop) ELSE 0 END,
+                CURRENT_TIMESTAMP
+            FROM (
+                SELECT
+                    card_id,
+                    SUM(CASE WHEN psa_grade = 10.0 THEN population_count ELSE 0 END) as psa_10_pop,
+                    SUM(CASE WHEN psa_grade != 10.0 THEN population_count ELSE 0 END) as non_psa_10_pop
+                FROM psa_population
+                {where}
+                GROUP BY card_id
+            )
+            WHERE true
+            ON CONFLICT(card_id) DO UPDATE SET
+                psa_10_pop = excluded.psa_10_pop,
+                non_psa_10_pop = excluded.non_psa_10_pop,
+                gem_rate = excluded.gem_rate,
+                last_calculated = excluded.last_calculated;
+        """
+        try:
+            if card_ids is None:
+                updated = self.cursor.execute(upsert_query.format(where="")).rowcount
+            else:
+                card_ids = list(card_ids)
+                updated = 0
+                for start in range(0, len(card_ids), batch_size):
+                    batch = card_ids[start:start + batch_size]
+                    placeholders = ','.join('?' for _ in batch)
+                    updated += self.cursor.execute(
+                        upsert_query.format(where=f"WHERE card_id IN ({placeholders})"), batch).rowcount
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return updated
@@ -2,8 +2,16 @@ import sqlite3
 from datetime import datetime
 from textwrap import dedent
 
+from core_module.utils.json_stream import iter_json_object_members
 from . import queries
 
+# Payload keys that hold per-sale records, mapped to the bulk insert query for each.
+SALES_RECORD_QUERIES = {
+    'ebay_avg': queries.BULK_INSERT_EBAY_AVG,
+    'tcgplayer': queries.BULK_INSERT_TCGPLAYER,
+    'transactions': queries.BULK_INSERT_TRANSACTIONS,
+}
+
 
 class SalesDAO:
     """
@@ -19,10 +27,13 @@ class SalesDAO:
         self.conn.row_factory = sqlite3.Row
         self.cursor = conn.cursor()
 
-    def add_sales_from_json(self, json_data):
+    def add_sales_from_json(self, json_data, update_volume=True):
         """
         Parses a JSON object and inserts the data into the respective sales tables
         using efficient bulk insertion.
+
+        :param update_volume: Recalculate the card's sales volume afterwards. Callers ingesting many
+                              cards pass False and run `update_sales_volume_bulk` once at the end.
         """
         card_id = self._extract_card_id(json_data)
         if not card_id:
@@ -32,93 +43,157 @@ class SalesDAO:
         # 1. Upsert card_sales table
         self._upsert_card_sales(card_id, json_data.get('updated_date'))
 
-        # 2. Bulk insert 'ebay_avg' data
-        ebay_avg_data = json_data.get('ebay_avg', [])
-        if ebay_avg_data:
-            data_to_insert = [
-                (card_id, self._parse_date(item.get('date_sold')), item.get('psa_grade'), item.get('sold_price'),
-                 item.get('volume'))
-                for item in ebay_avg_data
-            ]
-            self.cursor.executemany(queries.BULK_INSERT_EBAY_AVG, data_to_insert)
-            print(f"Inserted {len(data_to_insert)} rows into ebay_avg.")
-
-        # 3. Bulk insert 'tcgplayer' data
-        tcgplayer_data = json_data.get('tcgplayer', [])
-        if tcgplayer_data:
-            data_to_insert = [
-                (item.get('id'), card_id, self._parse_date(item.get('created_at')),
-                 self._parse_date(item.get('date_sold')), item.get('interpolated'), item.get('set_id'),
-                 item.get('sold_price'))
-                for item in tcgplayer_data
-            ]
-            self.cursor.executemany(queries.BULK_INSERT_TCGPLAYER, data_to_insert)
-            print(f"Inserted {len(data_to_insert)} rows into tcgplayer.")
-
-        # 4. Bulk insert 'transactions' data
-        transactions_data = json_data.get('transactions', [])
-        if transactions_data:
-            data_to_insert = [
-                (item.get('id'), card_id, self._parse_date(item.get('date_sold')), item.get('ebay_handle'),
-                 item.get('ebay_item_id'), item.get('marketplace'), item.get('num_bids'), item.get('psa_grade'),
-                 item.get('set_id'), item.get('sold_price'), item.get('title'))
-                for item in transactions_data
-            ]
-            self.cursor.executemany(queries.BULK_INSERT_TRANSACTIONS, data_to_insert)
-            print(f"Inserted {len(data_to_insert)} rows into transactions.")
+        # 2. Bulk insert 'ebay_avg', 'tcgplayer' and 'transactions' data
+        for key, query in SALES_RECORD_QUERIES.items():
+            records = json_data.get(key, [])
+            if records:
+                data_to_insert = [self._build_row(key, card_id, item) for item in records]
+                self.cursor.executemany(query, data_to_insert)
+                print(f"Inserted {len(data_to_insert)} rows into {key}.")
 
         # Commit all transactions at once
         self.conn.commit()
         print("Successfully added sales data to the database.")
 
         # After committing, update the sales volume for the affected card.
-        if card_id:
+        if update_volume:
             self.update_sales_volume(card_id)
 
-    def update_sales_volume(self, card_id):
+    def add_sales_from_json_file(self, file_path, chunk_size=1000, transactions=None, update_volume=True):
         """
-        Calculates and updates the sales volume for a specific card based on
-        a 30-day window from its most recent sale.
+        Streaming counterpart of `add_sales_from_json` for large cached payloads.
+
+        The file is parsed record by record and rows are written with `executemany`
+        in chunks of `chunk_size`, so peak memory stays flat no matter how many
+        sales the payload holds. The result in the database is identical.
+
+        :param file_path: Path to a cached /api/transactions JSON payload.
+        :param chunk_size: Number of rows buffered per table before they are flushed.
+        :param transactions: Optional list of the page's new transactions (e.g. from the transaction log).
+                             When given, the file's own transactions are skipped and only these are inserted.
+        :param update_volume: Recalculate the card's sales volume afterwards (see `add_sales_from_json`).
         """
-        # 1. Find the most recent sale date for the card
-        max_date_query = "SELECT MAX(date(date_sold)) as max_date FROM transactions WHERE card_id = ?"
-        self.cursor.execute(max_date_query, (card_id,))
-        max_date_row = self.cursor.fetchone()
+        card_id = self._extract_card_id_from_file(file_path)
+        if not card_id:
+            print("Error: Could not determine card_id from the JSON response.")
+            return
 
-        if not max_date_row or not max_date_row['max_date']:
-            return  # No sales found
+        updated_date = None
+        buffers = {key: [] for key in SALES_RECORD_QUERIES}
+        inserted = {key: 0 for key in SALES_RECORD_QUERIES}
 
-        last_sales_date = max_date_row['max_date']
+        def flush(key):
+            if buffers[key]:
+                self.cursor.executemany(SALES_RECORD_QUERIES[key], buffers[key])
+                inserted[key] += len(buffers[key])
+                buffers[key] = []
 
-        # 2. Calculate volumes within the 30-day window leading up to the last sale
-        volume_query = dedent("""
-        SELECT
-            SUM(CASE WHEN psa_grade = 10.0 THEN 1 ELSE 0 END) as psa10_volume,
-            SUM(CASE WHEN psa_grade >= 0.0 AND psa_grade < 10.0 THEN 1 ELSE 0 END) as non_psa10_volume
-        FROM transactions
-        WHERE card_id = ? AND date(date_sold) BETWEEN date(?, '-30 days') AND ?
-                """)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for key, value in iter_json_object_members(f, stream_keys=SALES_RECORD_QUERIES):
+                if key == 'transactions' and transactions is not None:
+                    continue
+                if key in SALES_RECORD_QUERIES:
+                    buffers[key].append(self._build_row(key, card_id, value))
+                    if len(buffers[key]) >= chunk_size:
+                        flush(key)
+                elif key == 'updated_date':
+                    updated_date = value
 
-        self.cursor.execute(volume_query, (card_id, last_sales_date, last_sales_date))
-        volume_data = self.cursor.fetchone()
+        for item in transactions or []:
+            buffers['transactions'].append(self._build_row('transactions', card_id, item))
+            if len(buffers['transactions']) >= chunk_size:
+                flush('transactions')
 
-        psa10_volume = volume_data['psa10_volume'] if volume_data and volume_data['psa10_volume'] is not None else 0
-        non_psa10_volume = volume_data['non_psa10_volume'] if volume_data and volume_data[
-            'non_psa10_volume'] is not None else 0
+        for key in SALES_RECORD_QUERIES:
+            flush(key)
+            if inserted[key]:
+                print(f"Inserted {inserted[key]} rows into {key}.")
 
-        # 3. Upsert the results into the sales_volume table
-        upsert_query = dedent("""
-               INSERT INTO sales_volume (card_id, psa10_volume, non_psa10_volume, last_sales_date, last_calculated)
-               VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-               ON CONFLICT(card_id) DO UPDATE SET
-                   psa10_volume = excluded.psa10_volume,
-                   non_psa10_volume = excluded.non_psa10_volume,
-                   last_sales_date = excluded.last_sales_date,
-                   last_calculated = excluded.last_calculated;
-           """)
-        self.cursor.execute(upsert_query, (card_id, psa10_volume, non_psa10_volume, last_sales_date))
+        self._upsert_card_sales(card_id, updated_date)
+
+        # Commit all transactions at once
+        self.conn.commit()
+        print("Successfully added sales data to the database.")
+
+        if update_volume:
+            self.update_sales_volume(card_id)
+
+    def touch_card_sales(self, card_id, updated_date_str):
+        """
+        Bumps only a card's `card_sales.updated_date`, for a re-fetched payload whose
+        content is unchanged, so no rows are re-inserted and the volume is not recomputed.
+        """
+        self._upsert_card_sales(card_id, updated_date_str)
         self.conn.commit()
-        print(f"Updated sales volume for card_id {card_id}.")
+
+    def has_transactions(self, card_id):
+        """Returns True if any transaction of the card is stored."""
+        self.cursor.execute("SELECT 1 FROM transactions WHERE card_id = ? LIMIT 1", (card_id,))
+        return self.cursor.fetchone() is not None
+
+    def update_sales_volume(self, card_id):
+        """
+        Calculates and updates the sales volume for a specific card based on
+        a 30-day window from its most recent sale.
+        """
+        if self.update_sales_volume_bulk([card_id]):
+            print(f"Updated sales volume for card_id {card_id}.")
+
+    def update_sales_volume_bulk(self, card_ids=None, batch_size=900):
+        """
+        Recalculates 'sales_volume' for every card with transactions (or only the given
+        card IDs) with one grouped statement in one transaction. A window function finds
+        each card's last sale in the same pass that counts the PSA 10 and non-PSA 10
+        sales of the 30 days up to it, so each transaction is read once.
+
+        :param card_ids: Optional card IDs to restrict the recalculation to; None means all cards.
+        :param batch_size: IDs bound per statement, kept under SQLite's host parameter limit.
+        :return: The number of sales_volume rows written.
+        """
+        # date_sold is stored as ISO 8601 text, so it is compared with the window bounds as a
+        # plain string; date() is only applied to the bounds, not to date_sold itself.
+        upsert_query = dedent("""
+            WITH dated_sales AS (
+                SELECT
+                    card_id,
+                    psa_grade,
+                    date_sold,
+                    date(MAX(date_sold) OVER (PARTITION BY card_id)) as last_sales_date
+                FROM transactions
+                WHERE date_sold IS NOT NULL {card_filter}
+            )
+            INSERT INTO sales_volume (card_id, psa10_volume, non_psa10_volume, last_sales_date, last_calculated)
+            SELECT
+                card_id,
+                SUM(CASE WHEN psa_grade = 10.0 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN psa_grade >= 0.0 AND psa_grade < 10.0 THEN 1 ELSE 0 END),
+                last_sales_date,
+                CURRENT_TIMESTAMP
+            FROM dated_sales
+            WHERE date_sold >= date(last_sales_date, '-30 days') AND date_sold < date(last_sales_date, '+1 day')
+            GROUP BY card_id
+            ON CONFLICT(card_id) DO UPDATE SET
+                psa10_volume = excluded.psa10_volume,
+                non_psa10_volume = excluded.non_psa10_volume,
+                last_sales_date = excluded.last_sales_date,
+                last_calculated = excluded.last_calculated;
+        """)
+        # The cursor reports no rowcount for a statement starting with WITH, so count the changes instead.
+        changes_before = self.conn.total_changes
+        try:
+            if card_ids is None:
+                self.cursor.execute(upsert_query.format(card_filter=""))
+            else:
+                card_ids = list(card_ids)
+                for start in range(0, len(card_ids), batch_size):
+                    batch = card_ids[start:start + batch_size]
+                    placeholders = ','.join('?' for _ in batch)
+                    self.cursor.execute(upsert_query.format(card_filter=f"AND card_id IN ({placeholders})"), batch)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return self.conn.total_changes - changes_before
 
     def _extract_card_id(self, json_data):
         """Helper to consistently extract the card_id from the JSON response."""
@@ -128,6 +203,27 @@ class SalesDAO:
             return json_data['tcgplayer'][0].get('card_id')
         return None
 
+    def _extract_card_id_from_file(self, file_path):
+        """Helper to find the card_id in a cached payload by streaming up to the first sale record."""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for key, value in iter_json_object_members(f, stream_keys=SALES_RECORD_QUERIES):
+                if key in ('transactions', 'tcgplayer') and isinstance(value, dict) and value.get('card_id'):
+                    return value['card_id']
+        return None
+
+    def _build_row(self, key, card_id, item):
+        """Helper to turn one sale record from the payload into the tuple for its bulk insert query."""
+        if key == 'ebay_avg':
+            return (card_id, self._parse_date(item.get('date_sold')), item.get('psa_grade'), item.get('sold_price'),
+                    item.get('volume'))
+        if key == 'tcgplayer':
+            return (item.get('id'), card_id, self._parse_date(item.get('created_at')),
+                    self._parse_date(item.get('date_sold')), item.get('interpolated'), item.get('set_id'),
+                    item.get('sold_price'))
+        return (item.get('id'), card_id, self._parse_date(item.get('date_sold')), item.get('ebay_handle'),
+                item.get('ebay_item_id'), item.get('marketplace'), item.get('num_bids'), item.get('psa_grade'),
+                item.get('set_id'), item.get('sold_price'), item.get('title'))
+
     def _upsert_card_sales(self, card_id, updated_date_str):
         """Helper to handle the insert/update logic for the card_sales table."""
         self.cursor.execute(queries.UPSERT_CARD_SALES, (card_id,))
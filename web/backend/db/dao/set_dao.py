@@ -101,12 +101,25 @@ class SetDAO:
         self.conn.commit()
         print("Successfully upserted set data to the database.")
 
-        # Trigger an update for the financial metrics of each affected card.
+        # Recalculate the financial metrics of all affected cards in one pass.
         if self.candidates_dao:
             card_ids = [c[0] for c in card_tuples]
-            for card_id in card_ids:
-                self.candidates_dao.update_grading_financials(card_id)
-            print(f"Triggered financial metric updates for {len(card_ids)} cards.")
+            updated = self.candidates_dao.update_grading_financials_bulk(card_ids)
+            print(f"Updated financial metrics for {updated} of {len(card_ids)} cards.")
+
+    def touch_set(self, set_id, updated_date_str):
+        """
+        Bumps only a set's `updated_date`, for a re-fetched payload whose content is
+        unchanged, so its cards are not re-upserted and their financials not recomputed.
+        """
+        if not updated_date_str:
+            return
+        self.cursor.execute(
+            "UPDATE sets SET updated_date = ? WHERE set_id = ?",
+            (datetime.strptime(updated_date_str, '%Y-%m-%d %H:%M:%S'), set_id)
+        )
+        self.conn.commit()
+        print(f"Set {set_id} is unchanged; only its updated_date was bumped.")
 
     def _upsert_set(self, set_info):
         """Helper to handle the insert/update logic for the sets table."""
@@ -0,0 +1,16 @@
+def create_ingest_checksums_table(cursor):
+    """
+    Creates the 'ingest_checksums' table, holding the content checksum of the last
+    payload each consumer successfully ingested per API call. A re-fetched payload
+    with the same checksum does not need to be ingested again.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS ingest_checksums (
+        consumer TEXT NOT NULL,
+        payload_key TEXT NOT NULL,
+        checksum TEXT NOT NULL,
+        ingested_date DATETIME NOT NULL,
+        PRIMARY KEY (consumer, payload_key)
+    );
+    """)
+    print("Created or verified 'ingest_checksums' table.")
@@ -1,8 +1,10 @@
 import os
 import json
 import sys
+import time
 
-from core_module.utils.file_utils import get_api_response_cache_dir
+from core_module.utils.file_utils import get_api_response_cache_dir, get_cache_file_path, iter_cache_files, \
+    read_serialized_file
 from web.backend.config import CACHE_DIR
 from web.backend.db.dao.candidates_dao import CandidatesDAO
 from web.backend.db.dao.psa_dao import PsaDAO
@@ -27,27 +29,24 @@ def populate_sets(set_dao, cache_directory):
     print(f"Scanning for set price files in: {cache_directory}\n")
 
     prefix_to_find = "get_card_prices_setId="
-    for filename in sorted(os.listdir(cache_directory)):
-        if filename.startswith(prefix_to_find) and filename.endswith('.json'):
-            file_path = os.path.join(cache_directory, filename)
-            print(f"--- Processing file: {filename} ---")
+    for filename, file_path in iter_cache_files(cache_directory, prefix=prefix_to_find):
+        print(f"--- Processing file: {filename} ---")
 
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+        try:
+            data = read_serialized_file(file_path)
 
-                if not data.get('data'):
-                    print(f"  - Warning: Skipping due to missing or empty 'data' key.")
-                    continue
+            if not data.get('data'):
+                print(f"  - Warning: Skipping due to missing or empty 'data' key.")
+                continue
 
-                # Use the injected DAO
-                set_dao.add_set_from_json(data)
-                print(f"  - Successfully processed and added to the database.")
+            # Use the injected DAO
+            set_dao.add_set_from_json(data)
+            print(f"  - Successfully processed and added to the database.")
 
-            except json.JSONDecodeError:
-                print(f"  - Error: Could not decode JSON. The file might be corrupt.")
-            except Exception as e:
-                print(f"  - An unexpected error occurred: {e}")
+        except json.JSONDecodeError:
+            print(f"  - Error: Could not decode JSON. The file might be corrupt.")
+        except Exception as e:
+            print(f"  - An unexpected error occurred: {e}")
 
 
 def populate_set_details(set_dao, cache_directory):
@@ -58,7 +57,7 @@ def populate_set_details(set_dao, cache_directory):
     :param cache_directory: The path to the directory containing the cache file.
     """
     set_details_file = "get_all_sets.json"
-    file_path = os.path.join(cache_directory, set_details_file)
+    file_path = get_cache_file_path(set_details_file, cache_directory)
 
     if not os.path.exists(file_path):
         print(f"Warning: Set details file not found at '{file_path}'. Skipping.")
@@ -67,8 +66,7 @@ def populate_set_details(set_dao, cache_directory):
     print(f"\n--- Processing file: {set_details_file} ---")
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_serialized_file(file_path)
 
         if not data.get('data'):
             print(f"  - Warning: Skipping due to missing or empty 'data' key.")
@@ -89,7 +87,7 @@ def populate_sales_data(sales_dao, cache_directory):
     Scans a given cache directory for sales transaction files and uses a
     provided DAO to populate the database.
 
-    :param sales_dao: A data access object with an `add_sales_from_json` method.
+    :param sales_dao: A data access object with `add_sales_from_json` and `update_sales_volume_bulk` methods.
     :param cache_directory: The path to the directory containing cache files.
     """
     if not os.path.isdir(cache_directory):
@@ -99,23 +97,23 @@ def populate_sales_data(sales_dao, cache_directory):
     print(f"\nScanning for sales transaction files in: {cache_directory}\n")
 
     prefix_to_find = "get_volume_of_transactions_card_id="
-    for filename in sorted(os.listdir(cache_directory)):
-        if filename.startswith(prefix_to_find) and filename.endswith('.json'):
-            file_path = os.path.join(cache_directory, filename)
-            print(f"--- Processing file: {filename} ---")
+    for filename, file_path in iter_cache_files(cache_directory, prefix=prefix_to_find):
+        print(f"--- Processing file: {filename} ---")
+
+        try:
+            data = read_serialized_file(file_path)
 
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            # The sales_dao's add_sales_from_json handles cases with no data internally
+            sales_dao.add_sales_from_json(data, update_volume=False)
+            print(f"  - Successfully processed and added to the database.")
 
-                # The sales_dao's add_sales_from_json handles cases with no data internally
-                sales_dao.add_sales_from_json(data)
-                print(f"  - Successfully processed and added to the database.")
+        except json.JSONDecodeError:
+            print(f"  - Error: Could not decode JSON. The file might be corrupt.")
+        except Exception as e:
+            print(f"  - An unexpected error occurred: {e}")
 
-            except json.JSONDecodeError:
-                print(f"  - Error: Could not decode JSON. The file might be corrupt.")
-            except Exception as e:
-                print(f"  - An unexpected error occurred: {e}")
+    # Sales volumes are recalculated once for all cards instead of after every file.
+    populate_sales_volume_from_db(sales_dao)
 
 def populate_psa_data(psa_dao, cache_directory):
     """
@@ -132,61 +130,44 @@ def populate_psa_data(psa_dao, cache_directory):
     print(f"\nScanning for PSA population files in: {cache_directory}\n")
 
     prefix = "get_card_id_psa_pop_card_id="
-    for filename in sorted(os.listdir(cache_directory)):
-        if filename.startswith(prefix) and filename.endswith('.json'):
-            file_path = os.path.join(cache_directory, filename)
-            print(f"--- Processing file: {filename} ---")
+    for filename, file_path in iter_cache_files(cache_directory, prefix=prefix):
+        print(f"--- Processing file: {filename} ---")
 
-            try:
-                # Extract card_id from filename
-                card_id_str = filename[len(prefix):-len('.json')]
-                card_id = int(card_id_str)
+        try:
+            # Extract card_id from filename
+            card_id_str = filename[len(prefix):-len('.json')]
+            card_id = int(card_id_str)
 
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            data = read_serialized_file(file_path)
 
-                psa_dao.add_psa_population_from_json(card_id, data)
-                print(f"  - Successfully processed and added to the database for card_id {card_id}.")
+            psa_dao.add_psa_population_from_json(card_id, data)
+            print(f"  - Successfully processed and added to the database for card_id {card_id}.")
 
-            except ValueError:
-                print(f"  - Error: Could not parse card_id from filename '{filename}'.")
-            except json.JSONDecodeError:
-                print(f"  - Error: Could not decode JSON. The file might be corrupt.")
-            except Exception as e:
-                print(f"  - An unexpected error occurred: {e}")
+        except ValueError:
+            print(f"  - Error: Could not parse card_id from filename '{filename}'.")
+        except json.JSONDecodeError:
+            print(f"  - Error: Could not decode JSON. The file might be corrupt.")
+        except Exception as e:
+            print(f"  - An unexpected error occurred: {e}")
 
 
 
 def populate_card_analytics_from_db(psa_dao: PsaDAO):
     """
     Backfills the 'card_analytics' table by calculating analytics for all
-    cards that have existing data in the 'psa_population' table.
+    cards that have existing data in the 'psa_population' table, in one
+    set-based statement.
     """
     print("\n--- Backfilling Card Analytics Table ---")
-    cursor = psa_dao.conn.cursor()
-
-    # 1. Get all unique card IDs that have population data
-    cursor.execute("SELECT DISTINCT card_id FROM psa_population")
-    all_card_ids = [row[0] for row in cursor.fetchall()]
+    started_at = time.perf_counter()
+    updated = psa_dao.update_card_analytics_bulk()
 
-    if not all_card_ids:
+    if not updated:
         print("No cards with population data found to analyze.")
         return
 
-    print(f"Found {len(all_card_ids)} cards to analyze. Starting process...")
-
-    # 2. Iterate and update analytics for each card
-    for i, card_id in enumerate(all_card_ids, 1):
-        try:
-            # This method already contains all the logic to calculate and save.
-            # We run it in silent mode to allow for a clean progress indicator.
-            psa_dao.update_card_analytics(card_id, silent=True)
-            print(f"\r({i}/{len(all_card_ids)}) cards processed", end="", flush=True)
-        except Exception as e:
-            # Print a newline to avoid overwriting the progress bar
-            print(f"\n({i}/{len(all_card_ids)}) Failed to process card_id {card_id}: {e}")
-
-    print("\n--- Card Analytics backfill complete. ---")
+    print(f"Updated analytics for {updated} cards in {time.perf_counter() - started_at:.2f}s.")
+    print("--- Card Analytics backfill complete. ---")
 
 
 
@@ -194,61 +175,36 @@ def populate_card_analytics_from_db(psa_dao: PsaDAO):
 def populate_grading_financials_from_db(candidates_dao: CandidatesDAO):
     """
     Backfills the 'grading_financials' table by calculating financial metrics
-    for all cards in the database.
+    for all cards in the database, in one vectorized pass and one transaction.
     """
     print("\n--- Backfilling Grading Financials Table ---")
-    cursor = candidates_dao.conn.cursor()
-
-    # Get all card IDs from the main cards table
-    cursor.execute("SELECT card_id FROM cards")
-    all_card_ids = [row[0] for row in cursor.fetchall()]
+    started_at = time.perf_counter()
+    updated = candidates_dao.update_grading_financials_bulk()
 
-    if not all_card_ids:
-        print("No cards found in the database to analyze.")
+    if not updated:
+        print("No cards with prices and a gem rate found to analyze.")
         return
 
-    print(f"Found {len(all_card_ids)} cards to analyze. Starting financial calculation...")
-
-    # Iterate and update financial metrics for each card
-    for i, card_id in enumerate(all_card_ids, 1):
-        try:
-            candidates_dao.update_grading_financials(card_id)
-            # The print statement is inside the DAO method, so we don't need one here.
-            print(f"\r({i}/{len(all_card_ids)}) cards processed", end="", flush=True)
-        except Exception as e:
-            print(f"\n({i}/{len(all_card_ids)}) Failed to process financials for card_id {card_id}: {e}")
-
-    print("\n--- Grading Financials backfill complete. ---")
+    print(f"Updated financials for {updated} cards in {time.perf_counter() - started_at:.2f}s.")
+    print("--- Grading Financials backfill complete. ---")
 
 
 
 def populate_sales_volume_from_db(sales_dao: SalesDAO):
     """
     Backfills the 'sales_volume' table by calculating sales volumes for all
-    cards that have transaction data.
+    cards that have transaction data, in one grouped window query.
     """
     print("\n--- Backfilling Sales Volume Table ---")
-    cursor = sales_dao.conn.cursor()
+    started_at = time.perf_counter()
+    updated = sales_dao.update_sales_volume_bulk()
 
-    # Get all unique card IDs that have transactions
-    cursor.execute("SELECT DISTINCT card_id FROM transactions")
-    all_card_ids = [row[0] for row in cursor.fetchall()]
-
-    if not all_card_ids:
+    if not updated:
         print("No cards with transaction data found to analyze.")
         return
 
-    print(f"Found {len(all_card_ids)} cards to analyze. Starting sales volume calculation...")
-
-    # Iterate and update sales volume for each card
-    for i, card_id in enumerate(all_card_ids, 1):
-        try:
-            sales_dao.update_sales_volume(card_id)
-            print(f"\r({i}/{len(all_card_ids)}) cards processed", end="", flush=True)
-        except Exception as e:
-            print(f"\n({i}/{len(all_card_ids)}) Failed to process sales volume for card_id {card_id}: {e}")
-
-    print("\n--- Sales Volume backfill complete. ---")
+    print(f"Updated sales volume for {updated} cards in {time.perf_counter() - started_at:.2f}s.")
+    print("--- Sales Volume backfill complete. ---")
 
 
 """
@@ -0,0 +1,131 @@
+import unittest
+
+import requests
+
+from core_module.service import api
+from core_module.service.proxy_pool import ProxyPool, ProxyRoute
+from core_module.service.rate_limiter import AdaptiveRateLimiter
+from core_module.service.retry_policy import RetryBudget, RetryPolicy, RetryStats
+
+
+class FakeResponse:
+    """The parts of `requests.Response` that make_get_request reads."""
+
+    def __init__(self, status_code, url):
+        self.status_code = status_code
+        self.headers = {}
+        self.reason = "Fake"
+        self.text = ""
+        self.content = b"{}"
+        self.request = type("FakeRequest", (), {"url": url})()
+
+    def json(self):
+        return {"status": self.status_code}
+
+    def close(self):
+        pass
+
+
+class StubHttpClient:
+    """Answers each GET with the next scripted status code, or raises it if it is an exception."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.routes = []
+
+    def get(self, url, headers=None, params=None, route=None, proxies=None, stream=False):
+        self.routes.append(route)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome, url)
+
+
+class FixedBackoffPolicy(RetryPolicy):
+    """A retry policy whose backoff is always one second, so deadlines and budgets are predictable."""
+
+    def backoff(self, retry_number):
+        return 1.0
+
+
+class TestMakeGetRequestRetries(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Swap the module's client, pool, limiter and retry state for stubs, and record sleeps instead of waiting.
+        """
+        names = ("_http_client", "_proxy_pool", "_rate_limiter", "_retry_policy", "_retry_budget", "_retry_stats",
+                 "sleep")
+        saved = {name: getattr(api, name) for name in names}
+        self.addCleanup(lambda: [setattr(api, name, value) for name, value in saved.items()])
+
+        self.sleeps = []
+        api.sleep = self.sleeps.append
+        api._proxy_pool = ProxyPool([ProxyRoute('direct'), ProxyRoute('proxy-a', {'https': 'https://proxy-a'})])
+        api._rate_limiter = AdaptiveRateLimiter(initial_rate=1, burst=100, sleep=self.sleeps.append)
+        api._retry_policy = FixedBackoffPolicy(max_status_retries=3, max_connection_retries=3, call_deadline=60)
+        api._retry_budget = RetryBudget(60)
+        api._retry_stats = RetryStats()
+
+    def request(self, *outcomes):
+        api._http_client = StubHttpClient(outcomes)
+        return api.make_get_request('/v0/sets')
+
+    def stats(self):
+        return api.get_retry_stats()['/v0/sets']
+
+    def test_retryable_status_moves_to_another_route(self):
+        """
+        A 429 on the direct route is retried on the proxy, after one backoff.
+        """
+        self.assertEqual(self.request(429, 200), {"status": 200})
+        self.assertEqual(api._http_client.routes, ['direct', 'proxy-a'])
+        self.assertEqual(self.sleeps, [1.0])
+        self.assertEqual(self.stats()['status_retries'], 1)
+
+    def test_connection_errors_are_retried(self):
+        """
+        Network errors are retried on whichever route the pool picks, here still the direct one.
+        """
+        error = requests.exceptions.ConnectionError("reset")
+
+        self.assertEqual(self.request(error, error, 200), {"status": 200})
+        self.assertEqual(api._http_client.routes, ['direct', 'direct', 'direct'])
+        self.assertEqual(self.stats()['connection_retries'], 2)
+
+        self.assertIsNone(self.request(error, error, error, error))
+        self.assertEqual(self.stats()['gave_up'], 1)
+
+    def test_gives_up_at_the_call_deadline(self):
+        """
+        A retry whose backoff would run past the call deadline is not attempted.
+        """
+        api._retry_policy = FixedBackoffPolicy(call_deadline=0.5)
+
+        self.assertIsNone(self.request(503, 200))
+        self.assertEqual(len(api._http_client.routes), 1)
+        self.assertEqual(self.sleeps, [])
+        self.assertEqual(self.stats()['gave_up'], 1)
+
+    def test_gives_up_when_the_retry_budget_is_spent(self):
+        """
+        Once the cycle's retry budget cannot cover the next backoff, the call gives up.
+        """
+        api._retry_budget = RetryBudget(1.5)
+
+        self.assertIsNone(self.request(500, 500, 500, 200))
+        self.assertEqual(len(api._http_client.routes), 2)
+        self.assertEqual(self.sleeps, [1.0])
+        self.assertEqual(api._retry_budget.remaining(), 0.5)
+
+    def test_non_retryable_status_fails_fast(self):
+        """
+        A 404 returns None straight away, without a retry or a give-up.
+        """
+        self.assertIsNone(self.request(404, 200))
+        self.assertEqual(len(api._http_client.routes), 1)
+        self.assertEqual(self.stats(), {'calls': 1, 'status_retries': 0, 'connection_retries': 0, 'gave_up': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
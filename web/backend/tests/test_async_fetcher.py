@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+
+from core_module.service.async_fetcher import AsyncFetchEngine
+
+
+class TestAsyncFetchEngine(unittest.TestCase):
+
+    def test_results_arrive_in_completion_order(self):
+        """
+        A slow ID does not hold back the ones that finish before it.
+        """
+        fast_delivered = threading.Event()
+
+        def fetch(item_id):
+            if item_id == 1:
+                fast_delivered.wait(timeout=5)
+                return 'slow'
+            return 'fast'
+
+        results = []
+
+        def on_result(item_id, data):
+            results.append((item_id, data))
+            fast_delivered.set()
+
+        AsyncFetchEngine(fetch, max_concurrency=2).run([1, 2], on_result)
+
+        self.assertEqual(results, [(2, 'fast'), (1, 'slow')])
+
+    def test_concurrency_is_bounded(self):
+        """
+        Exactly max_concurrency fetches run at the same time, never more.
+        """
+        barrier = threading.Barrier(3, timeout=5)
+        lock = threading.Lock()
+        active = [0, 0]  # current, peak
+
+        def fetch(item_id):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            barrier.wait()  # Breaks (and raises) unless three fetches are in flight together.
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return item_id
+
+        results = {}
+        AsyncFetchEngine(fetch, max_concurrency=3).run(range(9), results.__setitem__)
+
+        self.assertEqual(results, {item_id: item_id for item_id in range(9)})
+        self.assertEqual(active[1], 3)
+
+    def test_a_failing_id_does_not_stop_the_batch(self):
+        """
+        An ID whose fetch raises comes back as None and the others still arrive.
+        """
+        def fetch(item_id):
+            if item_id == 2:
+                raise ValueError("bad id")
+            return item_id * 10
+
+        results = {}
+        AsyncFetchEngine(fetch, max_concurrency=2).run([1, 2, 3], results.__setitem__)
+
+        self.assertEqual(results, {1: 10, 2: None, 3: 30})
+
+    def test_early_exit_does_not_wait_for_running_fetches(self):
+        """
+        When the callback raises, run returns without waiting on fetches that are still blocked.
+        """
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def fetch(item_id):
+            if item_id:
+                release.wait(timeout=5)
+            return item_id
+
+        def on_result(item_id, data):
+            raise RuntimeError("stop")
+
+        started_at = time.monotonic()
+        with self.assertRaises(RuntimeError):
+            AsyncFetchEngine(fetch, max_concurrency=2).run([0, 1, 2, 3], on_result)
+        self.assertLess(time.monotonic() - started_at, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
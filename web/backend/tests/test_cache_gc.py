@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from core_module.service.cache_gc import CacheGarbageCollector
+from core_module.service.cache_manifest import BUILT_META_KEY, CacheManifest
+
+
+class TestCacheGarbageCollector(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a cache directory with four indexed files of 100 bytes each.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'api_responses')
+        os.makedirs(self.cache_dir)
+        self.manifest = CacheManifest(os.path.join(self.temp_dir, 'manifest.sqlite3'))
+        self.removed = []
+        for name, updated_date in [
+            ('get_card_prices_setId=1.json', '2025-01-01 00:00:00'),
+            ('get_card_prices_setId=2.json', '2025-08-20 00:00:00'),
+            ('get_volume_of_transactions_card_id=3.json', '2025-08-01 00:00:00'),
+            ('get_card_id_psa_pop_card_id=4.json', '2025-08-25 00:00:00'),
+        ]:
+            with open(os.path.join(self.cache_dir, name), 'w') as f:
+                f.write('x' * 100)
+            self.manifest.record(name, {'updated_date': updated_date, 'data': [1]}, 100)
+        # The rows above stand for a complete index of the directory.
+        self.manifest.set_meta(BUILT_META_KEY, 1)
+
+    def tearDown(self):
+        self.manifest.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _collector(self, max_total_bytes=0):
+        return CacheGarbageCollector(self.manifest, self.cache_dir, max_age_days=60, max_total_bytes=max_total_bytes,
+                                     endpoint_retention_days={'get_volume_of_transactions_card_id': 20},
+                                     on_remove=self.removed.append)
+
+    def test_age_and_per_endpoint_retention(self):
+        """
+        Files past their endpoint's retention are removed from disk and from the manifest.
+        """
+        report = self._collector().collect(now=datetime(2025, 9, 1))
+
+        self.assertEqual(sorted(self.removed), ['get_card_prices_setId=1.json',
+                                                'get_volume_of_transactions_card_id=3.json'])
+        self.assertEqual(report['bytes_reclaimed'], 200)
+        self.assertEqual(report['by_reason'], {'age': 2})
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ['get_card_id_psa_pop_card_id=4.json',
+                                                              'get_card_prices_setId=2.json'])
+        self.assertEqual(self.manifest.count(), 2)
+
+    def test_size_budget_removes_oldest_first(self):
+        """
+        After the age policy, the oldest remaining files go until the cache fits its size budget.
+        """
+        report = self._collector(max_total_bytes=100).collect(now=datetime(2025, 9, 1))
+
+        self.assertEqual(report['by_reason'], {'age': 2, 'size': 1})
+        self.assertEqual(os.listdir(self.cache_dir), ['get_card_id_psa_pop_card_id=4.json'])
+
+    def test_dry_run_changes_nothing(self):
+        report = self._collector().collect(now=datetime(2025, 9, 1), dry_run=True)
+
+        self.assertEqual(report['files_removed'], 2)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 4)
+        self.assertEqual(self.manifest.count(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
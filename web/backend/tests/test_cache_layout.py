@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from core_module.utils.file_utils import get_cache_file_path, get_cache_shard, iter_cache_files
+from core_module.utils.migrate_cache_layout import migrate_cache_layout
+
+FILE_NAMES = ['get_all_sets.json', 'get_card_prices_setId=557.json',
+              'get_volume_of_transactions_card_id=41324.json', 'get_volume_of_transactions_card_id=41324_page=1.json']
+
+
+class TestCacheLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for name in FILE_NAMES:
+            with open(os.path.join(self.temp_dir, name), 'w') as f:
+                f.write('{"data": []}')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_sharded_path_groups_pages_of_one_id(self):
+        endpoint, shard = get_cache_shard('get_volume_of_transactions_card_id=41324_page=1.json')
+        self.assertEqual(endpoint, 'get_volume_of_transactions_card_id')
+        self.assertEqual(len(shard), 2)
+        self.assertEqual(get_cache_shard('get_volume_of_transactions_card_id=41324.json'), (endpoint, shard))
+        self.assertEqual(get_cache_file_path('get_card_prices_setId=557.json', self.temp_dir, 'flat'),
+                         os.path.join(self.temp_dir, 'get_card_prices_setId=557.json'))
+
+    def test_migration_round_trip(self):
+        self.assertEqual(migrate_cache_layout('sharded', self.temp_dir), 4)
+        self.assertEqual(sorted(name for name in os.listdir(self.temp_dir)),
+                         ['get_all_sets', 'get_card_prices_setId', 'get_volume_of_transactions_card_id'])
+        for name in FILE_NAMES:
+            self.assertTrue(os.path.isfile(get_cache_file_path(name, self.temp_dir, 'sharded')))
+
+        # The walk finds sharded files, and prefixes skip other endpoints.
+        self.assertEqual(sorted(name for name, _ in iter_cache_files(self.temp_dir)), sorted(FILE_NAMES))
+        self.assertEqual([name for name, _ in iter_cache_files(self.temp_dir, prefix='get_card_prices_setId=')],
+                         ['get_card_prices_setId=557.json'])
+
+        # Re-running is a no-op, and flattening restores the original directory.
+        self.assertEqual(migrate_cache_layout('sharded', self.temp_dir), 0)
+        self.assertEqual(migrate_cache_layout('flat', self.temp_dir), 4)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), sorted(FILE_NAMES))
+
+    def test_unknown_layout_is_rejected(self):
+        with self.assertRaises(ValueError):
+            migrate_cache_layout('nested', self.temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
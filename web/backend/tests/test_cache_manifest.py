@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from core_module.service.cache_manifest import CacheManifest, payload_checksum
+
+
+class TestCacheManifest(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a manifest and an empty cache directory in a temporary location.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'api_responses')
+        os.makedirs(self.cache_dir)
+        self.manifest = CacheManifest(os.path.join(self.temp_dir, 'manifest.sqlite3'))
+
+    def tearDown(self):
+        self.manifest.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, file_name, content):
+        with open(os.path.join(self.cache_dir, file_name), 'w', encoding='utf-8') as f:
+            f.write(content if isinstance(content, str) else json.dumps(content))
+
+    def test_find_stale_by_endpoint_and_age(self):
+        """
+        Old, empty and dateless entries of the requested endpoint are reported; fresh ones and other endpoints are not.
+        """
+        self.manifest.record('get_card_prices_setId=1.json', {'updated_date': '2025-01-01 00:00:00', 'data': [1]}, 10)
+        self.manifest.record('get_card_prices_setId=2.json', {'updated_date': '2025-09-01 00:00:00', 'data': [1]}, 10)
+        self.manifest.record('get_card_prices_setId=3.json', {'updated_date': '2025-09-01 00:00:00', 'data': None}, 10)
+        self.manifest.record('get_card_prices_setId=4.json', {'data': [1]}, 10)
+        self.manifest.record('get_card_id_psa_pop_card_id=5.json', {'updated_date': '2025-01-01 00:00:00'}, 10)
+
+        stale = self.manifest.find_stale('get_card_prices_setId', older_than=datetime(2025, 8, 30))
+
+        self.assertEqual(stale, [
+            ('get_card_prices_setId=1.json', '1', 'Stale date: 2025-01-01'),
+            ('get_card_prices_setId=3.json', '3', 'Empty data'),
+            ('get_card_prices_setId=4.json', '4', "Missing 'updated_date' key"),
+        ])
+
+    def test_rebuild_indexes_the_directory(self):
+        """
+        A rebuild records every file, flags unparsable ones, and keeps checksums independent of updated_date.
+        """
+        self._write('get_card_prices_setId=1.json', {'updated_date': '2025-09-01 00:00:00', 'data': [1, 2]})
+        self._write('get_card_prices_setId=2.json', '{broken')
+
+        self.assertEqual(self.manifest.rebuild(self.cache_dir), 2)
+
+        entry = self.manifest.get('get_card_prices_setId=1.json')
+        self.assertEqual(entry['checksum'], payload_checksum({'data': [1, 2]}))
+        self.assertEqual(entry['size'], os.path.getsize(os.path.join(self.cache_dir, 'get_card_prices_setId=1.json')))
+        self.assertEqual(self.manifest.find_stale(), [('get_card_prices_setId=2.json', '2', 'Invalid JSON')])
+
+    def test_ensure_built_indexes_files_saved_before_the_manifest(self):
+        """
+        A manifest holding only rows from saves since the upgrade is still rebuilt once from
+        the directory, and not again after that.
+        """
+        self._write('get_card_prices_setId=1.json', {'updated_date': '2025-01-01 00:00:00', 'data': [1]})
+        self._write('get_card_prices_setId=2.json', {'updated_date': '2025-09-01 00:00:00', 'data': [1]})
+        self.manifest.record('get_card_prices_setId=2.json', {'updated_date': '2025-09-01 00:00:00', 'data': [1]}, 10)
+
+        self.manifest.ensure_built(self.cache_dir)
+        self.assertEqual(self.manifest.count(), 2)
+
+        self._write('get_card_prices_setId=3.json', {'updated_date': '2025-09-01 00:00:00', 'data': [1]})
+        self.manifest.ensure_built(self.cache_dir)
+        self.assertEqual(self.manifest.count(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
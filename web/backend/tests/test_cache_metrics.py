@@ -0,0 +1,46 @@
+import unittest
+
+from core_module.service.cache_metrics import CacheMetrics, LatencyHistogram
+
+
+class TestCacheMetrics(unittest.TestCase):
+
+    def test_counters_are_kept_per_endpoint(self):
+        metrics = CacheMetrics()
+        metrics.record_hit('get_card_prices')
+        metrics.record_hit('get_card_prices')
+        metrics.record_negative_hit('get_card_prices')
+        metrics.record_miss('get_card_prices')
+        metrics.record_network('get_card_prices', 0.2, payload_bytes=2048)
+        metrics.record_write('get_card_prices', 0.003)
+        metrics.record_bypass('get_card_id_psa_pop')
+        metrics.record_network('get_card_id_psa_pop', 1.5, failed=True)
+
+        snapshot = metrics.snapshot()
+        prices = snapshot['get_card_prices']
+        self.assertEqual((prices['hits'], prices['misses'], prices['negative_hits']), (2, 1, 1))
+        self.assertEqual(prices['served_from_cache'], 0.75)
+        self.assertEqual(prices['payload_bytes'], 2048)
+        self.assertEqual(prices['network_latency']['buckets'], {'<=250ms': 1})
+        self.assertEqual(prices['write_time']['count'], 1)
+
+        pops = snapshot['get_card_id_psa_pop']
+        self.assertEqual((pops['bypasses'], pops['network_failures'], pops['served_from_cache']), (1, 1, 0.0))
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_histogram_percentiles_use_bucket_bounds(self):
+        histogram = LatencyHistogram(bounds_ms=(10, 100))
+        for seconds in (0.001, 0.002, 0.05, 0.5):
+            histogram.observe(seconds)
+
+        self.assertEqual(histogram.percentile(0.5), 10.0)
+        self.assertEqual(histogram.percentile(0.75), 100.0)
+        # Observations past the last bound report the maximum seen.
+        self.assertEqual(histogram.percentile(1.0), 500.0)
+        self.assertEqual(histogram.snapshot()['buckets'], {'<=10ms': 2, '<=100ms': 1, '>100ms': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import sqlite3
+import unittest
+
+from core_module.service.change_tracker import ChangeTracker
+from web.backend.db.dao.ingest_checksum_dao import IngestChecksumDAO
+from web.backend.db.database_setup import setup_schema
+
+
+class TestChangeTracker(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a tracker and an in-memory database holding the ingest checksums.
+        """
+        self.tracker = ChangeTracker()
+        self.conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+        setup_schema(self.conn)
+        self.ingest_checksum_dao = IngestChecksumDAO(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_unchanged_only_against_a_successful_ingest(self):
+        """
+        A fetched payload counts as unchanged only once its checksum was stored after an ingest.
+        """
+        self.tracker.record('get_card_id_psa_pop', '17', 'abc')
+
+        # Cached (or fetched) but never ingested: it must be ingested in full.
+        stored = self.ingest_checksum_dao.get_checksum('psa_population', 17)
+        self.assertIsNone(stored)
+        self.assertFalse(self.tracker.is_unchanged('get_card_id_psa_pop', '17', stored))
+
+        self.ingest_checksum_dao.save_checksum('psa_population', 17, 'abc')
+        stored = self.ingest_checksum_dao.get_checksum('psa_population', 17)
+        self.assertTrue(self.tracker.is_unchanged('get_card_id_psa_pop', '17', stored))
+        # Each consumer keeps its own checksum.
+        self.assertIsNone(self.ingest_checksum_dao.get_checksum('sets', 17))
+
+        self.tracker.record('get_card_id_psa_pop', '17', 'def')
+        self.assertFalse(self.tracker.is_unchanged('get_card_id_psa_pop', '17', stored))
+        self.assertEqual(self.tracker.get_stats()['get_card_id_psa_pop'],
+                         {'fetched': 2, 'unchanged': 1, 'skip_ratio': 0.5})
+
+    def test_reset_forgets_the_previous_cycle(self):
+        """
+        After a reset, checksums fetched in the previous cycle no longer make a payload unchanged.
+        """
+        self.tracker.record('get_card_prices_of_set', '557', 'abc')
+        self.tracker.reset()
+
+        self.assertIsNone(self.tracker.get_checksum('get_card_prices_of_set', '557'))
+        self.assertFalse(self.tracker.is_unchanged('get_card_prices_of_set', '557', 'abc'))
+        self.assertEqual(self.tracker.get_stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import unittest
+
+import requests
+
+from core_module.service.fake_pokedata_server import FakePokedataServer
+
+
+class TestFakePokedataServer(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Start a fake server on a free port that replays the test resources.
+        """
+        test_dir = os.path.dirname(__file__)
+        self.server = FakePokedataServer(response_dirs=[os.path.join(test_dir, 'resources')], port=0)
+        self.base_url = self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_replays_recorded_transactions(self):
+        """
+        The recorded transactions for a card are served without the cache's updated_date.
+        """
+        response = requests.get(f"{self.base_url}/api/transactions", params={"card_id": 41324, "page": 0})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertNotIn('updated_date', data)
+        self.assertEqual(len(data['transactions']), 7)
+
+    def test_fallback_rewrites_card_id_and_ends_pagination(self):
+        """
+        An unrecorded card gets another card's recording under its own ID, and later pages are empty.
+        """
+        first = requests.get(f"{self.base_url}/api/transactions", params={"card_id": 999, "page": 0}).json()
+        second = requests.get(f"{self.base_url}/api/transactions", params={"card_id": 999, "page": 1}).json()
+
+        self.assertTrue(first['transactions'])
+        self.assertTrue(all(item['card_id'] == 999 for item in first['transactions']))
+        self.assertEqual(second['transactions'], [])
+
+    def test_injects_throttling(self):
+        """
+        A throttle rate of 1 answers every request with 429 and a Retry-After header.
+        """
+        self.server.throttle_rate = 1.0
+
+        response = requests.get(f"{self.base_url}/v0/sets")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers.get('Retry-After'), '1')
+        self.assertEqual(self.server.get_stats(), {'/v0/sets': {'429': 1}})
+
+
+if __name__ == '__main__':
+    unittest.main()
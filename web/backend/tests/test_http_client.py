@@ -0,0 +1,50 @@
+import os
+import unittest
+
+from core_module.service.fake_pokedata_server import FakePokedataServer
+from core_module.service.http_client import DIRECT_ROUTE, HttpClient
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Start a keep-alive fake server on a free port and a fresh client.
+        """
+        test_dir = os.path.dirname(__file__)
+        self.server = FakePokedataServer(response_dirs=[os.path.join(test_dir, 'resources')], port=0)
+        self.base_url = self.server.start()
+        self.client = HttpClient()
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_sessions_are_kept_per_route(self):
+        """
+        Requests on the same route share one session, and each route gets its own.
+        """
+        self.client.get(f"{self.base_url}/v0/sets").close()
+        direct = self.client._get_session(DIRECT_ROUTE, None)
+        self.client.get(f"{self.base_url}/v0/sets").close()
+
+        self.assertIs(self.client._get_session(DIRECT_ROUTE, None), direct)
+        self.assertIsNot(self.client._get_session('proxy-a', None), direct)
+
+    def test_stats_count_reused_connections(self):
+        """
+        Only the first request on a route opens a connection; the following ones reuse it.
+        """
+        for _ in range(3):
+            self.assertEqual(self.client.get(f"{self.base_url}/v0/sets").status_code, 200)
+        self.client.get(f"{self.base_url}/v0/sets", route='proxy-a')
+
+        stats = self.client.get_stats()
+        self.assertEqual(stats[DIRECT_ROUTE], {'requests': 3, 'new_connections': 1,
+                                               'reused_connections': 2, 'reuse_rate': 2 / 3})
+        self.assertEqual(stats['proxy-a']['new_connections'], 1)
+        self.assertEqual(stats['proxy-a']['reused_connections'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
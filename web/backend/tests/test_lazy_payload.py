@@ -0,0 +1,50 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from core_module.card_data_utils.calculate_volume import calculate_volumes_last_month
+from core_module.utils.file_utils import save_object_to_file
+from core_module.utils.lazy_payload import LazyPayload
+
+
+class TestLazyPayload(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        self.json_path = os.path.join(test_dir, 'resources', 'test_get_volume_of_transactions_card_id=41324.json')
+        with open(self.json_path, 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+
+    def test_records_and_members_match_a_full_load(self):
+        """
+        Records parsed on demand, with or without field projection, match the fully loaded payload.
+        """
+        with LazyPayload(self.json_path) as payload:
+            self.assertEqual(payload.get('updated_date'), self.data['updated_date'])
+            self.assertEqual(list(payload.iter_records('tcgplayer')), self.data['tcgplayer'])
+            self.assertEqual(next(payload.iter_records('transactions', fields=('id', 'psa_grade'))),
+                             {'id': self.data['transactions'][0]['id'],
+                              'psa_grade': self.data['transactions'][0]['psa_grade']})
+            self.assertEqual(payload.count('ebay_avg'), len(self.data['ebay_avg']))
+            self.assertEqual(payload.record('transactions', 4), self.data['transactions'][4])
+            self.assertEqual(list(payload.iter_records('missing')), [])
+
+            self.assertEqual(calculate_volumes_last_month(payload), calculate_volumes_last_month(self.data))
+
+    def test_other_cache_formats_are_wrapped(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            try:
+                save_object_to_file(self.data, 'payload.json', temp_dir, file_format='msgpack_zlib')
+            except ValueError:
+                self.skipTest('msgpack is not installed')
+            with LazyPayload(os.path.join(temp_dir, 'payload.json')) as payload:
+                self.assertEqual(list(payload.iter_records('transactions')), self.data['transactions'])
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from core_module.service.memory_cache import MemoryCache
+
+
+class TestMemoryCache(unittest.TestCase):
+
+    def test_least_recently_used_entries_are_evicted_first(self):
+        """
+        Going over the entry or byte limit evicts the least recently used keys.
+        """
+        cache = MemoryCache(max_entries=2, max_bytes=100, default_ttl=60, endpoint_ttls={})
+        cache.put('a', {'v': 1}, size=10, now=0)
+        cache.put('b', {'v': 2}, size=10, now=0)
+        cache.get('a', now=1)
+        cache.put('c', {'v': 3}, size=10, now=1)
+
+        self.assertIsNone(cache.get('b', now=2))
+        self.assertEqual(cache.get('a', now=2), {'v': 1})
+
+        cache.put('d', {'v': 4}, size=95, now=3)
+        self.assertIsNone(cache.get('a', now=3))
+        self.assertIsNone(cache.get('c', now=3))
+        self.assertEqual(cache.get_stats()['evictions'], 3)
+
+    def test_entries_expire_with_their_endpoint_ttl(self):
+        """
+        Each endpoint has its own TTL; expired entries count as misses.
+        """
+        cache = MemoryCache(max_entries=10, max_bytes=1000, default_ttl=10,
+                            endpoint_ttls={'get_card_id_psa_pop_card_id': 100})
+        cache.put('get_card_id_psa_pop_card_id=1.json', {'v': 1}, endpoint='get_card_id_psa_pop_card_id', now=0)
+        cache.put('get_card_prices_setId=1.json', {'v': 2}, endpoint='get_card_prices_setId', now=0)
+
+        self.assertIsNone(cache.get('get_card_prices_setId=1.json', now=10))
+        self.assertEqual(cache.get('get_card_id_psa_pop_card_id=1.json', now=10), {'v': 1})
+
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['expirations']), (1, 1, 1))
+
+    def test_returned_dicts_do_not_change_the_cached_copy(self):
+        cache = MemoryCache(max_entries=10, max_bytes=1000, default_ttl=60, endpoint_ttls={})
+        cache.put('a', {'v': 1}, now=0)
+
+        cache.get('a', now=1)['updated_date'] = 'changed'
+
+        self.assertEqual(cache.get('a', now=2), {'v': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
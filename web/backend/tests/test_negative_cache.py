@@ -0,0 +1,129 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from core_module.service import api, domain
+from core_module.service.cache_manifest import CacheManifest
+from core_module.service.negative_cache import NegativeCache
+from core_module.utils.file_utils import get_repo_root
+from web.backend.db.dao.sales_volume_refresh_log_dao import SalesVolumeRefreshLogDAO
+from web.backend.db.database_setup import setup_schema
+from web.backend.update_service import UpdateService
+
+
+class TestNegativeCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a negative cache persisted to a temporary directory, with a 1 hour base TTL.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'negative_cache.sqlite3')
+        self.cache = NegativeCache(self.db_path, base_ttl=3600, max_ttl=4 * 3600)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_recheck_spacing_doubles_up_to_the_max(self):
+        """
+        Each consecutive empty answer doubles the wait before the next check, capped at max_ttl.
+        """
+        self.cache.record_empty('get_card_id_psa_pop', 17, now=0)
+        self.assertTrue(self.cache.is_known_empty('get_card_id_psa_pop', 17, now=3599))
+        self.assertFalse(self.cache.is_known_empty('get_card_id_psa_pop', 17, now=3600))
+
+        self.cache.record_empty('get_card_id_psa_pop', 17, now=3600)
+        self.assertTrue(self.cache.is_known_empty('get_card_id_psa_pop', 17, now=3600 + 7199))
+        self.assertFalse(self.cache.is_known_empty('get_card_id_psa_pop', 17, now=3600 + 7200))
+
+        self.assertEqual(self.cache.ttl_for(10), 4 * 3600)
+
+    def test_found_ids_are_forgotten_and_state_persists(self):
+        """
+        Filtering drops known-empty IDs, data clears an entry, and entries survive a reload.
+        """
+        self.cache.record_empty('get_card_id_psa_pop', 17)
+        self.cache.record_empty('get_card_id_psa_pop', 19)
+        self.cache.record_found('get_card_id_psa_pop', 19)
+
+        reloaded = NegativeCache(self.db_path, base_ttl=3600)
+        self.addCleanup(reloaded.close)
+        self.assertEqual(reloaded.filter_ids('get_card_id_psa_pop', [17, 19, 20]), [19, 20])
+        self.assertEqual(reloaded.get_stats(), {'known_empty': {'get_card_id_psa_pop': 1}, 'skipped': 1})
+
+    def test_empty_answer_drops_the_previous_cached_answer(self):
+        """
+        A call that used to return data and now comes back empty is not served from its old cache entry.
+        """
+        cache_dir = os.path.join(get_repo_root(), 'cache')
+        cache_existed = os.path.isdir(cache_dir)
+        saved_negative_cache, saved_manifest = domain._negative_cache, domain._cache_manifest
+        domain._negative_cache = self.cache
+        domain._cache_manifest = CacheManifest(os.path.join(self.temp_dir.name, 'manifest.sqlite3'))
+        responses = [[{'grade': '10', 'count': 3}], []]
+        file_name = 'get_card_id_psa_pop_card_id=8803.json'
+        try:
+            def get_card_id_psa_pop(card_id):
+                return responses.pop(0)
+
+            domain._fetch_and_save(get_card_id_psa_pop, (8803,), file_name)
+            self.assertIsNotNone(domain.get_cache(file_name))
+
+            self.assertEqual(domain._fetch_and_save(get_card_id_psa_pop, (8803,), file_name), {'data': None})
+            self.assertIsNone(domain.get_cache(file_name))
+            self.assertTrue(self.cache.is_known_empty('get_card_id_psa_pop', 8803))
+        finally:
+            domain.delete_cache_file(file_name)
+            domain._cache_manifest.close()
+            domain._negative_cache, domain._cache_manifest = saved_negative_cache, saved_manifest
+            if not cache_existed:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def test_streamed_empty_first_page_skips_the_card(self):
+        """
+        A card whose streamed first page is empty is recorded under its card ID, so the update
+        cycle's known-empty filter skips it. Empty later pages just end pagination and are not recorded.
+        """
+        cache_dir = os.path.join(get_repo_root(), 'cache')
+        cache_existed = os.path.isdir(cache_dir)
+        saved_negative_cache, saved_manifest = domain._negative_cache, domain._cache_manifest
+        saved_api_function = api.get_volume_of_transactions
+        domain._negative_cache = self.cache
+        domain._cache_manifest = CacheManifest(os.path.join(self.temp_dir.name, 'manifest.sqlite3'))
+        conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+        try:
+            def get_volume_of_transactions(card_id, page=0, stream_to=None):
+                with open(stream_to, 'w', encoding='utf-8') as f:
+                    json.dump({'ebay_avg': [], 'page': page, 'tcgplayer': [], 'transactions': []}, f)
+                return stream_to
+
+            api.get_volume_of_transactions = get_volume_of_transactions
+            for card_id, page in [(8801, 0), (8802, 1)]:
+                self.assertIsNotNone(domain.download_volume_of_transactions(card_id, page))
+
+            setup_schema(conn)
+            service = UpdateService(None, None, None, None, SalesVolumeRefreshLogDAO(conn), None, None, None)
+            remaining = service._skip_known_empty(api.get_volume_of_transactions, [8801, 8802],
+                                                  service.sales_volume_refresh_log_dao)
+
+            self.assertEqual(remaining, [8802])
+            self.assertEqual(conn.execute("SELECT card_id FROM sales_volume_refresh_log").fetchall(), [(8801,)])
+        finally:
+            conn.close()
+            domain._cache_manifest.close()
+            domain._negative_cache, domain._cache_manifest = saved_negative_cache, saved_manifest
+            api.get_volume_of_transactions = saved_api_function
+            for card_id, page in [(8801, 0), (8802, 1)]:
+                path = domain.get_cache_file_path(domain.get_transactions_page_cache_file_name(card_id, page))
+                if os.path.exists(path):
+                    os.remove(path)
+            if not cache_existed:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
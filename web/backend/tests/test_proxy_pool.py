@@ -0,0 +1,105 @@
+import unittest
+
+from core_module.service.proxy_pool import CircuitBreaker, ProxyPool, ProxyRoute
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a breaker that trips after 3 failures and cools down for 300 seconds.
+        """
+        self.breaker = CircuitBreaker(failure_threshold=3, cool_down_seconds=300)
+
+    def test_opens_at_the_failure_threshold(self):
+        """
+        The breaker stays closed below the threshold and opens when it is reached.
+        """
+        self.breaker.record_failure(now=0)
+        self.breaker.record_failure(now=1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request(now=1))
+
+        self.breaker.record_failure(now=2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.trips, 1)
+        self.assertFalse(self.breaker.allow_request(now=301))
+        self.assertEqual(self.breaker.seconds_until_probe(now=2), 300)
+
+    def test_half_open_allows_one_probe(self):
+        """
+        After the cool-down one probe goes through; a failed probe re-opens, a good one closes.
+        """
+        for now in range(3):
+            self.breaker.record_failure(now)
+
+        self.assertTrue(self.breaker.allow_request(now=302))
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow_request(now=303))
+
+        self.breaker.record_failure(now=303)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.trips, 2)
+        self.assertFalse(self.breaker.allow_request(now=602))
+
+        self.assertTrue(self.breaker.allow_request(now=603))
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request(now=604))
+
+
+class TestProxyPool(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a pool with the direct route and two proxies on a fake clock.
+        """
+        self.now = 0.0
+        self.direct = ProxyRoute('direct')
+        self.slow = ProxyRoute('slow:8080', {'https': 'https://slow:8080'})
+        self.fast = ProxyRoute('fast:8080', {'https': 'https://fast:8080'})
+        self.pool = ProxyPool([self.direct, self.slow, self.fast], clock=lambda: self.now)
+        self.pool.record_success(self.slow, latency=2.0)
+        self.pool.record_success(self.fast, latency=0.1)
+
+    def trip(self, route):
+        for _ in range(route.breaker.failure_threshold):
+            self.pool.record_failure(route)
+
+    def test_direct_route_is_preferred(self):
+        """
+        The direct route wins while its breaker allows it, unless a retry asks to avoid it.
+        """
+        self.assertIs(self.pool.choose_route(), self.direct)
+        self.assertIs(self.pool.choose_route(avoid='direct'), self.fast)
+
+    def test_healthiest_proxy_takes_over_until_direct_recovers(self):
+        """
+        With the direct route open, the best-scoring proxy is used until direct's probe is due.
+        """
+        self.trip(self.direct)
+        self.assertIs(self.pool.choose_route(), self.fast)
+
+        self.trip(self.fast)
+        self.assertIs(self.pool.choose_route(), self.slow)
+
+        self.now = 300.0
+        self.assertIs(self.pool.choose_route(), self.direct)
+        self.assertEqual(self.direct.breaker.state, CircuitBreaker.HALF_OPEN)
+
+    def test_all_open_falls_back_to_the_soonest_probe(self):
+        """
+        When every breaker is open, the route whose cool-down ends first is returned.
+        """
+        self.trip(self.slow)
+        self.now = 10.0
+        self.trip(self.direct)
+        self.trip(self.fast)
+
+        self.now = 20.0
+        self.assertIs(self.pool.choose_route(), self.slow)
+        self.assertEqual(self.pool.get_stats()['slow:8080']['state'], CircuitBreaker.OPEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
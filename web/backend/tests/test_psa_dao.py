@@ -89,3 +89,24 @@ class TestPsaDAO(unittest.TestCase):
 
         # 3. Verify that the reconstructed data matches the original input.
         self.assertDictEqual(reconstructed_data, self.sample_psa_pop_json)
+
+    def test_update_card_analytics_bulk_matches_per_card_update(self):
+        """
+        Tests that the set-based recalculation writes the same analytics as the per-card one,
+        and that it can be restricted to a set of card IDs.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("INSERT INTO cards (card_id, set_id, name) VALUES (?, ?, ?)", (7, 1, 'Other Card'))
+        self.psa_dao.add_psa_population_from_json(41324, self.sample_psa_pop_json)
+        self.psa_dao.add_psa_population_from_json(7, {"9.0": 3, "10.0": 1, "updated_date": "2025-09-06 18:37:39"})
+        query = "SELECT card_id, psa_10_pop, non_psa_10_pop, gem_rate FROM card_analytics ORDER BY card_id"
+        per_card = cursor.execute(query).fetchall()
+
+        cursor.execute("DELETE FROM card_analytics")
+        self.conn.commit()
+        self.assertEqual(self.psa_dao.update_card_analytics_bulk(card_ids=[7]), 1)
+        self.assertEqual(cursor.execute(query).fetchall(), [per_card[0]])
+
+        self.assertEqual(self.psa_dao.update_card_analytics_bulk(), 2)
+        self.assertEqual(cursor.execute(query).fetchall(), per_card)
+        self.assertEqual(per_card[0], (7, 1, 3, 0.25))
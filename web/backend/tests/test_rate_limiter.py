@@ -0,0 +1,99 @@
+import unittest
+
+from core_module.service.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+class FakeClock:
+    """A clock that only moves when the limiter sleeps or the test advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a limiter starting at 1 request per second on a fake clock.
+        """
+        self.clock = FakeClock()
+        self.limiter = AdaptiveRateLimiter(initial_rate=1, min_rate=0.25, max_rate=2, additive_increase=0.5,
+                                           multiplicative_decrease=0.5, clock=self.clock, sleep=self.clock.sleep)
+
+    def rate(self, route):
+        return self.limiter.get_stats()[route]['rate_per_second']
+
+    def test_rate_grows_additively_and_drops_multiplicatively(self):
+        """
+        Clean responses add a fixed step up to max_rate; throttles halve the rate down to min_rate.
+        """
+        self.limiter.on_success('direct')
+        self.assertEqual(self.rate('direct'), 1.5)
+        self.limiter.on_success('direct')
+        self.limiter.on_success('direct')
+        self.assertEqual(self.rate('direct'), 2)
+
+        self.limiter.on_throttle('direct')
+        self.assertEqual(self.rate('direct'), 1)
+        for _ in range(3):
+            self.limiter.on_throttle('direct')
+        self.assertEqual(self.rate('direct'), 0.25)
+        self.assertEqual(self.limiter.get_stats()['direct']['throttle_events'], 4)
+
+    def test_requests_are_paced_to_the_current_rate(self):
+        """
+        The first request uses the burst token and the next waits 1 / rate. A throttle slows the refill.
+        """
+        self.limiter.acquire('direct')
+        self.limiter.acquire('direct')
+        self.assertEqual(self.clock.sleeps, [1.0])
+
+        # At 0.5 requests per second the half token owed since the last refill plus this one take 3s.
+        self.limiter.on_throttle('direct')
+        self.limiter.acquire('direct')
+        self.assertEqual(self.clock.sleeps, [1.0, 3.0])
+
+    def test_retry_after_blocks_the_route(self):
+        """
+        A Retry-After delay holds the route's next request until it has passed.
+        """
+        self.limiter.acquire('direct')
+        self.clock.now = 100.0
+        self.limiter.on_throttle('direct', retry_after='30')
+        self.assertEqual(self.limiter.get_stats()['direct']['blocked_for_seconds'], 30)
+
+        self.limiter.acquire('direct')
+        self.assertEqual(self.clock.sleeps, [30.0])
+
+    def test_routes_keep_separate_buckets(self):
+        """
+        Throttling a proxy route neither slows nor blocks the direct route.
+        """
+        self.limiter.acquire('proxy-a')
+        self.limiter.on_throttle('proxy-a', retry_after='60')
+
+        self.limiter.acquire('direct')
+        self.assertEqual(self.clock.sleeps, [])
+        self.assertEqual(self.rate('direct'), 1)
+        self.assertEqual(self.rate('proxy-a'), 0.5)
+
+    def test_parse_retry_after(self):
+        """
+        Seconds and HTTP dates are understood; missing or garbled headers give None.
+        """
+        self.assertEqual(parse_retry_after('5'), 5.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+
+
+if __name__ == '__main__':
+    unittest.main()
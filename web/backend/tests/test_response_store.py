@@ -0,0 +1,156 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from core_module.service import api, domain
+from core_module.service.cache_manifest import BUILT_META_KEY, CacheManifest
+from core_module.service.negative_cache import NegativeCache
+from core_module.service.response_store import SQLiteResponseStore, parse_cache_key
+from core_module.utils.file_utils import get_repo_root
+
+
+class TestSQLiteResponseStore(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a response store in a temporary directory for each test.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SQLiteResponseStore(os.path.join(self.temp_dir, 'responses.sqlite3'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_parse_cache_key(self):
+        self.assertEqual(parse_cache_key('get_card_prices_setId=557.json'), ('get_card_prices_setId', '557'))
+        self.assertEqual(parse_cache_key('get_all_sets.json'), ('get_all_sets', None))
+
+    def test_put_get_delete_round_trip(self):
+        """
+        A stored response comes back unchanged, its metadata columns are filled in, and it can be deleted.
+        """
+        data = {'updated_date': '2025-09-05 18:03:50', 'data': [{'id': 1, 'name': 'Charizard'}]}
+
+        self.store.put('get_card_prices_setId=557.json', data)
+        self.store.put('get_card_id_psa_pop_card_id=17.json', {'updated_date': '2025-09-05 18:03:50', 'data': None})
+
+        self.assertEqual(self.store.get('get_card_prices_setId=557.json'), data)
+        self.assertEqual(self.store.keys('get_card_prices_setId'), ['get_card_prices_setId=557.json'])
+        row = self.store._connection().execute(
+            "SELECT endpoint, entity_id, fetched_at, is_empty FROM api_responses WHERE cache_key = ?",
+            ('get_card_prices_setId=557.json',)).fetchone()
+        self.assertEqual(row, ('get_card_prices_setId', '557', '2025-09-05 18:03:50', 0))
+        self.assertEqual(self.store.get_stats()['empty'], 1)
+
+        self.assertTrue(self.store.delete('get_card_prices_setId=557.json'))
+        self.assertIsNone(self.store.get('get_card_prices_setId=557.json'))
+
+    def test_unchanged_put_only_bumps_fetch_time(self):
+        """
+        Re-storing the same content (in any key order) reports no change and only moves the updated_date.
+        """
+        key = 'get_card_id_psa_pop_card_id=17.json'
+        self.assertTrue(self.store.put(key, {'updated_date': '2025-09-05 18:03:50', '10': 5, '9': 12}))
+        self.assertFalse(self.store.put(key, {'9': 12, '10': 5, 'updated_date': '2025-09-06 08:00:00'}))
+        self.assertEqual(self.store.get(key), {'updated_date': '2025-09-06 08:00:00', '10': 5, '9': 12})
+
+        self.assertTrue(self.store.put(key, {'updated_date': '2025-09-07 08:00:00', '10': 6, '9': 12}))
+
+    def test_import_directory(self):
+        """
+        The importer brings every readable JSON file over and skips corrupt ones.
+        """
+        test_dir = os.path.dirname(__file__)
+        source_dir = os.path.join(self.temp_dir, 'api_responses')
+        os.makedirs(source_dir)
+        shutil.copy(os.path.join(test_dir, 'resources', 'test_get_volume_of_transactions_card_id=41324.json'),
+                    os.path.join(source_dir, 'get_volume_of_transactions_card_id=41324.json'))
+        with open(os.path.join(source_dir, 'get_card_prices_setId=1.json'), 'w') as f:
+            f.write('{not json')
+
+        imported = self.store.import_directory(source_dir)
+
+        self.assertEqual(imported, 1)
+        with open(os.path.join(source_dir, 'get_volume_of_transactions_card_id=41324.json')) as f:
+            self.assertEqual(self.store.get('get_volume_of_transactions_card_id=41324.json'), json.load(f))
+
+
+class TestSQLiteBackendStreaming(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Switch domain to the sqlite backend, with its store, manifest and negative cache in a temporary directory.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(get_repo_root(), 'cache')
+        self.cache_existed = os.path.isdir(self.cache_dir)
+        names = ('CACHE_BACKEND', '_response_store', '_cache_manifest', '_negative_cache')
+        self.saved = {name: getattr(domain, name) for name in names}
+        self.saved_api_function = api.get_volume_of_transactions
+
+        domain.CACHE_BACKEND = 'sqlite'
+        domain._response_store = SQLiteResponseStore(os.path.join(self.temp_dir, 'responses.sqlite3'))
+        domain._cache_manifest = CacheManifest(os.path.join(self.temp_dir, 'manifest.sqlite3'))
+        domain._cache_manifest.set_meta(BUILT_META_KEY, 1)
+        domain._negative_cache = NegativeCache(os.path.join(self.temp_dir, 'negative_cache.sqlite3'))
+
+        def get_volume_of_transactions(card_id, page=0, stream_to=None):
+            with open(stream_to, 'w', encoding='utf-8') as f:
+                json.dump({'page': page, 'transactions': [{'id': 'new'}], 'ebay_avg': [], 'tcgplayer': []}, f)
+            return stream_to
+
+        api.get_volume_of_transactions = get_volume_of_transactions
+
+    def tearDown(self):
+        domain.delete_cache_file('get_volume_of_transactions_card_id=8805.json')
+        domain._response_store.close()
+        domain._cache_manifest.close()
+        domain._negative_cache.close()
+        for name, value in self.saved.items():
+            setattr(domain, name, value)
+        api.get_volume_of_transactions = self.saved_api_function
+        shutil.rmtree(self.temp_dir)
+        if not self.cache_existed:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_streamed_page_is_read_back_and_indexed(self):
+        """
+        A streamed page replaces an older stored copy of its key, readers find it in the file cache,
+        the manifest indexes it, and deleting the key removes the file too.
+        """
+        cache_key = 'get_volume_of_transactions_card_id=8805.json'
+        domain.save_cache(cache_key, {'transactions': [{'id': 'old'}], 'updated_date': '2025-01-01 00:00:00'})
+
+        path = domain.download_volume_of_transactions(8805, 0)
+
+        self.assertTrue(os.path.exists(path))
+        self.assertIsNone(domain._response_store.get(cache_key))
+        self.assertEqual(domain.get_cache(cache_key)['transactions'], [{'id': 'new'}])
+        self.assertEqual(domain.open_cached_payload(cache_key).get('transactions'), [{'id': 'new'}])
+        self.assertIsNotNone(domain._cache_manifest.get(cache_key))
+
+        domain.delete_cache_file(cache_key)
+        self.assertFalse(os.path.exists(path))
+        self.assertIsNone(domain._cache_manifest.get(cache_key))
+        self.assertIsNone(domain.get_cache(cache_key))
+
+    def test_stale_responses_come_from_the_store(self):
+        """
+        In sqlite mode, stale and empty responses are found in the store as well as in the manifest.
+        """
+        domain.save_cache('get_card_prices_setId=557.json', {'data': [1], 'updated_date': '2020-01-01 00:00:00'})
+        domain.save_cache('get_card_prices_setId=558.json', {'data': [], 'updated_date': '2099-01-01 00:00:00'})
+        domain.save_cache('get_card_prices_setId=559.json', {'data': [1], 'updated_date': '2099-01-01 00:00:00'})
+
+        self.assertEqual(domain.find_stale_responses('get_card_prices_setId', older_than=datetime.now()), [
+            ('get_card_prices_setId=557.json', '557', 'Stale date: 2020-01-01'),
+            ('get_card_prices_setId=558.json', '558', 'Empty data'),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
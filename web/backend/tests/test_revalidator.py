@@ -0,0 +1,49 @@
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from core_module.service.revalidator import BackgroundRevalidator, EXPIRED, FRESH, STALE
+
+
+class TestBackgroundRevalidator(unittest.TestCase):
+
+    def setUp(self):
+        self.revalidator = BackgroundRevalidator(max_workers=2, endpoint_ttls={'get_card_prices_setId': (60, 3600)})
+
+    def tearDown(self):
+        self.revalidator.shutdown()
+
+    def test_classify_by_soft_and_hard_ttl(self):
+        now = datetime(2025, 9, 5, 12, 0, 0)
+
+        def cache_aged(seconds):
+            return {'updated_date': (now - timedelta(seconds=seconds)).strftime('%Y-%m-%d %H:%M:%S')}
+
+        self.assertEqual(self.revalidator.classify('get_card_prices_setId', cache_aged(30), now), FRESH)
+        self.assertEqual(self.revalidator.classify('get_card_prices_setId', cache_aged(120), now), STALE)
+        self.assertEqual(self.revalidator.classify('get_card_prices_setId', cache_aged(7200), now), EXPIRED)
+        self.assertEqual(self.revalidator.classify('get_card_prices_setId', {'data': []}, now), EXPIRED)
+
+    def test_schedule_runs_once_per_pending_key(self):
+        """
+        A key with a refresh already queued or running is not queued again.
+        """
+        release = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            release.wait(5)
+
+        self.assertTrue(self.revalidator.schedule('get_card_prices_setId=557.json', refresh))
+        self.assertFalse(self.revalidator.schedule('get_card_prices_setId=557.json', refresh))
+        release.set()
+        self.revalidator.shutdown()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.revalidator.get_stats(),
+                         {'scheduled': 1, 'deduplicated': 1, 'completed': 1, 'failed': 0, 'pending': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
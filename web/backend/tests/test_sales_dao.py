@@ -120,6 +120,95 @@ class TestSalesDAO(unittest.TestCase):
         cursor.execute("SELECT COUNT(*) FROM ebay_avg")
         self.assertEqual(cursor.fetchone()[0], 3650, "Incorrect row count in 'ebay_avg' table.")
 
+    def test_add_sales_from_json_file_streams_large_payload(self):
+        """
+        Tests that the streaming ingest of a cached payload file produces the same
+        rows as the in-memory ingest, even when rows are flushed in small chunks.
+        """
+        test_dir = os.path.dirname(os.path.abspath(__file__))
+        json_path = os.path.join(test_dir, 'resources', 'test_2_get_volume_of_transactions_large_file.json')
+
+        # 1. Ingest the file with a small chunk size to exercise the chunked flushes.
+        self.sales_dao.add_sales_from_json_file(json_path, chunk_size=500)
+
+        # 2. Verify the counts match the in-memory ingest of the same file.
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM transactions")
+        self.assertEqual(cursor.fetchone()[0], 3375)
+        cursor.execute("SELECT COUNT(*) FROM tcgplayer")
+        self.assertEqual(cursor.fetchone()[0], 353)
+        cursor.execute("SELECT COUNT(*) FROM ebay_avg")
+        self.assertEqual(cursor.fetchone()[0], 3650)
+
+        # 3. Verify the card_sales row and the derived sales volume were written.
+        cursor.execute("SELECT card_id, updated_date FROM card_sales")
+        card_sale_row = cursor.fetchone()
+        self.assertEqual(card_sale_row[0], 41324)
+        self.assertEqual(card_sale_row[1], datetime(2025, 9, 5, 18, 3, 50))
+        cursor.execute("SELECT COUNT(*) FROM sales_volume WHERE card_id = ?", (41324,))
+        self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_add_sales_from_json_file_with_new_transactions_only(self):
+        """
+        Tests that passing the page's new transactions inserts only those, while the
+        other sales tables are still read from the file.
+        """
+        test_dir = os.path.dirname(os.path.abspath(__file__))
+        json_path = os.path.join(test_dir, 'resources', 'test_get_volume_of_transactions_card_id=41324.json')
+        with open(json_path, 'r') as f:
+            new_transactions = json.load(f)['transactions'][:2]
+
+        self.sales_dao.add_sales_from_json_file(json_path, transactions=new_transactions)
+
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT source_transaction_id FROM transactions ORDER BY source_transaction_id")
+        self.assertEqual([row[0] for row in cursor.fetchall()], sorted(t['id'] for t in new_transactions))
+        cursor.execute("SELECT COUNT(*) FROM tcgplayer")
+        self.assertEqual(cursor.fetchone()[0], 9)
+
+    def test_update_sales_volume_bulk_matches_per_card_queries(self):
+        """
+        Tests that the bulk recalculation writes the volumes given by the original
+        per-card queries, for all cards and for a batch of card IDs.
+        """
+        test_dir = os.path.dirname(os.path.abspath(__file__))
+        json_path = os.path.join(test_dir, 'resources', 'test_2_get_volume_of_transactions_large_file.json')
+        self.sales_dao.add_sales_from_json_file(json_path, update_volume=False)
+        cursor = self.conn.cursor()
+        # A second card whose sales are the same ones dated 45 days earlier.
+        cursor.execute("""
+            INSERT INTO transactions (source_transaction_id, card_id, date_sold, ebay_item_id, psa_grade)
+            SELECT source_transaction_id + 1000000000, 7, strftime('%Y-%m-%dT%H:%M:%S', date_sold, '-45 days'),
+                   ebay_item_id || '-7', psa_grade
+            FROM transactions WHERE card_id = 41324
+        """)
+
+        # The oracle: the per-card queries the bulk statement replaced.
+        expected_rows = []
+        for card_id in (7, 41324):
+            cursor.execute("SELECT MAX(date(date_sold)) FROM transactions WHERE card_id = ?", (card_id,))
+            last_sales_date = cursor.fetchone()[0]
+            cursor.execute("""
+                SELECT
+                    SUM(CASE WHEN psa_grade = 10.0 THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN psa_grade >= 0.0 AND psa_grade < 10.0 THEN 1 ELSE 0 END)
+                FROM transactions
+                WHERE card_id = ? AND date(date_sold) BETWEEN date(?, '-30 days') AND ?
+            """, (card_id, last_sales_date, last_sales_date))
+            psa10_volume, non_psa10_volume = cursor.fetchone()
+            expected_rows.append((card_id, psa10_volume, non_psa10_volume, last_sales_date))
+        self.assertTrue(all(row[1] and row[2] for row in expected_rows))
+
+        query = "SELECT card_id, psa10_volume, non_psa10_volume, CAST(last_sales_date AS TEXT) " \
+                "FROM sales_volume ORDER BY card_id"
+        self.assertEqual(self.sales_dao.update_sales_volume_bulk(), 2)
+        cursor.execute(query)
+        self.assertEqual([tuple(row) for row in cursor.fetchall()], expected_rows)
+
+        cursor.execute("DELETE FROM sales_volume")
+        self.assertEqual(self.sales_dao.update_sales_volume_bulk([7]), 1)
+        cursor.execute(query)
+        self.assertEqual([tuple(row) for row in cursor.fetchall()], expected_rows[:1])
 
     def test_get_sales_as_json(self):
         """
@@ -0,0 +1,43 @@
+import math
+import unittest
+
+import numpy as np
+
+from core_module.card_data_utils.calculate_expected_value import calculate_net_gain, score_candidates, \
+    score_card_rows
+
+CARDS = [
+    {'raw_price': 20.0, 'psa_10_price': 150.0, 'gem_rate': 0.5},
+    {'raw_price': 5.0, 'psa_10_price': 40.0, 'gem_rate': 0.1},
+    {'raw_price': 120.0, 'psa_10_price': 900.0, 'gem_rate': 0.35},
+]
+
+
+class TestScoring(unittest.TestCase):
+
+    def test_vectorized_scores_match_per_card_scores(self):
+        scores = score_card_rows(CARDS, grading_cost=29)
+        for i, card in enumerate(CARDS):
+            ev, total_cost, net_gain, lucrative_factor = calculate_net_gain(card, grading_cost=29)
+            self.assertAlmostEqual(scores['expected_value'][i], ev)
+            self.assertAlmostEqual(scores['total_cost'][i], total_cost)
+            self.assertAlmostEqual(scores['net_gain'][i], net_gain)
+            self.assertAlmostEqual(scores['lucrative_factor'][i], lucrative_factor)
+
+        # First card: EV = 0.5 * 150 + 0.5 * 20 = 85, cost = 49, net gain = 36.
+        self.assertEqual(calculate_net_gain(CARDS[0], grading_cost=29)[:3], (85.0, 49.0, 36.0))
+
+    def test_per_card_grading_cost_and_missing_values(self):
+        scores = score_candidates([20.0, 20.0, None], [150.0, 150.0, 150.0], [0.5, 0.5, 0.5],
+                                  grading_cost=np.array([29.0, 75.0, 29.0]))
+        self.assertEqual(list(scores['total_cost'][:2]), [49.0, 95.0])
+        self.assertEqual(scores['net_gain'][1], -10.0)
+        self.assertTrue(math.isnan(scores['net_gain'][2]))
+
+        # The per-card function still rejects missing values.
+        with self.assertRaises(TypeError):
+            calculate_net_gain({'raw_price': None, 'psa_10_price': 150.0, 'gem_rate': 0.5})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from core_module.utils.file_utils import SERIALIZERS, decode_bytes, read_serialized_file, save_object_to_file
+
+
+class TestSerializers(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data = {'updated_date': '2025-09-05 18:03:50',
+                     'data': [{'id': 1, 'name': 'Pokémon Card', 'price': 12.5, 'graded': None}]}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_every_format_round_trips_through_auto_detection(self):
+        """
+        Files written in any format are read back by the same format-detecting reader.
+        """
+        for name in SERIALIZERS:
+            with self.subTest(file_format=name):
+                filename = f'get_card_prices_setId={name}.json'
+                try:
+                    save_object_to_file(self.data, filename, self.temp_dir, file_format=name)
+                except ValueError:
+                    continue  # Optional library not installed
+                self.assertEqual(read_serialized_file(os.path.join(self.temp_dir, filename)), self.data)
+
+    def test_default_format_is_plain_json(self):
+        """
+        Files outside the response cache (e.g. candidates.json) are written as JSON that json.load reads.
+        """
+        save_object_to_file(self.data, 'candidates.json', self.temp_dir)
+        with open(os.path.join(self.temp_dir, 'candidates.json'), 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), self.data)
+
+    def test_invalid_contents_raise_json_decode_error(self):
+        with self.assertRaises(json.JSONDecodeError):
+            decode_bytes(b'{not json')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,8 @@ import sqlite3
 import unittest
 from datetime import datetime
 
+from core_module.card_data_utils.calculate_expected_value import calculate_net_gain
+from web.backend.db.dao.candidates_dao import CandidatesDAO
 from web.backend.db.dao.set_dao import SetDAO
 from web.backend.db.database_setup import setup_schema
 from web.backend.db.db_config import configure_sqlite_for_project
@@ -258,3 +260,28 @@ class TestSetDAO(unittest.TestCase):
         cursor.execute("SELECT COUNT(*) FROM card_stats")
         self.assertEqual(cursor.fetchone()[0], 40)
         print("Upsert functionality verified successfully!")
+
+    def test_add_set_from_json_updates_financials_in_bulk(self):
+        """
+        Tests that upserting a set recalculates grading_financials for its cards that have
+        both prices and a gem rate, matching the per-card calculation.
+        """
+        self.set_dao.candidates_dao = CandidatesDAO(self.conn)
+        cursor = self.conn.cursor()
+        self.set_dao.add_set_from_json(self.sample_json_data)
+        cursor.execute("INSERT INTO card_analytics (card_id, gem_rate) SELECT card_id, 0.5 FROM cards")
+        self.conn.commit()
+
+        self.set_dao.add_set_from_json(self.sample_json_data)
+
+        cursor.execute("""
+            SELECT gf.card_id, gf.net_gain, raw.avg, psa10.avg
+            FROM grading_financials gf
+            JOIN card_stats raw ON raw.card_id = gf.card_id AND raw.source = 0.0
+            JOIN card_stats psa10 ON psa10.card_id = gf.card_id AND psa10.source = 10.0
+        """)
+        rows = cursor.fetchall()
+        self.assertTrue(rows)
+        for card_id, net_gain, raw_price, psa_10_price in rows:
+            expected = calculate_net_gain({'raw_price': raw_price, 'psa_10_price': psa_10_price, 'gem_rate': 0.5})[2]
+            self.assertAlmostEqual(net_gain, expected)
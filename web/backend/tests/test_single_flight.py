@@ -0,0 +1,84 @@
+import threading
+import time
+import unittest
+
+from core_module.service.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a SingleFlight and a fake fetch that blocks until the test releases it.
+        """
+        self.flight = SingleFlight()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.calls = 0
+        self.error = None
+
+    def fetch(self):
+        self.calls += 1
+        self.release.wait(timeout=5)
+        if self.error is not None:
+            raise self.error
+        return {'data': [1, 2, 3]}
+
+    def run_concurrently(self, callers):
+        """Starts the callers, releases the fetch once all followers are waiting, and collects the outcomes."""
+        outcomes = [None] * callers
+
+        def call(index):
+            try:
+                outcomes[index] = self.flight.do('get_all_sets.json', self.fetch)
+            except Exception as e:
+                outcomes[index] = e
+
+        threads = [threading.Thread(target=call, args=(index,)) for index in range(callers)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while self.flight.get_deduplicated_count() < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        return outcomes
+
+    def test_concurrent_callers_share_one_call(self):
+        """
+        Only the leader runs the fetch; every follower gets its own copy of the same result.
+        """
+        outcomes = self.run_concurrently(4)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.flight.get_deduplicated_count(), 3)
+        self.assertEqual(outcomes, [{'data': [1, 2, 3]}] * 4)
+        self.assertEqual(len({id(outcome) for outcome in outcomes}), 4)
+
+    def test_errors_reach_every_waiter(self):
+        """
+        An exception raised by the leader's fetch is raised to all callers.
+        """
+        self.error = ValueError("upstream failed")
+
+        outcomes = self.run_concurrently(3)
+
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(outcome is self.error for outcome in outcomes))
+
+    def test_key_is_released_afterwards(self):
+        """
+        Once a call finished (even with an error), the next call for the key runs the fetch again.
+        """
+        self.error = ValueError("upstream failed")
+        self.run_concurrently(2)
+        self.error = None
+
+        self.assertEqual(self.flight.do('get_all_sets.json', self.fetch), {'data': [1, 2, 3]})
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.flight._calls, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from core_module.service.transaction_log import TransactionLog
+
+
+def sale(txn_id, day, item_id=None):
+    return {'id': txn_id, 'card_id': 7, 'ebay_item_id': item_id or f'item-{txn_id}',
+            'date_sold': f'{day} Sep 2025 00:00:00 GMT', 'psa_grade': 10.0, 'sold_price': 100.0}
+
+
+class TestTransactionLog(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log = TransactionLog(self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_refresh_appends_only_new_sales(self):
+        """
+        A second refresh appends only the unseen sales, and sales the API dropped stay in the log.
+        """
+        with self.log.writer(7) as writer:
+            self.assertEqual(len(writer.append_records([sale(1, 'Mon, 01'), sale(2, 'Tue, 02'),
+                                                        sale(3, 'Fri, 05')])), 3)
+
+        # The API dropped sale 1, re-reports 2 and 3, and has two new sales. Sale 4 re-lists
+        # sale 3's eBay item under a new ID, so it is not new either.
+        with self.log.writer(7) as writer:
+            appended = writer.append_records([sale(2, 'Tue, 02'), sale(3, 'Fri, 05'), sale(4, 'Fri, 05', 'item-3'),
+                                              sale(5, 'Sat, 06'), sale(6, 'Sun, 07')])
+
+        self.assertEqual([record['id'] for record in appended], [5, 6])
+        self.assertEqual([record['id'] for record in self.log.read(7)], [1, 2, 3, 5, 6])
+
+        with open(self.log.watermark_path(7)) as f:
+            watermark = json.load(f)
+        self.assertEqual(watermark['count'], 5)
+        self.assertEqual(watermark['newest_date_sold'], '2025-09-07 00:00:00')
+        # Only sales inside the overlap window before the newest one are kept in the watermark.
+        self.assertEqual(sorted(entry[0] for entry in watermark['recent']), [3, 5, 6])
+
+    def test_append_file_streams_a_cached_page(self):
+        page_path = os.path.join(self.temp_dir, 'page.json')
+        with open(page_path, 'w') as f:
+            json.dump({'updated_date': '2025-09-08 00:00:00', 'ebay_avg': [],
+                       'transactions': [sale(1, 'Mon, 01'), sale(2, 'Tue, 02')]}, f)
+
+        with self.log.writer(7) as writer:
+            self.assertEqual(len(writer.append_file(page_path)), 2)
+        with self.log.writer(7) as writer:
+            self.assertEqual(writer.append_file(page_path), [])
+
+    def test_failed_refresh_marks_nothing_as_seen(self):
+        """
+        Sales found new but not appended stay new, and a refresh that raises writes neither
+        its appended sales nor the watermark.
+        """
+        with self.log.writer(7) as writer:
+            new_records = writer.new_records([sale(1, 'Mon, 01'), sale(1, 'Mon, 01'), sale(2, 'Tue, 02')])
+            self.assertEqual([record['id'] for record in new_records], [1, 2])
+            self.assertTrue(writer.is_new(sale(1, 'Mon, 01')))
+
+        with self.assertRaises(RuntimeError):
+            with self.log.writer(7) as writer:
+                writer.append_records([sale(1, 'Mon, 01')])
+                raise RuntimeError("insert failed")
+
+        self.assertEqual(list(self.log.read(7)), [])
+        self.assertEqual(self.log.load_watermark(7).get('count', 0), 0)
+        with self.log.writer(7) as writer:
+            self.assertEqual(len(writer.append_records([sale(1, 'Mon, 01')])), 1)
+        self.assertEqual([record['id'] for record in self.log.read(7)], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
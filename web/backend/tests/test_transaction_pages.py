@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+import unittest
+
+from core_module.service import domain
+from core_module.service.transaction_pages import TransactionPageFetcher
+
+
+def sale(sale_id, day, month='Sep'):
+    return {'id': sale_id, 'date_sold': f"Thu, {day:02d} {month} 2024 00:00:00 GMT"}
+
+
+class TestTransactionPageFetcher(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Serve pages from a temporary directory and keep the page index in a dict, in place of domain's cache.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.pages = {}
+        self.page_metadata = {}
+        self.requested = []
+        self.index = {}
+
+        names = ('download_volume_of_transactions', 'get_cache', 'save_cache', 'delete_cache_file')
+        saved = {name: getattr(domain, name) for name in names}
+        self.addCleanup(lambda: [setattr(domain, name, value) for name, value in saved.items()])
+        domain.download_volume_of_transactions = self.download
+        domain.get_cache = self.index.get
+        domain.save_cache = self.index.__setitem__
+        domain.delete_cache_file = lambda name: self.index.pop(name, None)
+
+    def download(self, card_id, page):
+        """Writes the scripted page to a file and returns its path; a page scripted as None fails."""
+        self.requested.append(page)
+        transactions = self.pages.get(page, [])
+        if transactions is None:
+            return None
+        path = os.path.join(self.temp_dir.name, f"page={page}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'page': page, 'transactions': transactions, 'ebay_avg': [], 'tcgplayer': [],
+                       **self.page_metadata.get(page, {})}, f)
+        return path
+
+    def fetch(self, max_concurrency=1):
+        handed = []
+        TransactionPageFetcher(max_concurrency=max_concurrency, window_days=30, max_pages=10).fetch(
+            7, lambda page, path: handed.append(page))
+        return handed
+
+    def stored_ids(self):
+        return self.index['transaction_pages_card_id=7.json']['newest_page_ids']
+
+    def test_page_count_metadata_bounds_the_walk(self):
+        """
+        A page count reported on page 0 stops the walk there, even if later pages would have data.
+        """
+        self.pages = {page: [sale(f"{page}a", 20)] for page in range(5)}
+        self.page_metadata = {0: {'total_pages': 3}}
+
+        self.assertEqual(self.fetch(max_concurrency=4), [0, 1, 2])
+        self.assertEqual(self.requested, [0, 1, 2])
+
+    def test_empty_page_ends_the_walk(self):
+        """
+        Without a page count, pages are fetched until one comes back empty.
+        """
+        self.pages = {0: [sale('a', 20)], 1: [sale('b', 19)], 2: []}
+
+        self.assertEqual(self.fetch(), [0, 1, 2])
+        self.assertEqual(self.requested, [0, 1, 2])
+        self.assertEqual(self.stored_ids(), ['a'])
+
+    def test_page_older_than_the_window_ends_the_walk(self):
+        """
+        A page whose newest sale falls before the volume window is the last one fetched.
+        """
+        self.pages = {0: [sale('a', 30)], 1: [sale('b', 25)], 2: [sale('c', 1, 'Aug')], 3: [sale('d', 1, 'Aug')]}
+
+        self.fetch()
+        self.assertEqual(self.requested, [0, 1, 2])
+
+    def test_overlap_with_the_previous_fetch_ends_the_walk(self):
+        """
+        Re-fetching stops at the first page holding a sale from the previous newest page,
+        and at page 0 itself when nothing new pushed those sales onto later pages.
+        """
+        self.pages = {0: [sale('a', 20), sale('b', 19)], 1: [sale('c', 18)], 2: []}
+        self.fetch()
+        self.assertEqual(self.stored_ids(), ['a', 'b'])
+
+        # No new sales: page 0 is unchanged and nothing else is requested.
+        self.requested = []
+        self.assertEqual(self.fetch(), [0])
+        self.assertEqual(self.requested, [0])
+
+        # Two new sales push the previous newest page down to page 1.
+        self.pages = {0: [sale('y', 22), sale('x', 21)], 1: [sale('a', 20), sale('b', 19)], 2: [sale('c', 18)]}
+        self.requested = []
+        self.fetch()
+        self.assertEqual(self.requested, [0, 1])
+        self.assertEqual(self.stored_ids(), ['x', 'y'])
+
+    def test_failed_page_ends_the_walk_and_drops_the_index(self):
+        """
+        A page that fails to download is not handed on, and the page index is dropped so the
+        next fetch walks the history again instead of stopping on page 0's overlap.
+        """
+        self.index['transaction_pages_card_id=7.json'] = {'newest_page_ids': ['old']}
+        self.pages = {0: [sale('a', 20)], 1: None, 2: [sale('c', 18)]}
+
+        self.assertEqual(self.fetch(), [0])
+        self.assertEqual(self.requested, [0, 1])
+        self.assertNotIn('transaction_pages_card_id=7.json', self.index)
+
+
+if __name__ == '__main__':
+    unittest.main()
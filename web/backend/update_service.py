@@ -1,5 +1,7 @@
 import os
 import sys
+from datetime import datetime
+from functools import partial
 
 # This adds the project root to the Python path to allow for absolute imports.
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -9,12 +11,20 @@ if project_root not in sys.path:
 from web.backend.card_cache_service import CardCacheService
 from web.backend.db.dao.candidates_dao import CandidatesDAO
 from web.backend.db.dao.gem_rate_refresh_log_dao import GemRateRefreshLogDAO
+from web.backend.db.dao.ingest_checksum_dao import IngestChecksumDAO
 from web.backend.db.dao.psa_dao import PsaDAO
 from web.backend.db.dao.sales_dao import SalesDAO
 from web.backend.db.dao.sales_volume_refresh_log_dao import SalesVolumeRefreshLogDAO
 from web.backend.db.dao.set_dao import SetDAO
 from web.backend.db.util.cache_to_db_migation import populate_card_analytics_from_db, populate_grading_financials_from_db
-from core_module.service.domain import get_volume_of_transactions, get_card_id_psa_pop, get_card_prices
+from core_module.service import api
+from core_module.service.async_fetcher import AsyncFetchEngine
+from core_module.service.domain import filter_known_empty, get_cache_gc, get_cache_metrics, get_card_id_psa_pop, \
+    get_card_prices, get_change_stats, get_deduplicated_call_count, get_negative_cache_stats, get_payload_checksum, \
+    is_payload_unchanged, reset_cache_metrics, reset_change_stats
+from core_module.utils.file_utils import save_object_to_file
+from core_module.service.transaction_log import TransactionLog
+from core_module.service.transaction_pages import TransactionPageFetcher
 
 
 class UpdateService:
@@ -30,10 +40,19 @@ class UpdateService:
             set_dao: SetDAO,
             sales_volume_refresh_log_dao: SalesVolumeRefreshLogDAO,
             gem_rate_refresh_log_dao: GemRateRefreshLogDAO,
-            card_cache_service: CardCacheService
+            ingest_checksum_dao: IngestChecksumDAO,
+            card_cache_service: CardCacheService,
+            use_async_fetch: bool = False,
+            fetch_concurrency: int = 4,
+            transaction_log: TransactionLog = None
     ):
         """
         Initializes the service with all its dependencies.
+
+        :param use_async_fetch: If True, API fetches run through the AsyncFetchEngine
+                                instead of one at a time.
+        :param fetch_concurrency: The number of fetches kept in flight in async mode.
+        :param transaction_log: The append-only per-card sales history (defaults to cache/transaction_log).
         """
         self.candidates_dao = candidates_dao
         self.psa_dao = psa_dao
@@ -41,7 +60,55 @@ class UpdateService:
         self.set_dao = set_dao
         self.sales_volume_refresh_log_dao = sales_volume_refresh_log_dao
         self.gem_rate_refresh_log_dao = gem_rate_refresh_log_dao
+        self.ingest_checksum_dao = ingest_checksum_dao
         self.card_cache_service = card_cache_service
+        self.use_async_fetch = use_async_fetch
+        self.fetch_concurrency = fetch_concurrency
+        self.transaction_log = transaction_log or TransactionLog()
+
+    def _fetch_all(self, ids, fetch_function, on_result):
+        """
+        Private method to fetch data for every ID and hand each result to `on_result`.
+        Uses the AsyncFetchEngine when async fetching is enabled and falls back to
+        the serial loop otherwise. `on_result` always runs on the calling thread.
+        """
+        if self.use_async_fetch:
+            print(f"Fetching {len(ids)} items with up to {self.fetch_concurrency} requests in flight.")
+            AsyncFetchEngine(fetch_function, self.fetch_concurrency).run(ids, on_result)
+            return
+
+        for item_id in ids:
+            on_result(item_id, fetch_function(item_id))
+
+    def _skip_known_empty(self, api_function, card_ids, refresh_log_dao):
+        """
+        Private method to drop cards the API recently had nothing for. The skipped
+        cards still count as checked, so they are logged as refresh attempts.
+        """
+        remaining = filter_known_empty(api_function, card_ids)
+        remaining_ids = set(remaining)
+        skipped = [card_id for card_id in card_ids if card_id not in remaining_ids]
+        if skipped:
+            refresh_log_dao.log_batch_refresh_attempt(skipped)
+        return remaining
+
+    def _is_ingested(self, consumer, api_function, *args):
+        """
+        Private method to tell whether the latest fetch of a call has the same content as
+        the payload `consumer` last ingested, in which case only its timestamps need bumping.
+        Anything never ingested (or whose ingest failed) counts as not ingested.
+        """
+        ingested_checksum = self.ingest_checksum_dao.get_checksum(consumer, "_".join(str(arg) for arg in args))
+        return is_payload_unchanged(api_function, *args, ingested_checksum=ingested_checksum)
+
+    def _mark_ingested(self, consumer, api_function, *args):
+        """
+        Private method to store the checksum of the latest fetch of a call once `consumer`
+        has ingested it successfully.
+        """
+        checksum = get_payload_checksum(api_function, *args)
+        if checksum:
+            self.ingest_checksum_dao.save_checksum(consumer, "_".join(str(arg) for arg in args), checksum)
 
     def _update_sales_price_data(self, set_ids):
         """
@@ -49,10 +116,18 @@ class UpdateService:
         """
         if not set_ids:
             return
-        for set_id in set_ids:
+
+        def on_result(set_id, data):
             print(f"Updating sales price data for set_id: {set_id}")
-            data = get_card_prices(set_id, use_network_only=True)
-            self.set_dao.add_set_from_json(data)
+            if not data:
+                return
+            if self._is_ingested("sets", api.get_card_prices_of_set, set_id):
+                self.set_dao.touch_set(set_id, data.get('updated_date'))
+            else:
+                self.set_dao.add_set_from_json(data)
+                self._mark_ingested("sets", api.get_card_prices_of_set, set_id)
+
+        self._fetch_all(set_ids, partial(get_card_prices, use_network_only=True), on_result)
 
     def _update_missing_sales_volume_cards(self, card_ids):
         """
@@ -62,12 +137,44 @@ class UpdateService:
         if not card_ids:
             return
 
+        card_ids = self._skip_known_empty(api.get_volume_of_transactions, card_ids,
+                                          self.sales_volume_refresh_log_dao)
+
+        # Cards are walked one at a time; in async mode their pages are fetched
+        # concurrently instead. Each page is streamed to its cache file, and the sales
+        # the card's transaction log has not seen are merged into the database and then
+        # appended to the log, as soon as the page arrives. Sales volumes are recalculated
+        # once at the end for every card that took in new sales.
+        page_concurrency = self.fetch_concurrency if self.use_async_fetch else 1
+        page_fetcher = TransactionPageFetcher(max_concurrency=page_concurrency)
+        ingested_card_ids = set()
+
+        def on_page(card_id, log_writer, page, cache_file_path):
+            if log_writer.count and self._is_ingested("transactions", api.get_volume_of_transactions, card_id, page):
+                self.sales_dao.touch_card_sales(card_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            else:
+                # Sales are stored in the database before they are marked as seen in the log,
+                # so a failed insert is retried next time. A card the database has no sales for
+                # (e.g. after a rebuild) gets the whole page rather than only what the log has not seen.
+                new_transactions = log_writer.new_records_in_file(cache_file_path)
+                self.sales_dao.add_sales_from_json_file(
+                    cache_file_path, transactions=new_transactions if self.sales_dao.has_transactions(card_id) else None,
+                    update_volume=False)
+                log_writer.append_records(new_transactions)
+                self._mark_ingested("transactions", api.get_volume_of_transactions, card_id, page)
+                ingested_card_ids.add(card_id)
+
         for card_id in card_ids:
             print(f"Trying to update sales volume for card_id: {card_id}")
-            data = get_volume_of_transactions(card_id, use_network_only=True)
-            self.sales_dao.add_sales_from_json(data)
+            with self.transaction_log.writer(card_id) as log_writer:
+                page_fetcher.fetch(card_id, partial(on_page, card_id, log_writer))
+            print(f"Appended {log_writer.appended} new sales to the log of card_id {card_id} "
+                  f"({log_writer.count} logged).")
             self.sales_volume_refresh_log_dao.log_batch_refresh_attempt([card_id])
 
+        if ingested_card_ids:
+            updated = self.sales_dao.update_sales_volume_bulk(sorted(ingested_card_ids))
+            print(f"Updated sales volume for {updated} cards.")
 
     def _update_missing_psa_pops(self, card_ids):
         """
@@ -77,22 +184,87 @@ class UpdateService:
         if not card_ids:
             return
 
-        for card_id in card_ids:
+        card_ids = self._skip_known_empty(api.get_card_id_psa_pop, card_ids, self.gem_rate_refresh_log_dao)
+
+        def on_result(card_id, data):
             print(f"Trying to update PSA pop for card_id: {card_id}")
-            data = get_card_id_psa_pop(card_id, use_network_only=True)
             if data and isinstance(data, dict) and len(data) > 2:
                 try:
-                    self.psa_dao.add_psa_population_from_json(card_id, data)
+                    if self._is_ingested("psa_population", api.get_card_id_psa_pop, card_id):
+                        self.psa_dao.touch_psa_population(card_id, data.get('updated_date'))
+                    else:
+                        self.psa_dao.add_psa_population_from_json(card_id, data)
+                        self._mark_ingested("psa_population", api.get_card_id_psa_pop, card_id)
                 except Exception as e:
                     print(e)
             self.gem_rate_refresh_log_dao.log_batch_refresh_attempt([card_id])
 
+        self._fetch_all(card_ids, partial(get_card_id_psa_pop, use_network_only=True), on_result)
+
+    def _print_network_report(self):
+        """
+        Private method to print the per-route request rate, throttle counts and health,
+        plus per-endpoint retry counts, so cycle length can be tuned against the API quota.
+        """
+        print("\nNetwork report:")
+        rate_stats = api.get_rate_limiter_stats()
+        if not rate_stats:
+            print("No API requests were sent this cycle.")
+        for route, stats in rate_stats.items():
+            print(f"- {route}: {stats['rate_per_second']} req/s, {stats['requests']} requests, "
+                  f"{stats['throttle_events']} throttle events")
+
+        for route, stats in api.get_proxy_pool_stats().items():
+            print(f"- {route}: breaker {stats['state']}, {stats['success_rate']:.0%} success, "
+                  f"{stats['average_latency']}s avg latency, {stats['trips']} trips")
+
+        for endpoint, counts in api.get_retry_stats().items():
+            print(f"- {endpoint}: {counts['calls']} calls, {counts['status_retries']} status retries, "
+                  f"{counts['connection_retries']} connection retries, {counts['gave_up']} gave up")
+
+        print(f"- {get_deduplicated_call_count()} duplicate fetches coalesced into in-flight calls")
+
+        negative_stats = get_negative_cache_stats()
+        print(f"- {negative_stats['skipped']} calls skipped for known-empty IDs "
+              f"({sum(negative_stats['known_empty'].values())} IDs recorded)")
+
+        for endpoint, stats in get_change_stats().items():
+            print(f"- {endpoint}: {stats['unchanged']} of {stats['fetched']} payloads unchanged, "
+                  f"{stats['skip_ratio']:.0%} of ingests skipped")
+
+    def _write_cache_metrics_summary(self):
+        """
+        Private method to print how much of the cycle was served from cache versus the
+        network per endpoint, and save the full counters and histograms to
+        cache/metrics/cache_metrics_last_cycle.json.
+        """
+        print("\nCache metrics:")
+        metrics = get_cache_metrics()
+        if not metrics:
+            print("No cache lookups were made this cycle.")
+        for endpoint, stats in metrics.items():
+            latency, write_time = stats['network_latency'], stats['write_time']
+            print(f"- {endpoint}: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"{stats['negative_hits']} negative hits, {stats['bypasses']} forced fetches, "
+                  f"{stats['served_from_cache']:.0%} served from cache")
+            if latency['count']:
+                print(f"  {latency['count']} network calls (p50 {latency['p50_ms']}ms, p95 {latency['p95_ms']}ms), "
+                      f"{stats['payload_bytes'] / 1024:.0f} KiB received, "
+                      f"{write_time['avg_ms']}ms avg cache write")
+
+        save_object_to_file({"updated_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "endpoints": metrics},
+                            filename="cache_metrics_last_cycle.json",
+                            directory=os.path.join("cache", "metrics"), file_format="json")
+
     def run_update_cycle(self):
         """
         Runs the full update cycle for fetching missing data, processing it,
         and invalidating the cache.
         """
         print("--- Starting update cycle ---")
+        api.begin_retry_cycle()
+        reset_change_stats()
+        reset_cache_metrics()
 
         # 1. Update stale set data
         print("\nChecking for stale set data...")
@@ -138,6 +310,14 @@ class UpdateService:
         print("\nInvalidating card cache...")
         self.card_cache_service.invalidate_cache()
 
+        # 6. Evict old API responses if a collection is due (by schedule or by cache size)
+        print("\nChecking response cache size and age...")
+        if get_cache_gc().collect_if_due() is None:
+            print("Cache GC is not due yet.")
+
+        self._print_network_report()
+        self._write_cache_metrics_summary()
+
         print("\n--- Update cycle finished ---")
 
 